@@ -9,13 +9,35 @@ enter stock details, and get a prediction for the closing price.
 The application consists of:
 - A home route ("/") that renders the index page and accepts form submissions.
 - A predict route ("/predict") that returns a JSON response with the predicted close price.
-- Model loading logic to read and store machine learning models in memory.
+- A batch route ("/predict_batch") that scores many rows across many tickers; the
+  rows of all linear ensembles are scored together in one NumPy product.
+- A memoizing cache in front of the models for single-row predictions ("/" and
+  "/predict"), keyed on ticker, model version and input values (prediction_cache.py).
+- A metrics route ("/metrics") in the Prometheus text format: request counts and
+  latencies, time per stage (parse, model_lookup, predict, serialize), requests in
+  flight, rows scored and failed per ticker, model load durations and prediction
+  cache counters (metrics.py).
+- Model lookup through the shared registry of compiled models, which loads each model
+  on first use, fuses linear ensembles into a single weight vector and evicts the
+  least recently used ones.
+- A background watcher of the model folder (FLASK_MODEL_WATCH_SECONDS, 0 disables
+  it): a new or retrained model file is loaded off the request path, validated with
+  a smoke-test prediction and swapped into the registry in one step, so requests keep
+  the previous model until the new one is ready.
+
+'python app.py' starts Flask's development server. For production, 'serve.py' loads
+and validates the models once and serves the app from pre-forked worker processes.
 """
 
-from flask import Flask, render_template, request, jsonify
-import pickle  # For loading saved models
+from flask import Flask, Response, g, render_template, request, jsonify
+from contextlib import contextmanager  # For the stage timer
 import os  # For directory and path handling
+import sys  # For making the shared helpers importable
+import threading  # For starting the model watcher once per process
+import time  # For request and stage timings
 import numpy as np  # For array handling
+from metrics import CONTENT_TYPE, MetricsRegistry  # For the /metrics endpoint
+from prediction_cache import prediction_cache  # For repeated single-row inputs
 
 app = Flask(__name__)
 
@@ -35,32 +57,275 @@ ticker_mapping = {
     "Tata Consultancy Services (TCS)": "TCS",
 }
 
-# Dictionary to hold loaded models
-models = {}
+# Input features expected by every ensemble model, in training order
+feature_columns = ["open", "high", "low", "volume"]
+
+# Shared registry of compiled models (lazy loading with LRU eviction)
+sys.path.insert(0, os.path.join(base_dir, "Historical_Data_Analysis"))
+from shared_functions.model_compiler import stack_models
+from shared_functions.model_registry import compiled_registry
+from shared_functions.model_watcher import ModelWatcher
+
+# File name ending of the ensemble models ("<TICKER>_Ensemble_Model.pkl")
+model_suffix = "_Ensemble_Model.pkl"
+
+# Dictionary mapping model keys (lowercase tickers) to model file paths.
+# Only the directory listing happens at import; models are loaded on first use.
+model_paths = {}
 
-# Load all models from the specified directory
 try:
-    print("Loading models...")
     for filename in os.listdir(model_dir):
         if filename.endswith(
-            "_Ensemble_Model.pkl"
-        ):  # Load only models with this naming convention
+            model_suffix
+        ):  # Register only models with this naming convention
             model_name = filename.split("_")[
                 0
             ].lower()  # Extract the ticker symbol as the model name
-            model_path = os.path.join(model_dir, filename)
+            model_paths[model_name] = os.path.join(model_dir, filename)
+except Exception as e:
+    print(f"Error listing models: {e}")
 
-            # Load the model using pickle and store it in the models dictionary
-            with open(model_path, "rb") as model_file:
-                models[model_name] = pickle.load(model_file)
+# Print registered models' keys for debugging purposes
+print(model_paths.keys())
+
+# Prometheus metrics served at /metrics. FLASK_METRICS_DIR (set by serve.py) is a
+# directory where worker processes share their metrics.
+metrics = MetricsRegistry(directory=os.environ.get("FLASK_METRICS_DIR"))
+requests_total = metrics.counter(
+    "flask_requests_total",
+    "HTTP requests handled, by endpoint, method and status.",
+    ("endpoint", "method", "status"),
+)
+request_seconds = metrics.histogram(
+    "flask_request_duration_seconds", "Request latency, by endpoint.", ("endpoint",)
+)
+stage_seconds = metrics.histogram(
+    "flask_request_stage_duration_seconds",
+    "Time spent per request in each stage (parse, model_lookup, predict, serialize).",
+    ("endpoint", "stage"),
+)
+requests_in_flight = metrics.gauge(
+    "flask_requests_in_flight", "Requests being handled, by endpoint.", ("endpoint",)
+)
+predictions_total = metrics.counter(
+    "prediction_rows_total", "Rows scored, by ticker.", ("ticker",)
+)
+prediction_errors_total = metrics.counter(
+    "prediction_errors_total", "Rows that could not be scored, by ticker.", ("ticker",)
+)
+model_load_seconds = metrics.gauge(
+    "model_load_duration_seconds",
+    "Time taken to load the model currently held, by ticker.",
+    ("ticker",),
+    merge="max",
+)
+model_registry_events = metrics.counter(
+    "model_registry_events_total",
+    "Model registry lookups and loads, by event (hits, misses, reloads, evictions).",
+    ("event",),
+)
+model_registry_load_seconds = metrics.counter(
+    "model_registry_load_seconds_total", "Total time spent loading models."
+)
+prediction_cache_events = metrics.counter(
+    "prediction_cache_events_total",
+    "Prediction cache lookups and removals, by event (hits, shared_hits, misses, evictions, expirations).",
+    ("event",),
+)
+prediction_cache_entries = metrics.gauge(
+    "prediction_cache_entries", "Predictions held in the workers' caches."
+)
+
+
+@metrics.on_collect
+def collect_model_metrics():
+    """Copy the model registry's counters and load durations into the metrics."""
+    stats = compiled_registry.stats()
+    for event in ("hits", "misses", "reloads", "evictions"):
+        model_registry_events.set(stats[event], event)
+    model_registry_load_seconds.set(stats["load_seconds"])
+    # A copy: the model watcher's thread adds and removes tickers meanwhile
+    tickers = {path: model_name for model_name, path in list(model_paths.items())}
+    for entry in compiled_registry.entries():
+        if entry.path in tickers:
+            model_load_seconds.set(entry.load_seconds, tickers[entry.path].upper())
+
+
+@metrics.on_collect
+def collect_cache_metrics():
+    """Copy the prediction cache's counters into the metrics."""
+    stats = prediction_cache.stats()
+    for event in ("hits", "shared_hits", "misses", "evictions", "expirations"):
+        prediction_cache_events.set(stats[event], event)
+    prediction_cache_entries.set(stats["entries"])
+
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    g.stage_seconds = {}
+    requests_in_flight.inc(request.endpoint or "unmatched")
+
+
+@app.after_request
+def record_response_status(response):
+    g.status = response.status_code
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(exception=None):
+    """Record the request's latency, status and stage durations."""
+    endpoint = request.endpoint or "unmatched"
+    requests_in_flight.dec(endpoint)
+    request_seconds.observe(time.perf_counter() - g.request_start, endpoint)
+    status = 500 if exception is not None else g.get("status", 500)
+    requests_total.inc(endpoint, request.method, status)
+    for stage, seconds in g.stage_seconds.items():
+        stage_seconds.observe(seconds, endpoint, stage)
+    metrics.schedule_snapshot()
+
+
+@contextmanager
+def timed_stage(stage):
+    """Add the time spent in the block to the current request's 'stage' duration."""
+    stages = g.stage_seconds
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[stage] = stages.get(stage, 0.0) + time.perf_counter() - start
+
+
+def get_model(model_name):
+    """
+    Return the compiled model for a lowercase ticker from the shared registry,
+    or None if no model file is registered for it.
+    """
+    model_path = model_paths.get(model_name)
+    if model_path is None:
+        return None
+    return compiled_registry.get(model_path)
 
-            print(f"Model '{model_name.upper()}' loaded from {model_path}")
-    print("All models loaded successfully!")
-except Exception as e:
-    print(f"Error loading models: {e}")
 
-# Print loaded models' keys for debugging purposes
-print(models.keys())
+def validate_model(model):
+    """
+    Smoke test of a loaded model: it must predict one finite value per input row.
+    Raises ValueError otherwise.
+    """
+    smoke_input = np.ones((2, len(feature_columns)))
+    prediction = np.asarray(model.predict(smoke_input))
+    if prediction.shape != (len(smoke_input),) or not np.isfinite(prediction).all():
+        raise ValueError(f"smoke-test prediction gave {prediction!r}")
+
+
+def on_model_change(path, event):
+    """Keep 'model_paths' in line with the model files found by the watcher."""
+    model_name = os.path.basename(path).split("_")[0].lower()
+    if event == "removed":
+        model_paths.pop(model_name, None)
+    else:
+        model_paths[model_name] = path
+
+
+# Background model watcher of this process (threads do not survive a fork)
+model_watch_seconds = float(os.environ.get("FLASK_MODEL_WATCH_SECONDS", 5))
+model_watcher = None
+model_watcher_lock = threading.Lock()
+
+
+def start_model_watcher():
+    """
+    Start the model watcher of the current process, unless it runs already or
+    FLASK_MODEL_WATCH_SECONDS is 0. From then on, lookups serve the held models
+    without checking their files and reloads are left to the watcher.
+    """
+    global model_watcher
+    if model_watch_seconds <= 0:
+        return None
+    with model_watcher_lock:
+        if model_watcher is None or model_watcher.pid != os.getpid():
+            compiled_registry.check_files = False
+            model_watcher = ModelWatcher(
+                compiled_registry,
+                model_dir,
+                model_suffix,
+                validate=validate_model,
+                on_change=on_model_change,
+                interval=model_watch_seconds,
+            ).start()
+    return model_watcher
+
+
+@app.before_request
+def ensure_model_watcher():
+    if model_watch_seconds > 0 and (
+        model_watcher is None or model_watcher.pid != os.getpid()
+    ):
+        start_model_watcher()
+
+
+def get_model_entry(model_name):
+    """
+    Return the registry entry (compiled model and file digest, which serves as model
+    version) for a lowercase ticker, or None if no model file is registered for it.
+    """
+    model_path = model_paths.get(model_name)
+    if model_path is None:
+        return None
+    return compiled_registry.get_entry(model_path)
+
+
+def resolve_model_name(company):
+    """
+    Map a company name ("Apple") or ticker symbol ("AAPL") to a model key ("aapl").
+    Returns None for unknown values.
+    """
+    if company is None:
+        return None
+    company = str(company).strip()
+    ticker = ticker_mapping.get(company.title(), company)
+    model_name = ticker.lower()
+    return model_name if model_name in model_paths else None
+
+
+def parse_batch_payload(payload):
+    """
+    Turn a /predict_batch JSON payload into (companies, feature matrix).
+
+    Two layouts are accepted:
+    - Row layout:      {"rows": [{"company": "AAPL", "open": .., "high": .., "low": .., "volume": ..}, ...]}
+    - Columnar layout: {"company": ["AAPL", ...] or "AAPL", "open": [...], "high": [...], "low": [...], "volume": [...]}
+
+    The columnar layout is converted straight into a NumPy matrix without building
+    one Python object per row. "ticker" is accepted as an alias for "company".
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Payload must be a JSON object")
+
+    if "rows" in payload:
+        rows = payload["rows"]
+        if not all(isinstance(row, dict) for row in rows):
+            raise ValueError("Every item of 'rows' must be a JSON object")
+        companies = [row.get("company", row.get("ticker")) for row in rows]
+        features = np.array(
+            [[row[column] for column in feature_columns] for row in rows],
+            dtype=np.float64,
+        ).reshape(len(rows), len(feature_columns))
+        return companies, features
+
+    columns = payload.get("columns", payload)
+    features = np.column_stack(
+        [np.asarray(columns[column], dtype=np.float64) for column in feature_columns]
+    )
+    if features.ndim != 2 or features.shape[1] != len(feature_columns):
+        raise ValueError("Feature columns must be flat lists of numbers")
+    companies = columns.get("company", columns.get("ticker"))
+    if companies is None or isinstance(companies, str):
+        companies = [companies] * len(features)
+    elif len(companies) != len(features):
+        raise ValueError("'company' and feature columns must have the same length")
+    return companies, features
 
 
 @app.route("/", methods=["GET", "POST"])
@@ -73,39 +338,53 @@ def index():
 
     # Handle POST request (form submission)
     if request.method == "POST":
-        selected_company = request.form.get()  # Get the selected company from the form
+        with timed_stage("parse"):
+            # Get the selected company from the form
+            selected_company = request.form.get()
         print(f"Selected company (backend): {selected_company}")  # Debugging line
 
-        if selected_company in models:
+        if selected_company in model_paths:
             try:
                 # Retrieve the model for the selected company
-                model = models[selected_company]
+                with timed_stage("model_lookup"):
+                    model_entry = get_model_entry(selected_company)
 
                 # Get input values from the form and convert them to float
-                open_price = float(request.form.get("open"))
-                high_price = float(request.form.get("high"))
-                low_price = float(request.form.get("low"))
-                volume = float(request.form.get("volume"))
+                with timed_stage("parse"):
+                    open_price = float(request.form.get("open"))
+                    high_price = float(request.form.get("high"))
+                    low_price = float(request.form.get("low"))
+                    volume = float(request.form.get("volume"))
 
-                # Prepare input data as a NumPy array
-                input_data = np.array([[open_price, high_price, low_price, volume]])
+                    # Prepare input data as a NumPy array
+                    input_data = np.array([[open_price, high_price, low_price, volume]])
 
                 # Predict the close value using the model
-                close_value = model.predict(input_data)[0]
+                with timed_stage("predict"):
+                    close_value = prediction_cache.predict(
+                        selected_company,
+                        model_entry.digest,
+                        model_entry.model,
+                        input_data,
+                    )
+                predictions_total.inc(selected_company.upper())
             except ValueError:
                 close_value = "Invalid input"  # Handle invalid input data
+                prediction_errors_total.inc(selected_company.upper())
             except Exception as e:
                 close_value = str(e)  # Handle unexpected errors
+                prediction_errors_total.inc(selected_company.upper())
         else:
             close_value = "Model not found"  # Handle missing model
 
     # Render the index template with necessary data
-    return render_template(
-        "index.html",
-        ticker_mapping=ticker_mapping,
-        selected_company=selected_company,
-        close_value=close_value,
-    )
+    with timed_stage("serialize"):
+        return render_template(
+            "index.html",
+            ticker_mapping=ticker_mapping,
+            selected_company=selected_company,
+            close_value=close_value,
+        )
 
 
 @app.route("/predict", methods=["POST"])
@@ -113,9 +392,10 @@ def predict():
     """
     Route for handling AJAX requests for stock predictions. Returns a JSON response.
     """
-    selected_company = ticker_mapping[
-        request.form.get("company").title()
-    ]  # Map input to ticker
+    with timed_stage("parse"):
+        selected_company = ticker_mapping[
+            request.form.get("company").title()
+        ]  # Map input to ticker
     print(
         f"Selected company for prediction (backend): {selected_company}"
     )  # Debugging line
@@ -123,36 +403,45 @@ def predict():
     # Adjust the selected company to match model keys (lowercase)
     selected_company = selected_company.lower()
 
-    if selected_company in models:
+    if selected_company in model_paths:
         try:
             # Retrieve the model for the selected company
-            model = models[selected_company]
+            with timed_stage("model_lookup"):
+                model_entry = get_model_entry(selected_company)
 
             # Get input values from the form and convert them to float
-            open_price = float(request.form.get("open"))
-            high_price = float(request.form.get("high"))
-            low_price = float(request.form.get("low"))
-            volume = float(request.form.get("volume"))
+            with timed_stage("parse"):
+                open_price = float(request.form.get("open"))
+                high_price = float(request.form.get("high"))
+                low_price = float(request.form.get("low"))
+                volume = float(request.form.get("volume"))
 
-            # Prepare input data as a NumPy array
-            input_data = np.array([[open_price, high_price, low_price, volume]])
+                # Prepare input data as a NumPy array
+                input_data = np.array([[open_price, high_price, low_price, volume]])
 
             # Predict the close value using the model
-            predicted_close = model.predict(input_data)[0]
+            with timed_stage("predict"):
+                predicted_close = prediction_cache.predict(
+                    selected_company, model_entry.digest, model_entry.model, input_data
+                )
+            predictions_total.inc(selected_company.upper())
 
             # Return the predicted value as JSON
-            return jsonify(
-                {
-                    "success": True,
-                    "predicted_close": predicted_close,
-                    "company": selected_company.capitalize(),
-                }
-            )
+            with timed_stage("serialize"):
+                return jsonify(
+                    {
+                        "success": True,
+                        "predicted_close": predicted_close,
+                        "company": selected_company.capitalize(),
+                    }
+                )
         except ValueError:
+            prediction_errors_total.inc(selected_company.upper())
             return jsonify(
                 {"success": False, "error": "Invalid input"}
             )  # Handle input errors
         except Exception as e:
+            prediction_errors_total.inc(selected_company.upper())
             return jsonify({"success": False})  # Handle unexpected errors
     else:
         return jsonify(
@@ -160,6 +449,98 @@ def predict():
         )  # Handle missing model
 
 
-# Run the app in debug mode for development
+@app.route("/predict_batch", methods=["POST"])
+def predict_batch():
+    """
+    Route for scoring many rows across many tickers in one request. The rows of every
+    ticker with a fused linear model are scored together in one product; other models
+    are called once on their ticker's rows. Predictions are returned in input order.
+    Rows for unknown tickers, or with missing inputs, get a null prediction.
+    """
+    with timed_stage("parse"):
+        try:
+            companies, features = parse_batch_payload(
+                request.get_json(force=True, silent=True)
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify({"success": False, "error": f"Invalid input: {e}"}), 400
+
+        # Map every row to a model key and group row indices by model
+        model_names = np.array(
+            [resolve_model_name(company) or "" for company in companies], dtype=object
+        )
+    predictions = np.full(len(features), np.nan)
+    errors = {}
+
+    unique_names, inverse = np.unique(model_names, return_inverse=True)
+    models = {}
+    with timed_stage("model_lookup"):
+        for group, model_name in enumerate(unique_names):
+            if not model_name:
+                # One entry per unknown company, like the per-ticker errors
+                for row in np.flatnonzero(inverse == group):
+                    errors[str(companies[row])] = "Model not found"
+                continue
+            try:
+                models[model_name] = get_model(model_name)
+            except Exception as e:
+                errors[model_name.upper()] = str(e)
+
+    with timed_stage("predict"):
+        # Fused linear models: one product for the rows of all their tickers
+        stack, other_models = stack_models(models)
+        positions = np.array(
+            [stack.index.get(name, -1) for name in unique_names], dtype=np.intp
+        )[inverse]
+        finite = np.isfinite(features).all(axis=1)
+        rows = np.flatnonzero((positions >= 0) & finite)
+        if rows.size:
+            try:
+                predictions[rows] = stack.predict(positions[rows], features[rows])
+            except Exception as e:
+                for model_name in np.unique(model_names[rows]):
+                    errors[model_name.upper()] = str(e)
+        for model_name in np.unique(model_names[(positions >= 0) & ~finite]):
+            errors[model_name.upper()] = "Input X contains NaN or infinity."
+
+        for model_name, model in other_models.items():
+            rows = np.flatnonzero(model_names == model_name)
+            try:
+                # One vectorized predict call for every row of this ticker
+                predictions[rows] = model.predict(features[rows])
+            except Exception as e:
+                errors[model_name.upper()] = str(e)
+
+    # Rows scored and failed per ticker
+    scored = ~np.isnan(predictions)
+    for names, counter in (
+        (model_names[scored], predictions_total),
+        (model_names[~scored], prediction_errors_total),
+    ):
+        for model_name, count in zip(*np.unique(names, return_counts=True)):
+            counter.inc(model_name.upper() or "unknown", amount=int(count))
+
+    with timed_stage("serialize"):
+        return jsonify(
+            {
+                "success": not errors,
+                "predicted_close": [
+                    None if np.isnan(value) else float(value) for value in predictions
+                ],
+                "errors": errors,
+            }
+        )
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """
+    Route for Prometheus scrapers: every metric of the service (of all worker
+    processes under serve.py) in the text exposition format.
+    """
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+
+# Run the development server (use serve.py for production)
 if __name__ == "__main__":
     app.run()
@@ -0,0 +1,359 @@
+"""
+Prometheus metrics for the Flask prediction service, without external packages.
+
+Counters, gauges and histograms are kept in process memory: recording a value takes
+a lock and a dictionary update. 'MetricsRegistry.render' returns them in the
+Prometheus text exposition format (version 0.0.4), which the app serves at /metrics
+for any local scraper.
+
+When the app runs in several worker processes (serve.py), a scrape only reaches one
+of them. The registry is then given a directory shared by the workers: every worker
+writes a snapshot of its metrics there ('<pid>.json'), from a timer thread at most
+'snapshot_interval' seconds after a request and on every scrape, and 'render' sums
+the snapshots of all workers. Counters and histograms of workers that exited are
+kept, while their gauges are dropped. Gauges merged with "max" (e.g. model load
+durations) report the largest value over the workers.
+
+Values computed elsewhere, such as the model registry's counters, are set at scrape
+time by the functions registered with 'MetricsRegistry.on_collect'.
+"""
+
+# Importing json for the worker snapshots
+import json
+
+# Importing OS module for the snapshot files and worker liveness checks
+import os
+
+# Importing threading to guard the metric values (requests run in threads)
+import threading
+
+# Importing time to throttle snapshots
+import time
+
+# Importing bisect to find a histogram bucket
+from bisect import bisect_left
+
+# Latency buckets in seconds (upper bounds; +Inf is implicit)
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metric:
+    """Base class: a named metric with one value per combination of label values."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _labels(self, labels):
+        # Checked once per label combination; values are converted to text on snapshot
+        if labels not in self._values and len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {labels}"
+            )
+        return labels
+
+    def snapshot(self):
+        """JSON-compatible description and values of the metric."""
+        with self._lock:
+            values = [
+                [[str(label) for label in labels], value]
+                for labels, value in self._values.items()
+            ]
+        return {
+            "kind": self.kind,
+            "documentation": self.documentation,
+            "labelnames": list(self.labelnames),
+            "values": values,
+        }
+
+
+class Counter(Metric):
+    """Monotonically increasing count (name should end in '_total')."""
+
+    kind = "counter"
+
+    def inc(self, *labels, amount=1.0):
+        labels = self._labels(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set(self, value, *labels):
+        """Set the total of a count kept elsewhere (e.g. by the model registry)."""
+        labels = self._labels(labels)
+        with self._lock:
+            self._values[labels] = float(value)
+
+
+class Gauge(Metric):
+    """Value that goes up and down. 'merge' ("sum" or "max") combines workers."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), merge="sum"):
+        super().__init__(name, documentation, labelnames)
+        self.merge = merge
+
+    def inc(self, *labels, amount=1.0):
+        labels = self._labels(labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels, amount=1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        labels = self._labels(labels)
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def snapshot(self):
+        return {**super().snapshot(), "merge": self.merge}
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        labels = self._labels(labels)
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            # Per-bucket counts (the last one is +Inf), then sum and count
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            state[bucket] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            values = [
+                [[str(label) for label in labels], list(state)]
+                for labels, state in self._values.items()
+            ]
+        return {
+            "kind": self.kind,
+            "documentation": self.documentation,
+            "labelnames": list(self.labelnames),
+            "buckets": list(self.buckets),
+            "values": values,
+        }
+
+
+class MetricsRegistry:
+    """
+    Set of metrics rendered together. With a 'directory', the metrics of every
+    process sharing it are merged at scrape time (see the module docstring).
+    """
+
+    def __init__(self, directory=None, snapshot_interval=1.0):
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self._metrics = {}
+        self._collectors = []
+        self._last_snapshot = 0.0
+        self._timer = None  # Pending snapshot write
+        self._lock = threading.Lock()  # Guards '_timer'; never held during I/O
+        self._write_lock = threading.Lock()  # One snapshot write at a time
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), merge="sum"):
+        return self._register(Gauge(name, documentation, labelnames, merge))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def on_collect(self, function):
+        """Register a function called before every scrape (usable as a decorator)."""
+        self._collectors.append(function)
+        return function
+
+    def snapshot(self):
+        """JSON-compatible snapshot of this process's metrics."""
+        for collect in self._collectors:
+            collect()
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    # --- Multi-process snapshots ---
+
+    def write_snapshot(self):
+        """Write this process's snapshot to the shared directory."""
+        if self.directory is None:
+            return
+        with self._write_lock:
+            snapshot = self.snapshot()
+            path = os.path.join(self.directory, f"{os.getpid()}.json")
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(snapshot, file)
+            os.replace(tmp_path, path)  # Readers never see a half-written snapshot
+            self._last_snapshot = time.monotonic()
+
+    def schedule_snapshot(self):
+        """
+        Write a snapshot at most 'snapshot_interval' seconds from now, from a timer
+        thread: requests never wait for it and a burst of requests leads to one write.
+        """
+        if self.directory is None:
+            return
+        with self._lock:
+            if self._timer is not None:
+                return
+            elapsed = time.monotonic() - self._last_snapshot
+            self._timer = threading.Timer(
+                max(0.0, self.snapshot_interval - elapsed), self._scheduled_snapshot
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _scheduled_snapshot(self):
+        with self._lock:
+            self._timer = None
+        self.write_snapshot()
+
+    def _read_snapshots(self):
+        """(snapshot, process alive) for every snapshot in the shared directory."""
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(
+                    os.path.join(self.directory, filename), encoding="utf-8"
+                ) as file:
+                    snapshots.append(
+                        (json.load(file), _process_alive(int(filename[:-5])))
+                    )
+            except (OSError, ValueError):
+                continue  # Removed or replaced while listing
+        return snapshots
+
+    # --- Exposition ---
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        if self.directory is None:
+            return render_snapshot(self.snapshot())
+        self.write_snapshot()
+        return render_snapshot(merge_snapshots(self._read_snapshots()))
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots):
+    """
+    Combine (snapshot, process alive) pairs: counters and histograms are summed,
+    gauges are summed or maxed over the live processes only.
+    """
+    merged = {}
+    for snapshot, alive in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "values": {}})
+            if metric["kind"] == "gauge" and not alive:
+                continue
+            values = target["values"]
+            for labels, value in metric["values"]:
+                key = tuple(labels)
+                if key not in values:
+                    values[key] = value
+                elif metric["kind"] == "histogram":
+                    values[key] = [a + b for a, b in zip(values[key], value)]
+                elif metric.get("merge") == "max":
+                    values[key] = max(values[key], value)
+                else:
+                    values[key] += value
+    for metric in merged.values():
+        metric["values"] = [
+            [list(labels), value] for labels, value in metric["values"].items()
+        ]
+    return merged
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_snapshot(snapshot):
+    """Text exposition of a (possibly merged) snapshot."""
+    lines = []
+    for name, metric in snapshot.items():
+        lines.append(f"# HELP {name} {metric['documentation']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        names = metric["labelnames"]
+        for labels, value in sorted(metric["values"]):
+            if metric["kind"] != "histogram":
+                lines.append(
+                    f"{name}{_format_labels(names, labels)} {_format_value(value)}"
+                )
+                continue
+            cumulative = 0
+            for bound, count in zip(metric["buckets"] + [float("inf")], value):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    names + ["le"], labels + [_format_value(float(bound))]
+                )
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{name}_sum{_format_labels(names, labels)} {_format_value(value[-2])}"
+            )
+            lines.append(f"{name}_count{_format_labels(names, labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
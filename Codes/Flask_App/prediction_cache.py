@@ -0,0 +1,205 @@
+"""
+Memoizing cache of single-row predictions for the Flask prediction service.
+
+Dashboard clients resubmit the same (company, open, high, low, volume) inputs over
+and over, e.g. for the last known bar. 'PredictionCache.predict' answers those from
+memory instead of calling the model:
+
+- Entries are keyed on the ticker, the model version (the SHA-256 digest the model
+  registry keeps for the pickle) and the input row as float64 bytes (-0.0 counted as
+  0.0). A retrained pickle gets a new digest, so no prediction of the old model is
+  ever served; the entries of the old version are dropped when the new one is first
+  seen.
+- The cache holds at most 'max_entries' predictions, evicting the least recently
+  used, and an entry expires 'ttl_seconds' after it was stored.
+- 'stats' reports hits, misses, evictions, expirations and the hit rate.
+
+With 'share(slots)', called before the workers are forked (serve.py), the workers
+also share a table of 'slots' predictions in an anonymous shared memory mapping. A
+prediction made by one worker is then found by the others. Each key maps to one
+slot, and a newer entry overwrites the older one. Slots are written without locks:
+each carries a checksum, so a slot read while another process writes it counts as a
+miss rather than a wrong value.
+
+The limits can be set with the environment variables PREDICTION_CACHE_MAX_ENTRIES
+(0 disables the cache), PREDICTION_CACHE_TTL_SECONDS and PREDICTION_CACHE_SHARED_SLOTS.
+"""
+
+# Importing hashlib for the shared slot index and checksum
+import hashlib
+
+# Importing mmap for the table shared by the worker processes
+import mmap
+
+# Importing OS module to read the cache limits
+import os
+
+# Importing struct to read and write shared slots
+import struct
+
+# Importing threading to guard the cache (requests run in threads)
+import threading
+
+# Importing time for entry expiry
+import time
+
+# Ordered dictionary keeps the least recently used entry first
+from collections import OrderedDict
+
+# Importing NumPy to canonicalize the input rows
+import numpy as np
+
+# Shared slot: key digest, prediction, expiry (Unix time) and checksum of the three
+SLOT = struct.Struct("<16sddQ")
+
+
+def _env_number(name, default, kind=int):
+    value = os.environ.get(name)
+    return kind(value) if value else default
+
+
+class SharedPredictionTable:
+    """Fixed-size table of predictions in an anonymous mapping inherited by fork."""
+
+    def __init__(self, slots):
+        self.slots = slots
+        self.buffer = mmap.mmap(-1, slots * SLOT.size)  # MAP_SHARED on Unix
+
+    @staticmethod
+    def _checksum(digest, value, expires):
+        check = hashlib.blake2b(
+            digest + struct.pack("<dd", value, expires), digest_size=8
+        )
+        return int.from_bytes(check.digest(), "little")
+
+    def _offset(self, digest):
+        return int.from_bytes(digest[:8], "little") % self.slots * SLOT.size
+
+    def get(self, digest, now):
+        stored, value, expires, check = SLOT.unpack_from(
+            self.buffer, self._offset(digest)
+        )
+        if (
+            stored != digest
+            or expires <= now
+            or check != self._checksum(digest, value, expires)
+        ):
+            return None
+        return value
+
+    def put(self, digest, value, expires):
+        checksum = self._checksum(digest, value, expires)
+        SLOT.pack_into(
+            self.buffer, self._offset(digest), digest, value, expires, checksum
+        )
+
+
+class PredictionCache:
+    """
+    LRU cache with expiry of single-row predictions, keyed on ticker, model version
+    and input values, optionally backed by a table shared between processes.
+    """
+
+    def __init__(self, max_entries=4096, ttl_seconds=300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared = None
+        # key -> (prediction, expiry on the monotonic clock)
+        self._entries = OrderedDict()
+        self._versions = {}  # ticker -> model version seen last
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def share(self, slots):
+        """Back the cache with a table of 'slots' predictions shared with forked processes."""
+        self.shared = SharedPredictionTable(slots) if slots > 0 else None
+
+    def predict(self, ticker, version, model, input_data):
+        """
+        Prediction of 'model' (version 'version' of the ticker's model) for the single
+        row 'input_data', from the cache when the same row was predicted before.
+        """
+        if self.max_entries <= 0:
+            return float(model.predict(input_data)[0])
+
+        row = np.asarray(input_data, dtype=np.float64).reshape(-1) + 0.0  # -0.0 -> 0.0
+        key = (ticker, version, row.tobytes())
+        now = time.monotonic()
+
+        with self._lock:
+            if self._versions.get(ticker) != version:
+                self._drop_ticker(ticker)
+                self._versions[ticker] = version
+            cached = self._entries.get(key)
+            if cached is not None:
+                if cached[1] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return cached[0]
+                del self._entries[key]
+                self._counters["expirations"] += 1
+
+        digest = None
+        if self.shared is not None:
+            digest = hashlib.blake2b(
+                b"\0".join((ticker.encode(), version.encode(), key[2])), digest_size=16
+            ).digest()
+            value = self.shared.get(digest, time.time())
+            if value is not None:
+                with self._lock:
+                    self._counters["shared_hits"] += 1
+                    self._store(key, value, now)
+                return value
+
+        # Outside the lock: other tickers stay served while this model predicts
+        value = float(model.predict(input_data)[0])
+        with self._lock:
+            self._counters["misses"] += 1
+            self._store(key, value, now)
+        if digest is not None:
+            self.shared.put(digest, value, time.time() + self.ttl_seconds)
+        return value
+
+    def stats(self):
+        """Counters, number of entries and hit rate (local and shared hits over lookups)."""
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+        hits = counters["hits"] + counters["shared_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "entries": entries,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Drop every entry of this process's cache."""
+        with self._lock:
+            self._entries.clear()
+
+    # --- Internal helpers (called with self._lock held) ---
+
+    def _store(self, key, value, now):
+        self._entries[key] = (value, now + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _drop_ticker(self, ticker):
+        for key in [key for key in self._entries if key[0] == ticker]:
+            del self._entries[key]
+
+
+# Shared cache used by the Flask routes
+prediction_cache = PredictionCache(
+    max_entries=_env_number("PREDICTION_CACHE_MAX_ENTRIES", 4096),
+    ttl_seconds=_env_number("PREDICTION_CACHE_TTL_SECONDS", 300.0, float),
+)
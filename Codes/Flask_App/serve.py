@@ -0,0 +1,402 @@
+"""
+Pre-fork production server for the Flask stock prediction app.
+
+'app.run()' starts Flask's single-threaded development server, and every process
+running the app loads its own copy of the models. This entry point serves the same
+app from several worker processes instead:
+
+1. The master process imports the app, loads every registered model through the
+   shared registry of compiled models and validates it with a smoke-test prediction.
+   Startup stops if a model fails to load or predict. Every process then watches the
+   model folder and swaps retrained models in without a restart (see app.py).
+2. The garbage collector is frozen ('gc.freeze') so the objects created so far are
+   moved to a permanent generation that the workers' collections never traverse.
+   Otherwise the first collection in each worker writes to the header of every
+   object and un-shares the pages holding the models.
+3. The listening socket is bound once and the master forks the workers. They inherit
+   the loaded models copy-on-write: the model arrays stay in pages shared with the
+   master until a model file changes and a worker reloads it.
+4. Each worker serves requests with the chosen concurrency model. "sync" handles
+   one request at a time. "threads" handles up to '--threads' requests at once from
+   a thread pool. Once all workers are ready, the master prints the RSS, PSS
+   (shared pages divided among the processes sharing them) and private memory of
+   every process. Workers that die are restarted, with an increasing delay for
+   workers that keep crashing; the master gives up after repeated crashes.
+5. The workers share their /metrics counters through a directory of snapshots
+   (FLASK_METRICS_DIR, or a temporary directory removed at exit), so a scrape of
+   any worker reports the totals of all of them.
+6. With '--shared-cache-slots N', the workers also share a table of N cached
+   predictions (see prediction_cache.py), created in the master before the fork.
+
+Usage:
+    python serve.py [--host HOST] [--port PORT] [--workers N]
+                    [--worker-class {sync,threads}] [--threads N]
+                    [--shared-cache-slots N]
+
+The defaults can also be set with the environment variables FLASK_RUN_HOST,
+FLASK_RUN_PORT, FLASK_WORKERS, FLASK_WORKER_CLASS, FLASK_THREADS and
+PREDICTION_CACHE_SHARED_SLOTS. On platforms
+without 'os.fork' (Windows), the app is served from the master process alone.
+"""
+
+# Importing argparse for the command line options
+import argparse
+
+# Importing gc to freeze the objects shared with the workers
+import gc
+
+# Importing OS module for forking and process handling
+import os
+
+# Importing shutil to remove the temporary metrics directory
+import shutil
+
+# Importing signal to stop the workers with the master
+import signal
+
+# Importing sys to exit with a status
+import sys
+
+# Importing tempfile for the default metrics directory
+import tempfile
+
+# Importing threading to limit the connections a "threads" worker accepts
+import threading
+
+# Importing time for the worker restart backoff
+import time
+
+# Importing ThreadPoolExecutor for the "threads" worker class
+from concurrent.futures import ThreadPoolExecutor
+
+# Importing Werkzeug's WSGI server, which the workers run
+from werkzeug.serving import BaseWSGIServer
+
+# The Flask app, its model paths and the shared registry of compiled models
+from app import (
+    app,
+    compiled_registry,
+    metrics,
+    model_paths,
+    start_model_watcher,
+    validate_model,
+)
+
+# The prediction cache, shared by the workers with '--shared-cache-slots'
+from prediction_cache import prediction_cache
+
+WORKER_CLASSES = ("sync", "threads")
+
+# Worker restarts: the delay doubles from RESTART_DELAY up to RESTART_MAX_DELAY
+# seconds for a slot whose worker keeps exiting, and resets once a worker stayed up
+# for RESTART_RESET_SECONDS. After MAX_CRASHES early exits within CRASH_WINDOW
+# seconds, the master stops every worker and exits with status 1.
+RESTART_DELAY = 0.5
+RESTART_MAX_DELAY = 30.0
+RESTART_RESET_SECONDS = 60.0
+MAX_CRASHES = 5
+CRASH_WINDOW = 60.0
+
+
+class PreforkWSGIServer(BaseWSGIServer):
+    """WSGI server accepting from a listening socket shared by forked workers."""
+
+    def get_request(self):
+        conn, address = super().get_request()
+        # The listening socket is non-blocking; on BSD and macOS the accepted
+        # socket inherits that flag, so handlers would get BlockingIOError
+        conn.setblocking(True)
+        return conn, address
+
+
+class ThreadPoolWSGIServer(PreforkWSGIServer):
+    """
+    WSGI server handling each request on a bounded pool of threads. A worker only
+    accepts a connection when one of its threads is free, so busy workers leave new
+    connections to their siblings instead of queueing them.
+    """
+
+    multithread = True
+
+    def __init__(self, *args, threads=4, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = threads
+        self.pool = None  # Created in the worker, after the fork
+        self.free_threads = threading.BoundedSemaphore(threads)
+
+    def get_request(self):
+        self.free_threads.acquire()
+        try:
+            return super().get_request()
+        except BaseException:
+            self.free_threads.release()  # Lost the race for the connection
+            raise
+
+    def process_request(self, request, client_address):
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(self.threads, thread_name_prefix="request")
+        try:
+            self.pool.submit(self.process_request_thread, request, client_address)
+        except BaseException:
+            self.free_threads.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.free_threads.release()
+
+
+def load_models():
+    """
+    Load every registered model and check that it predicts one finite value per row.
+    Returns {model name: error message} for the models that failed.
+    """
+    errors = {}
+    for model_name, model_path in sorted(model_paths.items()):
+        try:
+            validate_model(compiled_registry.get(model_path))
+        except Exception as e:
+            errors[model_name] = f"{type(e).__name__}: {e}"
+    return errors
+
+
+def memory_usage(pid):
+    """
+    RSS, PSS and private memory of a process in bytes, from /proc/<pid>/smaps_rollup
+    (Linux), or None where it is not available.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as file:
+            fields = {}
+            for line in file:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0]) * 1024
+    except OSError:
+        return None
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def format_memory_report(pids):
+    """Table of the memory usage of the master and worker processes."""
+    lines = [
+        f"{'process':<12}{'pid':>8}{'RSS MiB':>10}{'PSS MiB':>10}{'private MiB':>13}"
+    ]
+    for label, pid in pids:
+        usage = memory_usage(pid)
+        if usage is None:
+            lines.append(f"{label:<12}{pid:>8}{'n/a':>10}{'n/a':>10}{'n/a':>13}")
+            continue
+        mib = {name: value / (1024 * 1024) for name, value in usage.items()}
+        lines.append(
+            f"{label:<12}{pid:>8}{mib['rss']:>10.1f}{mib['pss']:>10.1f}{mib['private']:>13.1f}"
+        )
+    return "\n".join(lines)
+
+
+def make_server(host, port, worker_class, threads):
+    """Bind the listening socket once; the forked workers all accept from it."""
+    if worker_class == "threads":
+        server = ThreadPoolWSGIServer(host, port, app, threads=threads)
+    else:
+        server = PreforkWSGIServer(host, port, app)
+    # Non-blocking accept: workers that lose the race for a connection go back to waiting
+    server.socket.setblocking(False)
+    return server
+
+
+def run_worker(server, ready_fd):
+    """Serve requests in a forked worker until it is terminated."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The master stops the workers
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    start_model_watcher()
+    os.write(ready_fd, b"1")
+    os.close(ready_fd)
+    status = 1
+    try:
+        server.serve_forever()
+        status = 0
+    finally:
+        os._exit(status)  # Never return into the master's code
+
+
+def spawn_worker(server):
+    """Fork a worker, wait until it is ready to accept requests and return its pid."""
+    ready_read, ready_write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(ready_read)
+        run_worker(server, ready_write)
+    os.close(ready_write)
+    os.read(ready_read, 1)  # Returns early (empty) if the worker died
+    os.close(ready_read)
+    return pid
+
+
+def serve(host, port, workers, worker_class, threads, shared_cache_slots=0):
+    """Load the models, fork the workers and supervise them until interrupted."""
+    errors = load_models()
+    if errors:
+        for model_name, error in errors.items():
+            print(
+                f"Model {model_name.upper()} failed validation: {error}",
+                file=sys.stderr,
+            )
+        sys.exit(1)
+    print(
+        f"Loaded and validated {len(model_paths)} models: {', '.join(sorted(model_paths)).upper()}"
+    )
+
+    server = make_server(host, port, worker_class, threads)
+    concurrency = f"{threads} threads" if worker_class == "threads" else "sync"
+    if workers <= 1 or not hasattr(os, "fork"):
+        print(f"Serving on http://{host}:{port} from one process ({concurrency})")
+        start_model_watcher()
+        server.serve_forever()
+        return
+
+    # Workers share their metrics through snapshot files; stale ones are removed
+    temporary_metrics_dir = metrics.directory is None
+    if temporary_metrics_dir:
+        metrics.directory = tempfile.mkdtemp(prefix="flask-metrics-")
+    else:
+        os.makedirs(metrics.directory, exist_ok=True)
+        for filename in os.listdir(metrics.directory):
+            if filename.endswith(".json"):
+                os.remove(os.path.join(metrics.directory, filename))
+
+    # Shared prediction table, mapped before the fork so every worker sees it
+    if shared_cache_slots > 0:
+        prediction_cache.share(shared_cache_slots)
+        print(f"Sharing {shared_cache_slots} cached predictions between the workers")
+
+    # Everything created so far is shared with the workers: keep the collector off it
+    gc.collect()
+    gc.freeze()
+
+    children = {}  # pid -> worker index
+    started = {}  # worker index -> start time of its current process
+    delays = {}  # worker index -> delay before its next restart
+    crashes = []  # times of early worker exits, for the crash limit
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for index in range(workers):
+        if not stopping:
+            children[spawn_worker(server)] = index
+            started[index] = time.monotonic()
+    print(f"Serving on http://{host}:{port} with {workers} workers ({concurrency})")
+    print(
+        format_memory_report(
+            [("master", os.getpid())]
+            + [(f"worker {index}", pid) for pid, index in children.items()]
+        )
+    )
+
+    # Restart workers that exit until the master is asked to stop, backing off for
+    # workers that crash early and giving up when they keep crashing
+    exit_status = 0
+    while children:
+        pid, status = os.wait()
+        index = children.pop(pid, None)
+        if index is None or stopping:
+            continue
+        now = time.monotonic()
+        if now - started[index] >= RESTART_RESET_SECONDS:
+            delays[index] = 0.0
+        else:
+            delays[index] = min(
+                max(2 * delays.get(index, 0.0), RESTART_DELAY), RESTART_MAX_DELAY
+            )
+            crashes = [t for t in crashes if now - t < CRASH_WINDOW] + [now]
+        code = os.waitstatus_to_exitcode(status)
+        if len(crashes) >= MAX_CRASHES:
+            print(
+                f"Worker {index} (pid {pid}) exited with status {code}: {len(crashes)} "
+                f"workers exited within {CRASH_WINDOW:.0f}s, stopping",
+                file=sys.stderr,
+            )
+            exit_status = 1
+            stop(None, None)
+            continue
+        print(
+            f"Worker {index} (pid {pid}) exited with status {code}, "
+            f"restarting it in {delays[index]:.1f}s"
+        )
+        deadline = now + delays[index]
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(0.1)  # Short steps so a stop signal is not delayed
+        if not stopping:
+            children[spawn_worker(server)] = index
+            started[index] = time.monotonic()
+    server.server_close()
+    if temporary_metrics_dir:
+        shutil.rmtree(metrics.directory, ignore_errors=True)
+    if exit_status:
+        sys.exit(exit_status)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=os.environ.get("FLASK_RUN_HOST", "127.0.0.1"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("FLASK_RUN_PORT", 5000))
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("FLASK_WORKERS", os.cpu_count() or 1)),
+        help="number of worker processes (default: FLASK_WORKERS or the number of CPUs)",
+    )
+    parser.add_argument(
+        "--worker-class",
+        choices=WORKER_CLASSES,
+        default=os.environ.get("FLASK_WORKER_CLASS", "sync"),
+        help="'sync' handles one request at a time per worker, 'threads' several",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=int(os.environ.get("FLASK_THREADS", 4)),
+        help="requests handled at once by each 'threads' worker (default: 4)",
+    )
+    parser.add_argument(
+        "--shared-cache-slots",
+        type=int,
+        default=int(os.environ.get("PREDICTION_CACHE_SHARED_SLOTS", 0)),
+        help="cached predictions shared between the workers (default: 0, not shared)",
+    )
+    return parser.parse_args(argv)
+
+
+# Start the pre-fork server when run as a script
+if __name__ == "__main__":
+    args = parse_args()
+    serve(
+        args.host,
+        args.port,
+        args.workers,
+        args.worker_class,
+        args.threads,
+        args.shared_cache_slots,
+    )
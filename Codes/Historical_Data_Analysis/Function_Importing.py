@@ -8,7 +8,9 @@ Each file is assumed to define a function with the same name as the filename.
 
 The output file includes:
 - A docstring at the top explaining the purpose
-- Individual import statements
+- One lazy import per function: the function's module (and its dependencies) is
+  only imported the first time the function is called, so the app starts without
+  importing every section
 - A summary comment with total number of imported functions
 """
 
@@ -25,7 +27,7 @@ FUNCTION_DIR = "feature_functions_deployed"
 IMPORT_FILE = "Import_Functions_Deployed.py"
 
 # List all Python files in the function directory
-function_files = [f for f in os.listdir(FUNCTION_DIR) if f.endswith(".py")]
+function_files = sorted(f for f in os.listdir(FUNCTION_DIR) if f.endswith(".py"))
 total_imports = len(function_files)
 
 # === GENERATE THE IMPORT FILE ===
@@ -38,15 +40,23 @@ with open(IMPORT_FILE, "w", encoding="utf-8") as f:
     f.write(
         f"Each function file is expected to define a function named after the filename.\n"
     )
+    f.write(
+        f"Modules are imported lazily, the first time their function is called.\n"
+    )
     f.write(f"Total functions imported: {total_imports}\n")
     f.write('"""\n\n')
 
+    f.write("# Import-timed stand-ins for the functions\n")
+    f.write("from shared_functions.lazy_imports import lazy_function\n\n")
+
     f.write("# === FUNCTION IMPORTS ===\n")
 
-    # Write each import statement
+    # Write each lazy import statement
     for filename in function_files:
         module_name = filename[:-3]  # Remove .py extension
-        f.write(f"from {FUNCTION_DIR}.{module_name} import {module_name}\n")
+        f.write(
+            f'{module_name} = lazy_function("{FUNCTION_DIR}.{module_name}", "{module_name}")\n'
+        )
 
     # Footer summary comment
     f.write(f"\n# ✅ Total functions imported: {total_imports}\n")
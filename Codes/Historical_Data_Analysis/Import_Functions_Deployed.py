@@ -1,74 +1,107 @@
 """
 This file was auto-generated to import all functions from 'feature_functions_deployed/'.
 Each function file is expected to define a function named after the filename.
-Total functions imported: 23
+Modules are imported lazily, the first time their function is called.
+Total functions imported: 25
 """
 
+# Import-timed stand-ins for the functions
+from shared_functions.lazy_imports import lazy_function
+
 # === FUNCTION IMPORTS ===
-from feature_functions_deployed.display_background_image import display_background_image
-from feature_functions_deployed.display_company_data_table import (
-    display_company_data_table,
+display_background_image = lazy_function(
+    "feature_functions_deployed.display_background_image", "display_background_image"
+)
+display_cache_stats = lazy_function(
+    "feature_functions_deployed.display_cache_stats", "display_cache_stats"
+)
+display_company_data_table = lazy_function(
+    "feature_functions_deployed.display_company_data_table",
+    "display_company_data_table",
+)
+display_contact_information = lazy_function(
+    "feature_functions_deployed.display_contact_information",
+    "display_contact_information",
+)
+display_hybrid_model_performance = lazy_function(
+    "feature_functions_deployed.display_hybrid_model_performance",
+    "display_hybrid_model_performance",
 )
-from feature_functions_deployed.display_contact_information import (
-    display_contact_information,
+display_hybrid_model_prediction = lazy_function(
+    "feature_functions_deployed.display_hybrid_model_prediction",
+    "display_hybrid_model_prediction",
 )
-from feature_functions_deployed.display_hybrid_model_performance import (
-    display_hybrid_model_performance,
+display_hybrid_model_visualization = lazy_function(
+    "feature_functions_deployed.display_hybrid_model_visualization",
+    "display_hybrid_model_visualization",
 )
-from feature_functions_deployed.display_hybrid_model_prediction import (
-    display_hybrid_model_prediction,
+display_numerical_data_visualizations = lazy_function(
+    "feature_functions_deployed.display_numerical_data_visualizations",
+    "display_numerical_data_visualizations",
 )
-from feature_functions_deployed.display_hybrid_model_visualization import (
-    display_hybrid_model_visualization,
+display_numerical_dataset_info = lazy_function(
+    "feature_functions_deployed.display_numerical_dataset_info",
+    "display_numerical_dataset_info",
 )
-from feature_functions_deployed.display_numerical_dataset_info import (
-    display_numerical_dataset_info,
+display_numerical_model_performance = lazy_function(
+    "feature_functions_deployed.display_numerical_model_performance",
+    "display_numerical_model_performance",
 )
-from feature_functions_deployed.display_numerical_data_visualizations import (
-    display_numerical_data_visualizations,
+display_numerical_model_predicted = lazy_function(
+    "feature_functions_deployed.display_numerical_model_predicted",
+    "display_numerical_model_predicted",
 )
-from feature_functions_deployed.display_numerical_model_performance import (
-    display_numerical_model_performance,
+display_numerical_model_visualization = lazy_function(
+    "feature_functions_deployed.display_numerical_model_visualization",
+    "display_numerical_model_visualization",
 )
-from feature_functions_deployed.display_numerical_model_predicted import (
-    display_numerical_model_predicted,
+display_power_bi_dashboard = lazy_function(
+    "feature_functions_deployed.display_power_bi_dashboard",
+    "display_power_bi_dashboard",
 )
-from feature_functions_deployed.display_numerical_model_visualization import (
-    display_numerical_model_visualization,
+display_project_dashboard = lazy_function(
+    "feature_functions_deployed.display_project_dashboard", "display_project_dashboard"
 )
-from feature_functions_deployed.display_power_bi_dashboard import (
-    display_power_bi_dashboard,
+display_project_database = lazy_function(
+    "feature_functions_deployed.display_project_database", "display_project_database"
 )
-from feature_functions_deployed.display_project_dashboard import (
-    display_project_dashboard,
+display_project_description = lazy_function(
+    "feature_functions_deployed.display_project_description",
+    "display_project_description",
 )
-from feature_functions_deployed.display_project_database import display_project_database
-from feature_functions_deployed.display_project_description import (
-    display_project_description,
+display_project_flask_app = lazy_function(
+    "feature_functions_deployed.display_project_flask_app", "display_project_flask_app"
 )
-from feature_functions_deployed.display_project_flask_app import (
-    display_project_flask_app,
+display_real_time_stock_prediction = lazy_function(
+    "feature_functions_deployed.display_real_time_stock_prediction",
+    "display_real_time_stock_prediction",
 )
-from feature_functions_deployed.display_real_time_stock_prediction import (
-    display_real_time_stock_prediction,
+display_reddit_chatbot_visualization = lazy_function(
+    "feature_functions_deployed.display_reddit_chatbot_visualization",
+    "display_reddit_chatbot_visualization",
 )
-from feature_functions_deployed.display_reddit_chatbot_visualization import (
-    display_reddit_chatbot_visualization,
+display_resources_information = lazy_function(
+    "feature_functions_deployed.display_resources_information",
+    "display_resources_information",
 )
-from feature_functions_deployed.display_resources_information import (
-    display_resources_information,
+display_startup_report = lazy_function(
+    "feature_functions_deployed.display_startup_report", "display_startup_report"
 )
-from feature_functions_deployed.display_stock_market_description import (
-    display_stock_market_description,
+display_stock_market_description = lazy_function(
+    "feature_functions_deployed.display_stock_market_description",
+    "display_stock_market_description",
 )
-from feature_functions_deployed.display_text_model_performance import (
-    display_text_model_performance,
+display_text_model_performance = lazy_function(
+    "feature_functions_deployed.display_text_model_performance",
+    "display_text_model_performance",
 )
-from feature_functions_deployed.display_text_model_prediction import (
-    display_text_model_prediction,
+display_text_model_prediction = lazy_function(
+    "feature_functions_deployed.display_text_model_prediction",
+    "display_text_model_prediction",
 )
-from feature_functions_deployed.display_text_model_visualization import (
-    display_text_model_visualization,
+display_text_model_visualization = lazy_function(
+    "feature_functions_deployed.display_text_model_visualization",
+    "display_text_model_visualization",
 )
 
-# ✅ Total functions imported: 23
+# ✅ Total functions imported: 25
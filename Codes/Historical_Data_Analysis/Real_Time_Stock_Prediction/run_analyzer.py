@@ -23,6 +23,14 @@ Usage:
         python run_analyzer.py AAPL 7
 If no arguments are passed, the script defaults to AAPL for the next 5 days.
 
+Portfolio mode:
+    python run_analyzer.py TICKER1,TICKER2,... [DAYS_AHEAD] [WORKERS]
+    Example:
+        python run_analyzer.py AAPL,MSFT,NVDA 7 3
+Several comma-separated tickers are analyzed in parallel worker processes (one per
+CPU core by default) and each ticker's metrics, predictions and alerts are printed
+as soon as it finishes. Exports and plots are skipped in this mode.
+
 Author: Sneha Jha
 """
 
@@ -45,13 +53,38 @@ from stockteller_analyzer import (
     visualize_predictions,
     alert_stock_movement,
     export_metrics_table,
+    analyze_ticker,
 )
 
+# Process pool fan-out (importable once stockteller_analyzer has set up the path)
+from shared_functions.parallel import run_parallel
+
+
+def run_portfolio(tickers, days, jobs=None):
+    # Analyze every ticker in parallel and report each one as soon as it finishes
+    print(f"\U0001f4e5 Analyzing {len(tickers)} tickers in parallel...")
+    for ticker, result, error in run_parallel(analyze_ticker, tickers, days, jobs=jobs):
+        if error is not None:
+            print(f"\n❌ {ticker}: {error}")
+            continue
 
-def main(ticker=None, days=None):
+        print(f"\n\U0001f4ca Model Comparison for {ticker}:")
+        print(result["metrics"])
+        print(f"\n\U0001f52e Predictions for {ticker}:")
+        print(pd.DataFrame(result["predictions"], index=result["future_dates"]))
+        alert_stock_movement(result["df"], result["predictions"])
+
+    print("\n✅ Portfolio analysis complete. Exiting now.")
+
+
+def main(ticker=None, days=None, jobs=None):
     # Allow the script to run both via CLI or interactively (e.g., inside a notebook)
     if ticker is None or days is None:
-        if len(sys.argv) >= 3:
+        if len(sys.argv) >= 2 and "," in sys.argv[1]:
+            ticker = sys.argv[1]  # Comma-separated tickers (portfolio mode)
+            days = int(sys.argv[2]) if len(sys.argv) >= 3 else 5
+            jobs = int(sys.argv[3]) if len(sys.argv) >= 4 else None
+        elif len(sys.argv) >= 3:
             ticker = sys.argv[1]  # Get ticker symbol from command-line argument
             days = int(sys.argv[2])  # Get number of days for prediction
         else:
@@ -60,6 +93,13 @@ def main(ticker=None, days=None):
             days = 5
             print("⚠️ No arguments provided. Running in test mode with default values.")
 
+    # Portfolio mode: a list or comma-separated string of tickers
+    if isinstance(ticker, str) and "," in ticker:
+        ticker = [t.strip() for t in ticker.split(",") if t.strip()]
+    if isinstance(ticker, (list, tuple)):
+        run_portfolio(list(ticker), days, jobs)
+        return
+
     # Step 1: Fetch stock data
     print(f"\U0001f4e5 Fetching real-time data for {ticker}...")
     df = fetch_realtime_data(ticker)
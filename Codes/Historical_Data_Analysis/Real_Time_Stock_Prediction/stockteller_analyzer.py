@@ -44,14 +44,20 @@ import seaborn as sns  # Optional: for advanced visualizations
 import os  # For file path operations
 from datetime import datetime, timedelta  # For handling future dates
 from sklearn.model_selection import train_test_split  # For splitting dataset
+import sys  # For making the shared functions importable
+
+# Make 'shared_functions' (in the parent 'Historical_Data_Analysis' folder) importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared_functions.forecasting import forecast_models  # Batched recursive forecasts
+from shared_functions.parallel import worker_threads  # Per-worker core budget
+from shared_functions.market_data import download  # Local OHLCV cache for yfinance
 
 
 # 1. Fetch Real-Time Data
 def fetch_realtime_data(stock_symbol, period="60d"):
     print(f"\U0001f5d5️ Fetching real-time data for {stock_symbol}...")
-    df = yf.download(
-        stock_symbol, period=period, interval="1d", progress=False
-    )  # Download daily data
+    # Download daily data through the local cache (only new bars hit the network)
+    df = download(stock_symbol, period=period, interval="1d")
     df = df.reset_index()  # Reset index to bring 'Date' as a column
     return df
 
@@ -87,11 +93,13 @@ def preprocess_data(df):
 
 
 # 3. Train Multiple Models
-def train_models(X_train, y_train):
-    # Dictionary of models to train
+def train_models(X_train, y_train, n_jobs=None):
+    # Dictionary of models to train (n_jobs = cores for the Random Forest)
     models = {
         "Linear Regression": LinearRegression(),
-        "Random Forest": RandomForestRegressor(n_estimators=100, random_state=42),
+        "Random Forest": RandomForestRegressor(
+            n_estimators=100, random_state=42, n_jobs=n_jobs
+        ),
         "SVR": SVR(kernel="rbf"),
     }
 
@@ -108,25 +116,33 @@ def predict_future_prices(df, models, days_ahead=5):
         df[["Open", "High", "Low", "Close", "Volume"]].values[-1].reshape(1, -1)
     )
 
-    predictions = {name: [] for name in models}  # Store predictions for each model
-    future_dates = []  # Store future dates for plotting
+    # Predict each model's next days, using its predicted close as the next day's
+    # open/high/low/close input (columns 0-3); all steps run on preallocated buffers
+    forecasts = forecast_models(
+        models, last_known, days_ahead, target_columns=[0, 1, 2, 3]
+    )
+    predictions = {name: forecasts[name][0].tolist() for name in models}
 
-    current_input = last_known.copy()
-    for i in range(days_ahead):
-        for name, model in models.items():
-            predicted = model.predict(current_input)[0]  # Predict next day
-            predictions[name].append(predicted)
+    # Generate the future dates for plotting
+    last_date = df["Date"].iloc[-1]
+    future_dates = [last_date + timedelta(days=i + 1) for i in range(days_ahead)]
 
-        # Use predicted close as the next day's OHLC input
-        next_day = current_input.flatten()
-        next_day[0] = next_day[1] = next_day[2] = next_day[3] = predicted
-        current_input = next_day.reshape(1, -1)
+    return future_dates, predictions
 
-        # Generate the next date
-        next_date = df["Date"].iloc[-1] + timedelta(days=i + 1)
-        future_dates.append(next_date)
 
-    return future_dates, predictions
+# 4b. Full Pipeline for One Ticker (a process pool worker in portfolio mode)
+def analyze_ticker(stock_symbol, days_ahead=5):
+    df = fetch_realtime_data(stock_symbol)
+    df_cleaned, X_train, X_test, y_train, y_test = preprocess_data(df)
+    models = train_models(X_train, y_train, n_jobs=worker_threads())
+    metrics_df = evaluate_models(models, X_test, y_test)
+    future_dates, predictions = predict_future_prices(df_cleaned, models, days_ahead)
+    return {
+        "df": df_cleaned,
+        "metrics": metrics_df,
+        "future_dates": future_dates,
+        "predictions": predictions,
+    }
 
 
 # 5. Evaluate Models
@@ -14,7 +14,6 @@ including Linear Regression, Random Forest, SVM, and LSTM. It also evaluates mod
 
 # --- IMPORT LIBRARIES ---
 
-import yfinance as yf  # For fetching historical stock data from Yahoo Finance
 import numpy as np  # For numerical operations and arrays
 import pandas as pd  # For data manipulation and analysis
 import matplotlib.pyplot as plt  # For plotting and visualizing predictions
@@ -36,6 +35,12 @@ from datetime import datetime, timedelta  # For handling date/time
 import webbrowser  # To open a browser tab for news
 import openpyxl  # Required for writing Excel files
 import streamlit as st  # Streamlit for creating the web application
+import os  # For file path operations
+import sys  # For making the shared functions importable
+
+# Make 'shared_functions' (in the parent 'Historical_Data_Analysis' folder) importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared_functions.market_data import download  # Local OHLCV cache for yfinance
 
 
 # --- CLASS DEFINITION STARTS ---
@@ -65,8 +70,9 @@ class StockPricePredictor:
         # Add 1 day to include the end date in range
         end_date += timedelta(days=1)
 
-        # Download data from Yahoo Finance using yfinance
-        self.data = yf.download(self.ticker, start=start_date, end=end_date)
+        # Download data from Yahoo Finance through the local OHLCV cache
+        # (only bars newer than the cached ones are requested again)
+        self.data = download(self.ticker, start=start_date, end=end_date)
         # Keep only the 'Close' price and drop missing values
         self.data = self.data[["Close"]].dropna()
 
@@ -42,6 +42,8 @@ Functions Used:
 - display_real_time_stock_prediction: Provides real-time stock price predictions using trained models, including live data visualization and trend analysis.
 - display_contact_information: Shows contact info for the project team.
 - display_resources_information: Lists various project-related resources and illustrations.
+- display_cache_stats: Shows the hit rates of the data, figure and model caches in the sidebar.
+- display_startup_report: Shows how long each section took to import in the sidebar.
 """
 
 # --- STREAMLIT APP & VISUALIZATION FRAMEWORK ---
@@ -49,9 +51,13 @@ Functions Used:
 # Importing Streamlit for building the web-based interactive application framework
 import streamlit as st
 
-# Importing all functions
+# Importing all functions (lazily: a section's module and its dependencies are
+# imported the first time the section is shown)
 from Import_Functions_Deployed import *
 
+# Streamlit cache of the preprocessed datasets (memory-mapped columnar copy or CSV)
+from shared_functions.page_cache import cached_dataset
+
 # Setting the page title
 # This title will only be visible when running the app locally.
 # In the deployed app, the title will be displayed as "Title - Streamlit," where "Title" is the one we provide.
@@ -214,11 +220,7 @@ def main():
                 )
 
         else:
-            df = pd.read_csv(
-                os.path.join(DATASET_DIR, f"Preprocessed_{ticker_symbol}_Dataset.csv"),
-                index_col="date",
-                parse_dates=True,
-            )
+            df = cached_dataset(ticker_symbol, DATASET_DIR)
             date_options = df.index.strftime("%Y-%m-%d").tolist()
             selected_date = st.selectbox("Select Date", date_options)
             selected_row = df.loc[selected_date]
@@ -344,6 +346,10 @@ def main():
         """
         display_resources_information()
 
+    # Cache hit rates and section import times, shown after the section ran
+    display_cache_stats()
+    display_startup_report()
+
 
 # Running the main function
 if __name__ == "__main__":
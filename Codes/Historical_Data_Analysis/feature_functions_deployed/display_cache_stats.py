@@ -0,0 +1,31 @@
+# Importing Streamlit for building the web-based interactive application framework
+import streamlit as st
+
+# Counters and controls of the Streamlit page caches
+from shared_functions.page_cache import CACHE_TTL_SECONDS, cache_stats, clear_caches
+
+# Function to show the hit rates of the page caches in the sidebar
+
+def display_cache_stats():
+    """
+    Displays a collapsible sidebar panel with the calls, hits, misses and limits of
+    the dataset, prediction, figure and model caches, and a button to clear them.
+    """
+    with st.sidebar.expander("Cache Statistics"):
+        # A Markdown table keeps Pandas out of pages that do not otherwise need it
+        rows = [
+            "| Cache | Calls | Hits | Misses | Hit Rate | Max Entries |",
+            "|---|---|---|---|---|---|",
+        ]
+        for stats in cache_stats():
+            rows.append(
+                f"| {stats['cache']} | {stats['calls']} | {stats['hits']} | {stats['misses']} "
+                f"| {stats['hit_rate']:.0%} | {stats['max_entries']} |"
+            )
+        st.markdown("\n".join(rows))
+        st.caption(f"Cached data and figures expire after {CACHE_TTL_SECONDS} seconds.")
+
+        # Clearing forces the next visit of every section to reload its data
+        if st.button("Clear Caches"):
+            clear_caches()
+            st.rerun()
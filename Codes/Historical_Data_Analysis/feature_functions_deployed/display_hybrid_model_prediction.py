@@ -4,12 +4,12 @@ import os
 # Importing Pandas for data manipulation and analysis
 import pandas as pd
 
-# Importing Pickle for loading/saving pre-trained machine learning models
-import pickle
-
 # Importing Streamlit for building the web-based interactive application framework
 import streamlit as st
 
+# Shared model registry (lazy loading, cached across reruns)
+from shared_functions.page_cache import cached_model
+
 # Importing TextBlob for basic natural language processing tasks
 from textblob import TextBlob
 
@@ -30,8 +30,7 @@ def display_hybrid_model_prediction():
 
     # Step 1: Load the pre-trained model
     try:
-        with open(model_path, "rb") as file:
-            model = pickle.load(file)
+        model = cached_model(model_path)
         st.write("Model loaded successfully.")
     except FileNotFoundError:
         st.error("Model file not found at the specified path.")
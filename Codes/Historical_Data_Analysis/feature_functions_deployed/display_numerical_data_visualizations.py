@@ -1,49 +1,42 @@
-# Importing OS module for handling file and directory paths
-import os
-
-# Importing Pandas for data manipulation and analysis
-import pandas as pd
-
 # Importing Plotly for creating interactive and dynamic visual plots
 import plotly.graph_objects as go
 
 # Importing Streamlit for building the web-based interactive application framework
 import streamlit as st
 
-# Function to display visualizations for the selected ticker
-DATASET_DIR = "Codes/Historical_Data_Analysis/Preprocessed_Dataset"
+# Memory-mapped columnar copy of the preprocessed datasets (falls back to CSV)
+from shared_functions.columnar_store import dataset_exists
 
+# Shared technical indicators (RSI, moving average)
+from shared_functions.indicators import rsi, sma
 
-def display_numerical_data_visualizations(ticker):
-    # Define the dataset file path
-    dataset_path = os.path.join(DATASET_DIR, f"Preprocessed_{ticker}_Dataset.csv")
+# Largest-triangle-three-buckets and min/max downsampling of the plotted traces
+from shared_functions.downsampling import DEFAULT_MAX_POINTS, downsample_frame
 
-    # Check if the dataset file exists
-    if not os.path.isfile(dataset_path):
-        st.error(f"No dataset found for ticker symbol: {ticker}")
-        return
+# Streamlit caches for the dataset and the built figures
+from shared_functions.page_cache import cached_dataset, cached_figure, dataset_version
 
-    # Load the dataset
-    df = pd.read_csv(dataset_path, index_col="date", parse_dates=True)
+# Function to display visualizations for the selected ticker
+DATASET_DIR = "Codes/Historical_Data_Analysis/Preprocessed_Dataset"
 
-    # Calculate Moving Average
-    df["Moving Average"] = df["close"].rolling(window=20).mean()
 
-    # Calculate RSI
-    delta = df["close"].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df["RSI"] = 100 - (100 / (1 + rs))
+# Build the price, volume, moving average and RSI figures for a date range of the dataset
+def _build_figures(view):
+    # Reduce every trace of the range to at most DEFAULT_MAX_POINTS points
+    # (LTTB for the lines, min/max buckets for prices and volume)
+    plot = downsample_frame(
+        view,
+        lines=["Moving Average", "RSI"],
+        envelopes=["open", "high", "low", "close", "volume"],
+    )
 
     # Create the line graph for Open, High, Low, Close prices
-    st.subheader(f"{ticker} Price Visualization")
     price_fig = go.Figure()
 
     price_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["open"],
+            x=plot["open"].index,
+            y=plot["open"],
             mode="lines",
             name="Open",
             line=dict(color="#fade2a", width=2, dash="dash"),
@@ -51,8 +44,8 @@ def display_numerical_data_visualizations(ticker):
     )
     price_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["high"],
+            x=plot["high"].index,
+            y=plot["high"],
             mode="lines",
             name="High",
             line=dict(color="#f2495c", width=2, dash="dash"),
@@ -60,8 +53,8 @@ def display_numerical_data_visualizations(ticker):
     )
     price_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["low"],
+            x=plot["low"].index,
+            y=plot["low"],
             mode="lines",
             name="Low",
             line=dict(color="#5794f2", width=2, dash="dash"),
@@ -69,8 +62,8 @@ def display_numerical_data_visualizations(ticker):
     )
     price_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["close"],
+            x=plot["close"].index,
+            y=plot["close"],
             mode="lines",
             name="Close",
             line=dict(color="#73bf69", width=4),
@@ -84,18 +77,15 @@ def display_numerical_data_visualizations(ticker):
         yaxis_title="Price in USD ($)",
         template="plotly_white",
     )
-    st.plotly_chart(price_fig)
 
     # Bar chart for Volume
-    st.subheader(f"{ticker} Volume Visualization")
-
     volume_fig = go.Figure()
 
     # Set the pastel orange bar color and white outline color
     volume_fig.add_trace(
         go.Bar(
-            x=df.index,
-            y=df["volume"],
+            x=plot["volume"].index,
+            y=plot["volume"],
             marker=dict(
                 color="teal",  # Pastel Orange for bars
                 line=dict(color="teal", width=1),  # White for outline
@@ -111,16 +101,13 @@ def display_numerical_data_visualizations(ticker):
         template="plotly_white",
     )
 
-    st.plotly_chart(volume_fig)
-
     # Moving Average Plot
-    st.subheader(f"{ticker} Moving Average Visualization")
     ma_fig = go.Figure()
 
     ma_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["close"],
+            x=plot["close"].index,
+            y=plot["close"],
             mode="lines",
             name="Close",
             line=dict(color="#ff7f50", width=2),
@@ -128,8 +115,8 @@ def display_numerical_data_visualizations(ticker):
     )
     ma_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["Moving Average"],
+            x=plot["Moving Average"].index,
+            y=plot["Moving Average"],
             mode="lines",
             name="20-Day Moving Average",
             line=dict(color="#008080", width=2, dash="dash"),
@@ -142,16 +129,14 @@ def display_numerical_data_visualizations(ticker):
         yaxis_title="Price in USD ($)",
         template="plotly_white",
     )
-    st.plotly_chart(ma_fig)
 
     # RSI Plot
-    st.subheader(f"{ticker} RSI Visualization")
     rsi_fig = go.Figure()
 
     rsi_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["RSI"],
+            x=plot["RSI"].index,
+            y=plot["RSI"],
             mode="lines",
             name="RSI",
             line=dict(color="#C71585", width=2),
@@ -179,6 +164,58 @@ def display_numerical_data_visualizations(ticker):
         yaxis_range=[0, 100],
         template="plotly_white",
     )
+
+    return price_fig, volume_fig, ma_fig, rsi_fig
+
+
+def display_numerical_data_visualizations(ticker):
+    # Check if the dataset file exists
+    if not dataset_exists(ticker, DATASET_DIR):
+        st.error(f"No dataset found for ticker symbol: {ticker}")
+        return
+
+    # Load the dataset (cached across reruns)
+    df = cached_dataset(ticker, DATASET_DIR)
+
+    # Calculate Moving Average
+    df["Moving Average"] = sma(df["close"], window=20)
+
+    # Calculate RSI
+    df["RSI"] = rsi(df["close"], window=14)
+
+    # Date range shown in the charts; a narrower range is drawn in more detail, down to every day
+    first_day, last_day = df.index[0].to_pydatetime(), df.index[-1].to_pydatetime()
+    start, end = st.slider(
+        "Date Range",
+        min_value=first_day,
+        max_value=last_day,
+        value=(first_day, last_day),
+        format="YYYY-MM-DD",
+        key=f"numerical_data_range_{ticker}",
+    )
+
+    view = df.loc[start:end]
+    st.caption(
+        f"{len(view)} trading days selected, at most {DEFAULT_MAX_POINTS} points drawn per trace."
+    )
+
+    # The figures are built once per ticker, range and dataset version
+    price_fig, volume_fig, ma_fig, rsi_fig = cached_figure(
+        ("numerical_data", ticker, start, end, dataset_version(ticker, DATASET_DIR)),
+        _build_figures,
+        view,
+    )
+
+    st.subheader(f"{ticker} Price Visualization")
+    st.plotly_chart(price_fig)
+
+    st.subheader(f"{ticker} Volume Visualization")
+    st.plotly_chart(volume_fig)
+
+    st.subheader(f"{ticker} Moving Average Visualization")
+    st.plotly_chart(ma_fig)
+
+    st.subheader(f"{ticker} RSI Visualization")
     st.plotly_chart(rsi_fig)
 
     # Display information about each plot
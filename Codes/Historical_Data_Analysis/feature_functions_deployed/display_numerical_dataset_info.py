@@ -1,27 +1,24 @@
-# Importing OS module for handling file and directory paths
-import os
-
-# Importing Pandas for data manipulation and analysis
-import pandas as pd
-
 # Importing Streamlit for building the web-based interactive application framework
 import streamlit as st
 
+# Memory-mapped columnar copy of the preprocessed datasets (falls back to CSV)
+from shared_functions.columnar_store import dataset_exists
+
+# Streamlit cache of the loaded datasets
+from shared_functions.page_cache import cached_dataset
+
 # Function to load dataset based on ticker symbol and display its information
 DATASET_DIR = "Codes/Historical_Data_Analysis/Preprocessed_Dataset"
 
 
 def display_numerical_dataset_info(ticker):
-    # Define the dataset file path
-    dataset_path = os.path.join(DATASET_DIR, f"Preprocessed_{ticker}_Dataset.csv")
-
     # Check if file exists
-    if not os.path.isfile(dataset_path):
+    if not dataset_exists(ticker, DATASET_DIR):
         st.error(f"No dataset found for ticker symbol: {ticker}")
         return
 
     # Load the dataset with 'date' as the index
-    df = pd.read_csv(dataset_path, index_col="date")
+    df = cached_dataset(ticker, DATASET_DIR)
     df.index.name = "Date"  # Rename index label to 'Date'
 
     # Display company information based on the ticker symbol
@@ -43,7 +40,7 @@ def display_numerical_dataset_info(ticker):
     # Show dataset details
     st.write("**Dataset Information:**")
     st.write(f"- **Shape:** {df.shape}")
-    st.write(f"- **Date Range:** {df.index[0]} to {df.index[-1]}")
+    st.write(f"- **Date Range:** {df.index[0]:%Y-%m-%d} to {df.index[-1]:%Y-%m-%d}")
 
     # Capitalize column names for display
     df.columns = [col.capitalize() for col in df.columns]
@@ -1,66 +1,48 @@
 # Importing OS module for handling file and directory paths
 import os
 
-# Importing Pandas for data manipulation and analysis
-import pandas as pd
-
-# Importing Pickle for loading/saving pre-trained machine learning models
-import pickle
-
 # Importing Plotly for creating interactive and dynamic visual plots
 import plotly.graph_objects as go
 
 # Importing Streamlit for building the web-based interactive application framework
 import streamlit as st
 
-# Function to display visualizations for the selected ticker, including actual vs. predicted prices
-DATASET_DIR = "Codes/Historical_Data_Analysis/Preprocessed_Dataset"
+# Memory-mapped columnar copy of the preprocessed datasets (falls back to CSV)
+from shared_functions.columnar_store import dataset_exists
 
+# Largest-triangle-three-buckets and min/max downsampling of the plotted traces
+from shared_functions.downsampling import DEFAULT_MAX_POINTS, downsample_frame
 
-def display_numerical_model_visualization(ticker):
-    # Define the dataset and model paths
-    dataset_path = os.path.join(DATASET_DIR, f"Preprocessed_{ticker}_Dataset.csv")
-    model_path = os.path.join("Models", "pkl_models", f"{ticker}_Ensemble_Model.pkl")
+# Streamlit caches for the materialized predictions (built once per model version,
+# extended when rows are added) and the built figures
+from shared_functions.page_cache import (
+    cached_figure,
+    cached_predictions,
+    dataset_version,
+    file_version,
+)
 
-    # Check if the dataset file exists
-    if not os.path.isfile(dataset_path):
-        st.error(f"No dataset found for ticker symbol: {ticker}")
-        return
-
-    # Load the dataset
-    df = pd.read_csv(dataset_path, index_col="date", parse_dates=True)
-
-    # Load the model if available
-    if not os.path.isfile(model_path):
-        st.error(f"No model found for ticker symbol: {ticker}")
-        return
-
-    with open(model_path, "rb") as file:
-        model = pickle.load(file)
-
-    # Predict the closing prices
-    df["Predicted Close"] = model.predict(
-        df.drop(columns=["close"])
-    )  # Relevant features are present
+# Function to display visualizations for the selected ticker, including actual vs. predicted prices
+DATASET_DIR = "Codes/Historical_Data_Analysis/Preprocessed_Dataset"
 
-    # Calculate Moving Average
-    df["Moving Average"] = df["Predicted Close"].rolling(window=20).mean()
 
-    # Calculate RSI
-    delta = df["Predicted Close"].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df["RSI"] = 100 - (100 / (1 + rs))
+# Build the price, prediction, volume, moving average and RSI figures for a date range
+def _build_figures(view):
+    # Reduce every trace of the range to at most DEFAULT_MAX_POINTS points
+    # (LTTB for the lines, min/max buckets for prices and volume)
+    plot = downsample_frame(
+        view,
+        lines=["Predicted Close", "Moving Average", "RSI"],
+        envelopes=["open", "high", "low", "close", "volume"],
+    )
 
     # Create the line graph for Actual and Predicted Prices
-    st.subheader(f"{ticker} Price Visualization")
     price_fig = go.Figure()
 
     price_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["Predicted Close"],
+            x=plot["Predicted Close"].index,
+            y=plot["Predicted Close"],
             mode="lines",
             name="Predicted Close",
             line=dict(color="green", width=2, dash="dash"),
@@ -68,8 +50,8 @@ def display_numerical_model_visualization(ticker):
     )
     price_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["open"],
+            x=plot["open"].index,
+            y=plot["open"],
             mode="lines",
             name="Open",
             line=dict(color="#fade2a", width=2, dash="dash"),
@@ -77,8 +59,8 @@ def display_numerical_model_visualization(ticker):
     )
     price_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["high"],
+            x=plot["high"].index,
+            y=plot["high"],
             mode="lines",
             name="High",
             line=dict(color="#f2495c", width=2, dash="dash"),
@@ -86,8 +68,8 @@ def display_numerical_model_visualization(ticker):
     )
     price_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["low"],
+            x=plot["low"].index,
+            y=plot["low"],
             mode="lines",
             name="Low",
             line=dict(color="#5794f2", width=2, dash="dash"),
@@ -95,8 +77,8 @@ def display_numerical_model_visualization(ticker):
     )
     price_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["close"],
+            x=plot["close"].index,
+            y=plot["close"],
             mode="lines",
             name="Actual Close",
             line=dict(color="#B877D9", width=4),
@@ -110,16 +92,14 @@ def display_numerical_model_visualization(ticker):
         yaxis_title="Price in USD ($)",
         template="plotly_white",
     )
-    st.plotly_chart(price_fig)
 
     # Predicted vs. Actual Price Plot
-    st.subheader(f"{ticker} Actual vs Predicted Price Visualization")
     prediction_fig = go.Figure()
 
     prediction_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["close"],
+            x=plot["close"].index,
+            y=plot["close"],
             mode="lines",
             name="Actual Close",
             line=dict(color="green", width=2),
@@ -127,8 +107,8 @@ def display_numerical_model_visualization(ticker):
     )
     prediction_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["Predicted Close"],
+            x=plot["Predicted Close"].index,
+            y=plot["Predicted Close"],
             mode="lines",
             name="Predicted Close",
             line=dict(color="red", width=2, dash="dash"),
@@ -141,16 +121,13 @@ def display_numerical_model_visualization(ticker):
         yaxis_title="Price in USD ($)",
         template="plotly_white",
     )
-    st.plotly_chart(prediction_fig)
 
     # Bar chart for Volume
-    st.subheader(f"{ticker} Volume Visualization")
-
     volume_fig = go.Figure()
     volume_fig.add_trace(
         go.Bar(
-            x=df.index,
-            y=df["volume"],
+            x=plot["volume"].index,
+            y=plot["volume"],
             marker=dict(
                 color="teal",  # Set bar color
                 line=dict(color="teal", width=1),  # Outline color
@@ -166,16 +143,13 @@ def display_numerical_model_visualization(ticker):
         template="plotly_white",
     )
 
-    st.plotly_chart(volume_fig)
-
     # Moving Average Plot
-    st.subheader(f"{ticker} Moving Average Visualization")
     ma_fig = go.Figure()
 
     ma_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["Predicted Close"],
+            x=plot["Predicted Close"].index,
+            y=plot["Predicted Close"],
             mode="lines",
             name="Predicted Close",
             line=dict(color="#ff7f50", width=2),
@@ -183,8 +157,8 @@ def display_numerical_model_visualization(ticker):
     )
     ma_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["Moving Average"],
+            x=plot["Moving Average"].index,
+            y=plot["Moving Average"],
             mode="lines",
             name="20-Day Moving Average",
             line=dict(color="#008080", width=2, dash="dash"),
@@ -197,16 +171,14 @@ def display_numerical_model_visualization(ticker):
         yaxis_title="Price in USD ($)",
         template="plotly_white",
     )
-    st.plotly_chart(ma_fig)
 
     # RSI Plot
-    st.subheader(f"{ticker} RSI Visualization")
     rsi_fig = go.Figure()
 
     rsi_fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df["RSI"],
+            x=plot["RSI"].index,
+            y=plot["RSI"],
             mode="lines",
             name="RSI",
             line=dict(color="#C71585", width=2),
@@ -234,6 +206,71 @@ def display_numerical_model_visualization(ticker):
         yaxis_range=[0, 100],
         template="plotly_white",
     )
+
+    return price_fig, prediction_fig, volume_fig, ma_fig, rsi_fig
+
+
+def display_numerical_model_visualization(ticker):
+    # Define the model path
+    model_path = os.path.join("Models", "pkl_models", f"{ticker}_Ensemble_Model.pkl")
+
+    # Check if the dataset file exists
+    if not dataset_exists(ticker, DATASET_DIR):
+        st.error(f"No dataset found for ticker symbol: {ticker}")
+        return
+
+    # Check if the model file exists
+    if not os.path.isfile(model_path):
+        st.error(f"No model found for ticker symbol: {ticker}")
+        return
+
+    # Load the dataset with the stored predicted close, 20-day moving average and RSI
+    # (the model only runs when it or the dataset changed since the last visit)
+    df = cached_predictions(ticker, model_path, DATASET_DIR).rename(
+        columns={
+            "predicted_close": "Predicted Close",
+            "predicted_moving_average": "Moving Average",
+            "predicted_rsi": "RSI",
+        }
+    )
+
+    # Date range shown in the charts; a narrower range is drawn in more detail, down to every day
+    first_day, last_day = df.index[0].to_pydatetime(), df.index[-1].to_pydatetime()
+    start, end = st.slider(
+        "Date Range",
+        min_value=first_day,
+        max_value=last_day,
+        value=(first_day, last_day),
+        format="YYYY-MM-DD",
+        key=f"numerical_model_range_{ticker}",
+    )
+
+    view = df.loc[start:end]
+    st.caption(
+        f"{len(view)} trading days selected, at most {DEFAULT_MAX_POINTS} points drawn per trace."
+    )
+
+    # The figures are built once per ticker, range, dataset and model version
+    version = (dataset_version(ticker, DATASET_DIR), file_version(model_path))
+    price_fig, prediction_fig, volume_fig, ma_fig, rsi_fig = cached_figure(
+        ("numerical_model", ticker, start, end, version),
+        _build_figures,
+        view,
+    )
+
+    st.subheader(f"{ticker} Price Visualization")
+    st.plotly_chart(price_fig)
+
+    st.subheader(f"{ticker} Actual vs Predicted Price Visualization")
+    st.plotly_chart(prediction_fig)
+
+    st.subheader(f"{ticker} Volume Visualization")
+    st.plotly_chart(volume_fig)
+
+    st.subheader(f"{ticker} Moving Average Visualization")
+    st.plotly_chart(ma_fig)
+
+    st.subheader(f"{ticker} RSI Visualization")
     st.plotly_chart(rsi_fig)
 
     # Display information about each plot
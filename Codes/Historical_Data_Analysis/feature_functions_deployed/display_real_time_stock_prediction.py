@@ -20,31 +20,76 @@ from datetime import datetime, timedelta
 from sklearn.metrics import mean_squared_error, r2_score, precision_score, recall_score, f1_score
 # Importing webbrowser module to open URLs in the default browser
 import webbrowser
-# Importing yfinance for fetching historical stock data from Yahoo Finance
-import yfinance as yf
+# Importing OS module for the CPU count
+import os
 # Linear Regression model
 from sklearn.linear_model import LinearRegression
 # Random Forest Regressor
 from sklearn.ensemble import RandomForestRegressor
 # Support Vector Machine Regressor
 from sklearn.svm import SVR
+# Zero-copy sliding windows shared by the sklearn and torch models
+from shared_functions.windowing import WindowedSeries
+# Batched recursive forecasting for all models
+from shared_functions.forecasting import forecast_models
+# Process pool for training several tickers in parallel (portfolio mode)
+from shared_functions.parallel import run_parallel, worker_threads
+# Local on-disk OHLCV cache in front of Yahoo Finance
+from shared_functions.market_data import download
+# Content-addressed cache of trained models (skip or warm-start training)
+from shared_functions.trained_models import model_cache, series_key, lineage_key
+
+# Hyper-parameters of the real-time models (part of the trained-model cache key)
+MODEL_PARAMS = {
+    "rf_n_estimators": 100,
+    "svr_kernel": "rbf",
+    "lstm_hidden_size": 50,
+    "lstm_epochs": 100,
+    "lstm_lr": 0.01,
+}
+
+# Warm start when at most this many new bars arrived since the cached models
+WARM_START_MAX_NEW_BARS = 10
+# LSTM epochs and extra Random Forest trees used for a warm start
+WARM_START_EPOCHS = 10
+WARM_START_RF_TREES = 10
+# A forest grown beyond this many trees is retrained from scratch
+RF_MAX_TREES = 200
+
+
+# --- LSTM model using PyTorch ---
+class LSTMModel(nn.Module):
+    def __init__(self, hidden_size=50):
+        super().__init__()  # Call superclass constructor
+        self.lstm = nn.LSTM(
+            input_size=1, hidden_size=hidden_size, batch_first=True
+        )  # LSTM layer
+        self.fc = nn.Linear(hidden_size, 1)  # Output layer
+
+    def forward(self, x):
+        out, _ = self.lstm(x)  # Forward pass through LSTM
+        return self.fc(out[:, -1, :])  # Return last time step's output
+
 
 # Class for real time stock data fetching and prediction
 
 
 # --- CLASS DEFINITION STARTS ---
 class StockPricePredictor:
-    # Initialize the predictor with ticker name, forecast length, and optional start/end dates
-    def __init__(self, ticker, forecast_days, start_date=None, end_date=None):
+    # Initialize the predictor with ticker name, forecast length, optional start/end dates
+    # and the number of cores the Random Forest may use
+    def __init__(self, ticker, forecast_days, start_date=None, end_date=None, n_jobs=None):
         self.ticker = ticker  # Stock symbol, e.g., "AAPL" or "TCS.BO"
         self.forecast_days = forecast_days  # Number of future days to predict
         self.start_date = start_date  # Optional user-defined start date
         self.end_date = end_date  # Optional user-defined end date
+        self.n_jobs = n_jobs  # Random Forest cores (None = one core)
         self.data = None  # To hold historical stock data
         self.scaler = MinMaxScaler()  # Scaler to normalize stock prices
         self.models = {}  # Dictionary to store trained models
         self.predictions = {}  # Dictionary to store predictions from each model
         self.metrics = pd.DataFrame()  # DataFrame to store evaluation metrics
+        self.training_mode = None  # "full", "warm start" or "cached"
 
     def fetch_data(self):
         # Define end date as now if not provided
@@ -57,8 +102,9 @@ class StockPricePredictor:
         # Add 1 day to include the end date in range
         end_date += timedelta(days=1)
 
-        # Download data from Yahoo Finance using yfinance
-        self.data = yf.download(self.ticker, start=start_date, end=end_date)
+        # Download data from Yahoo Finance through the local OHLCV cache
+        # (only bars newer than the cached ones are requested again)
+        self.data = download(self.ticker, start=start_date, end=end_date)
         # Keep only the 'Close' price and drop missing values
         self.data = self.data[["Close"]].dropna()
 
@@ -69,63 +115,76 @@ class StockPricePredictor:
     def preprocess_data(self):
         # Normalize 'Close' price column
         self.data["Scaled"] = self.scaler.fit_transform(self.data[["Close"]])
-        self.X, self.y = [], []  # Initialize input-output data containers
-
-        # Create sliding window sequences for time series
-        for i in range(len(self.data) - self.forecast_days):
-            # Input = sequence of 'forecast_days'
-            self.X.append(self.data["Scaled"].values[i : i + self.forecast_days])
-            # Output = next value after the sequence
-            self.y.append(self.data["Scaled"].values[i + self.forecast_days])
 
-        self.X = np.array(self.X)  # Convert input to numpy array
-        self.y = np.array(self.y)  # Convert output to numpy array
+        # Create sliding window sequences for time series as strided views:
+        # input = sequence of 'forecast_days', output = next value after the sequence
+        self.windows = WindowedSeries(self.data["Scaled"].values, self.forecast_days)
+        self.X, self.y = self.windows.X, self.windows.y
 
     def train_models(self):
         # Split data for model training
         X_train, y_train = self.X, self.y
 
+        # Models trained on exactly this series and configuration are reused as-is
+        params = {**MODEL_PARAMS, "forecast_days": self.forecast_days}
+        key = series_key(self.data["Close"].values, params)
+        lineage = lineage_key(self.ticker.upper(), params)
+        cached = model_cache.get(key)
+        if cached is not None:
+            self.models = self._restore_models(cached)
+            self.training_mode = "cached"
+            return
+
+        # Warm start from the latest models of this ticker if only a few bars are new
+        previous, meta = model_cache.latest(lineage)
+        last_date = self.data.index[-1].value
+        if previous is not None:
+            new_bars = int((self.data.index.asi8 > meta["last_date"]).sum())
+            if meta["last_date"] > last_date or new_bars > WARM_START_MAX_NEW_BARS:
+                previous = None
+
         # --- Train Linear Regression model ---
         lr = LinearRegression()
         lr.fit(X_train, y_train)
         self.models["Linear Regression"] = lr
 
         # --- Train Random Forest Regressor ---
-        rf = RandomForestRegressor(n_estimators=100)
+        # Warm start: grow the previous forest by a few trees fitted on the new data
+        rf = previous["Random Forest"] if previous is not None else None
+        if rf is not None and rf.n_estimators + WARM_START_RF_TREES <= RF_MAX_TREES:
+            rf.set_params(
+                warm_start=True,
+                n_estimators=rf.n_estimators + WARM_START_RF_TREES,
+                n_jobs=self.n_jobs,
+            )
+        else:
+            rf = RandomForestRegressor(
+                n_estimators=MODEL_PARAMS["rf_n_estimators"], n_jobs=self.n_jobs
+            )
         rf.fit(X_train, y_train)
         self.models["Random Forest"] = rf
 
         # --- Train Support Vector Machine Regressor ---
-        svr = SVR(kernel="rbf")
+        svr = SVR(kernel=MODEL_PARAMS["svr_kernel"])
         svr.fit(X_train, y_train)
         self.models["SVM"] = svr
 
-        # --- Define and train LSTM model using PyTorch ---
-        class LSTMModel(nn.Module):
-            def __init__(self):
-                super().__init__()  # Call superclass constructor
-                self.lstm = nn.LSTM(
-                    input_size=1, hidden_size=50, batch_first=True
-                )  # LSTM layer
-                self.fc = nn.Linear(50, 1)  # Output layer
-
-            def forward(self, x):
-                out, _ = self.lstm(x)  # Forward pass through LSTM
-                return self.fc(out[:, -1, :])  # Return last time step's output
-
-        # Prepare LSTM-compatible inputs
-        X_train_lstm = torch.tensor(
-            X_train.reshape(-1, self.forecast_days, 1), dtype=torch.float32
-        )
-        y_train_lstm = torch.tensor(y_train.reshape(-1, 1), dtype=torch.float32)
+        # Prepare LSTM-compatible inputs (views over the same windows)
+        X_train_lstm, y_train_lstm = self.windows.torch_inputs()
 
-        # Instantiate LSTM model
-        lstm = LSTMModel()
+        # Instantiate LSTM model (warm start: from the previous weights)
+        lstm = LSTMModel(MODEL_PARAMS["lstm_hidden_size"])
+        epochs = MODEL_PARAMS["lstm_epochs"]
+        if previous is not None:
+            lstm.load_state_dict(previous["LSTM"])
+            epochs = WARM_START_EPOCHS
         criterion = nn.MSELoss()  # Loss function
-        optimizer = torch.optim.Adam(lstm.parameters(), lr=0.01)  # Optimizer
+        optimizer = torch.optim.Adam(
+            lstm.parameters(), lr=MODEL_PARAMS["lstm_lr"]
+        )  # Optimizer
 
-        # Train LSTM for 100 epochs
-        for epoch in range(100):
+        # Train LSTM for the configured number of epochs
+        for epoch in range(epochs):
             lstm.train()  # Set model to training mode
             output = lstm(X_train_lstm)  # Get predictions
             loss = criterion(output, y_train_lstm)  # Calculate loss
@@ -135,38 +194,30 @@ class StockPricePredictor:
 
         # Save trained LSTM model
         self.models["LSTM"] = lstm
+        self.training_mode = "warm start" if previous is not None else "full"
+
+        # Store the trained models (LSTM as its weights) for identical requests
+        payload = dict(self.models, LSTM=lstm.state_dict())
+        model_cache.put(key, payload, lineage=lineage, meta={"last_date": last_date})
+
+    def _restore_models(self, payload):
+        # Rebuild the LSTM from its cached weights
+        lstm = LSTMModel(MODEL_PARAMS["lstm_hidden_size"])
+        lstm.load_state_dict(payload["LSTM"])
+        payload["Random Forest"].set_params(n_jobs=self.n_jobs)
+        return dict(payload, LSTM=lstm)
 
     def predict_future(self):
         # Take last available sequence to forecast future prices
-        last_sequence = self.data["Scaled"].values[-self.forecast_days :]
+        last_sequence = self.windows.last_window()
 
-        # Loop through each model to predict
-        for name, model in self.models.items():
-            future_preds = []  # Store predictions
-            input_seq = last_sequence.copy()  # Working input sequence
-
-            # Predict next value, update sequence, repeat
-            for _ in range(self.forecast_days):
-                X_future = np.array([input_seq])  # Reshape input
-
-                if name == "LSTM":
-                    model.eval()
-                    with torch.no_grad():
-                        input_tensor = torch.tensor(
-                            X_future.reshape(-1, self.forecast_days, 1),
-                            dtype=torch.float32,
-                        )
-                        pred = model(input_tensor).numpy().flatten()[0]
-                else:
-                    pred = model.predict(X_future)[0]
-
-                future_preds.append(pred)  # Save prediction
-                input_seq = np.append(input_seq[1:], pred)  # Update input sequence
+        # Predict next value, shift it into the sequence, repeat: all models are
+        # advanced with preallocated buffers and a single no-grad context
+        future_preds = forecast_models(self.models, last_sequence, self.forecast_days)
 
+        for name, preds in future_preds.items():
             # Inverse scale predictions to get actual price
-            scaled_preds = self.scaler.inverse_transform(
-                np.array(future_preds).reshape(-1, 1)
-            ).flatten()
+            scaled_preds = self.scaler.inverse_transform(preds.reshape(-1, 1)).flatten()
             self.predictions[name] = scaled_preds  # Store results
 
     def evaluate_models(self):
@@ -175,10 +226,9 @@ class StockPricePredictor:
 
         for name, model in self.models.items():
             if name == "LSTM":
-                input_tensor = torch.tensor(
-                    self.X.reshape(-1, self.forecast_days, 1), dtype=torch.float32
-                )
-                y_pred = model(input_tensor).detach().numpy().flatten()
+                input_tensor, _ = self.windows.torch_inputs()
+                with torch.no_grad():
+                    y_pred = model(input_tensor).numpy().flatten()
             else:
                 y_pred = model.predict(self.X)
 
@@ -359,17 +409,76 @@ class StockPricePredictor:
         return self.metrics  # Return evaluation metrics
 
 
+# Function to run the full pipeline for one ticker (a process pool worker in portfolio mode)
+def run_ticker_pipeline(ticker, forecast_days):
+    predictor = StockPricePredictor(ticker, forecast_days, n_jobs=worker_threads())
+    predictor.fetch_data()  # Step 1: Get data
+    predictor.preprocess_data()  # Step 2: Prepare data
+    predictor.train_models()  # Step 3: Train models
+    predictor.predict_future()  # Step 4: Make predictions
+    predictor.evaluate_models()  # Step 5: Evaluate
+
+    # Only predictions and metrics are sent back: the trained models are not needed
+    # for display (and stay available in the trained-model cache)
+    predictor.models = {}
+    predictor.windows = None
+    return predictor
+
+
+# Function to show one ticker's portfolio-mode results (with the same export and
+# news options as single-ticker mode)
+def display_portfolio_result(predictor, show_news=False, export_excel=False):
+    st.subheader(f"📈 {predictor.ticker.upper()}")
+    st.write(predictor.get_predictions())
+    st.dataframe(predictor.get_metrics())
+
+    # Alerts if any
+    for alert in predictor.alert_changes():
+        st.warning(alert)
+
+    # Export to Excel
+    if export_excel:
+        predictor.export_results()
+
+    # Open news
+    if show_news:
+        predictor.open_news()
+
+
 # Function to Real Time Stock Prediction
 
 
 def display_real_time_stock_prediction():
 
     # Input fields
-    ticker = st.text_input("Enter Stock Ticker Symbol (e.g. TCS.BO, AAPL)", "AAPL")
+    portfolio_mode = st.checkbox("Portfolio Mode (several tickers in parallel)")
+    if portfolio_mode:
+        tickers = st.text_input(
+            "Enter Stock Ticker Symbols separated by commas", "AAPL, MSFT, NVDA"
+        )
+        jobs = st.number_input("Parallel Workers", 1, os.cpu_count() or 1, os.cpu_count() or 1)
+    else:
+        ticker = st.text_input("Enter Stock Ticker Symbol (e.g. TCS.BO, AAPL)", "AAPL")
     forecast_days = st.slider("Days to Predict Ahead", 1, 15, 5)
     show_news = st.checkbox("Show Latest Stock News")
     export_excel = st.checkbox("Export Predictions and Metrics to Excel")
 
+    # Run button (portfolio mode): results are shown as each ticker finishes
+    if portfolio_mode:
+        if st.button("Run Prediction"):
+            symbols = [t.strip() for t in tickers.split(",") if t.strip()]
+            progress = st.progress(0.0)
+            for done, (symbol, predictor, error) in enumerate(
+                run_parallel(run_ticker_pipeline, symbols, forecast_days, jobs=int(jobs)),
+                start=1,
+            ):
+                if error is not None:
+                    st.error(f"❌ {symbol}: {error}")
+                else:
+                    display_portfolio_result(predictor, show_news, export_excel)
+                progress.progress(done / len(symbols))
+        return
+
     # Run button
     if st.button("Run Prediction"):
         predictor = StockPricePredictor(
@@ -381,6 +490,8 @@ def display_real_time_stock_prediction():
         predictor.predict_future()  # Step 4: Make predictions
         predictor.evaluate_models()  # Step 5: Evaluate
         predictor.visualize()  # Step 6: Visualize
+        if predictor.training_mode != "full":
+            st.caption(f"♻️ Models reused from the model cache ({predictor.training_mode}).")
 
         # Show analysis period
         start_fmt = predictor.start_date_final.strftime("%d-%m-%y")
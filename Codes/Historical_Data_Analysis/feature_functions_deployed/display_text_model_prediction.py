@@ -1,23 +1,24 @@
 # Importing OS module for handling file and directory paths
 import os
 
-# Importing Pandas for data manipulation and analysis
-import pandas as pd
-
-# Importing Pickle for loading/saving pre-trained machine learning models
-import pickle
-
 # Importing Streamlit for building the web-based interactive application framework
 import streamlit as st
 
-# Text feature extraction
-from sklearn.feature_extraction.text import TfidfVectorizer
+# Shared model registry (lazy loading, cached across reruns)
+from shared_functions.page_cache import cached_model
+
+# Persisted TF-IDF vectorizer shared with the InfluxDB loader
+from shared_functions.text_vectorizer import (
+    VECTORIZER_FILENAME,
+    load_text_vectorizer,
+    transform_text,
+)
 
 # Function to predict and display the text model prediction
 
 
 def display_text_model_prediction():
-    # File paths for the dataset and model
+    # File paths for the dataset, model and fitted vectorizer
     csv_path = os.path.join(
         "Codes",
         "Historical_Data_Analysis",
@@ -25,50 +26,46 @@ def display_text_model_prediction():
         "Dataset",
         "Preprocessed_Text_Dataset.csv",
     )
-    model_path = os.path.join(
+    model_dir = os.path.join(
         "Codes",
         "Historical_Data_Analysis",
         "Textual_Analysis",
         "Models",
         "Classification",
         "pkl_models",
-        "Random_Forest_Best_Model.pkl",
     )
+    model_path = os.path.join(model_dir, "Random_Forest_Best_Model.pkl")
+    vectorizer_path = os.path.join(model_dir, VECTORIZER_FILENAME)
 
-    # Step 1: Load the preprocessed dataset
+    # Step 1: Load the pre-trained model
     try:
-        data = pd.read_csv(csv_path)
-        st.write("Dataset loaded successfully.")
+        model = cached_model(model_path)
+        # st.write("Model loaded successfully.")
     except FileNotFoundError:
-        st.error("Dataset file not found at the specified path.")
+        # st.error("Model file not found at the specified path.")
         return
 
-    # Step 2: Load the pre-trained model
+    # Step 2: Load the fitted TF-IDF vectorizer (once per process).
+    # The dataset is only read if the artifact has not been built yet.
     try:
-        with open(model_path, "rb") as file:
-            model = pickle.load(file)
-        # st.write("Model loaded successfully.")
+        vectorizer = load_text_vectorizer(vectorizer_path, csv_path=csv_path)
     except FileNotFoundError:
-        # st.error("Model file not found at the specified path.")
+        st.error("Vectorizer artifact and dataset file not found.")
         return
 
-    # Step 3: Vectorize the cleaned text data using TF-IDF
-    vectorizer = TfidfVectorizer(max_features=5000)
-    X_transformed = vectorizer.fit_transform(data["cleaned_text"]).toarray()
-
-    # Step 4: Streamlit input for user text
+    # Step 3: Streamlit input for user text
     user_input = st.text_input(
         "Enter the text to predict the stock movement (0: Down, 1: Up):"
     )
 
     if user_input:
-        # Step 5: Transform user input using the same vectorizer
-        user_input_transformed = vectorizer.transform([user_input]).toarray()
+        # Step 4: Transform user input using the same vectorizer (kept sparse)
+        user_input_transformed = transform_text(vectorizer, user_input)
 
-        # Step 6: Use the model to predict the user input
+        # Step 5: Use the model to predict the user input
         prediction = model.predict(user_input_transformed)
 
-        # Step 7: Display prediction
+        # Step 6: Display prediction
         if prediction[0] == 1:
             st.success("The model predicts: Up (1)")
         else:
@@ -2,35 +2,32 @@
 import os
 # Importing Pandas for data manipulation and analysis
 import pandas as pd
-# Importing Pickle for loading/saving pre-trained machine learning models
-import pickle
 # Importing Streamlit for building the web-based interactive application framework
 import streamlit as st
+# Existence check against the preprocessed datasets
+from shared_functions.columnar_store import dataset_exists
+# Shared model registry (lazy loading, cached across reruns)
+from shared_functions.page_cache import cached_model
 
 # Define the function for displaying the model prediction
 DATASET_DIR = 'Preprocessed_Dataset'
 
 def display_numerical_model_predicted(ticker, open_price, high, low, volume):
-    # Define dataset and model paths
-    dataset_path = os.path.join(DATASET_DIR, f"Preprocessed_{ticker}_Dataset.csv")
+    # Define the model path
     model_path = os.path.join("Models", "pkl_models", f"{ticker}_Ensemble_Model.pkl")
 
     # Check if the dataset file exists
-    if not os.path.isfile(dataset_path):
+    if not dataset_exists(ticker, DATASET_DIR):
         st.error(f"No dataset found for ticker symbol: {ticker}")
         return
 
-    # Load the dataset
-    df = pd.read_csv(dataset_path, index_col="date", parse_dates=True)
-
     # Check if the model file exists
     if not os.path.isfile(model_path):
         st.error(f"No model found for ticker symbol: {ticker}")
         return
 
     # Load the model
-    with open(model_path, "rb") as file:
-        model = pickle.load(file)
+    model = cached_model(model_path)
 
     # Create a new DataFrame for the input values to predict
     input_data = pd.DataFrame(
@@ -0,0 +1,22 @@
+# Importing Streamlit for building the web-based interactive application framework
+import streamlit as st
+# Import times recorded by the lazy section imports
+from shared_functions.lazy_imports import format_import_times, import_reports
+
+# Function to show how long each section took to import in the sidebar
+
+def display_startup_report():
+    """
+    Displays a collapsible sidebar panel with the import time of every section shown
+    so far (sections are imported the first time they are opened) and, per section,
+    its slowest modules in the 'python -X importtime' layout (microseconds).
+    """
+    with st.sidebar.expander("Startup Report"):
+        reports = import_reports()
+        st.write(f"**Total import time:** {sum(report['seconds'] for report in reports):.2f}s")
+        for report in reports:
+            st.write(
+                f"**{report['module'].rsplit('.', 1)[-1]}:** {report['seconds']:.2f}s "
+                f"({len(report['modules'])} modules)"
+            )
+            st.code(format_import_times(report, top=10), language=None)
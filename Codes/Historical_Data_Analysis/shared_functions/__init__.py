@@ -0,0 +1,7 @@
+"""
+Shared helpers used by both feature function trees ('feature_functions_local/' and
+'feature_functions_deployed/'), the InfluxDB loaders and the Flask app.
+
+Each module in this package is independent, so importing one helper never pulls in
+the heavy dependencies of another.
+"""
@@ -0,0 +1,196 @@
+"""
+Columnar, memory-mappable copy of the preprocessed stock datasets.
+
+Parsing 'Preprocessed_<TICKER>_Dataset.csv' (dates and floats) on every page view is
+wasted work, so each ticker can be converted once into a folder of '.npy' columns:
+
+    Preprocessed_Dataset/columnar/<TICKER>/
+        date.npy      int64 nanoseconds since the Unix epoch (the index)
+        open.npy      one float64/int64 array per CSV column
+        ...
+        meta.json     column order plus the size and SHA-256 of the source CSV
+
+'load_dataset' memory-maps these arrays read-only and wraps them in a DataFrame with
+a DatetimeIndex named 'date', matching 'pd.read_csv(..., index_col="date",
+parse_dates=True)'. When the columnar copy is missing or no longer matches the CSV it
+falls back to parsing the CSV, so a stale copy is never served.
+
+Usage:
+    python -m shared_functions.columnar_store [TICKER ...]
+
+converts every CSV in 'Preprocessed_Dataset' (or only the listed tickers).
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing json for the metadata file
+import json
+
+# Importing hashlib to fingerprint the source CSV
+import hashlib
+
+# Importing NumPy for column storage and memory mapping
+import numpy as np
+
+# Importing Pandas for data manipulation and analysis
+import pandas as pd
+
+# Bump when the on-disk layout changes so old copies are treated as stale
+STORE_VERSION = 1
+
+# Base directory ('Historical_Data_Analysis') and default dataset folder
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATASET_DIR = os.path.join(BASE_DIR, "Preprocessed_Dataset")
+
+# Name of the sub-folder holding the columnar copies
+COLUMNAR_DIRNAME = "columnar"
+
+
+def csv_path_for(ticker, dataset_dir=DEFAULT_DATASET_DIR):
+    """Path of the preprocessed CSV for a ticker."""
+    return os.path.join(dataset_dir, f"Preprocessed_{ticker}_Dataset.csv")
+
+
+def store_path_for(ticker, dataset_dir=DEFAULT_DATASET_DIR):
+    """Path of the columnar folder for a ticker."""
+    return os.path.join(dataset_dir, COLUMNAR_DIRNAME, ticker)
+
+
+# Per-process memo of CSV fingerprints, keyed by (path, mtime_ns, size)
+_stamps = {}
+
+
+def _source_stamp(csv_path):
+    """
+    Fingerprint of a CSV (size and SHA-256). A content hash rather than the mtime is
+    used so a checked-out or copied columnar folder stays valid; hashing is cheap
+    next to parsing and is memoized while the file's mtime does not change.
+    """
+    stat = os.stat(csv_path)
+    key = (os.path.abspath(csv_path), stat.st_mtime_ns, stat.st_size)
+    stamp = _stamps.get(key)
+    if stamp is None:
+        with open(csv_path, "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        stamp = {"size": stat.st_size, "sha256": digest}
+        _stamps[key] = stamp
+    return stamp
+
+
+def source_stamp(ticker, dataset_dir=DEFAULT_DATASET_DIR):
+    """Fingerprint of a ticker's CSV, or None when only a columnar copy exists."""
+    csv_path = csv_path_for(ticker, dataset_dir)
+    return _source_stamp(csv_path) if os.path.isfile(csv_path) else None
+
+
+def convert_dataset(ticker, dataset_dir=DEFAULT_DATASET_DIR):
+    """
+    Convert one ticker's CSV into '.npy' columns. Returns the columnar folder path.
+    """
+    csv_path = csv_path_for(ticker, dataset_dir)
+    store_path = store_path_for(ticker, dataset_dir)
+    stamp = _source_stamp(csv_path)
+
+    df = pd.read_csv(csv_path, index_col="date", parse_dates=True)
+    os.makedirs(store_path, exist_ok=True)
+
+    # The date index is stored as int64 epoch nanoseconds
+    np.save(os.path.join(store_path, "date.npy"), df.index.asi8)
+    for column in df.columns:
+        np.save(os.path.join(store_path, f"{column}.npy"), df[column].to_numpy())
+
+    meta = {
+        "version": STORE_VERSION,
+        "columns": list(df.columns),
+        "rows": len(df),
+        "source": stamp,
+    }
+    # meta.json is written last, so a half-written folder is never considered fresh
+    tmp_path = os.path.join(store_path, "meta.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(meta, file, indent=2)
+    os.replace(tmp_path, os.path.join(store_path, "meta.json"))
+
+    return store_path
+
+
+def _read_meta(store_path):
+    try:
+        with open(os.path.join(store_path, "meta.json"), encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(ticker, dataset_dir=DEFAULT_DATASET_DIR):
+    """True if the columnar copy exists and was built from the current CSV."""
+    csv_path = csv_path_for(ticker, dataset_dir)
+    meta = _read_meta(store_path_for(ticker, dataset_dir))
+    if meta is None or meta.get("version") != STORE_VERSION:
+        return False
+    if not os.path.isfile(csv_path):
+        # No CSV to compare against: the columnar copy is the only source
+        return True
+    return meta.get("source") == _source_stamp(csv_path)
+
+
+def dataset_exists(ticker, dataset_dir=DEFAULT_DATASET_DIR):
+    """True if either the CSV or a columnar copy exists for the ticker."""
+    return os.path.isfile(csv_path_for(ticker, dataset_dir)) or (
+        _read_meta(store_path_for(ticker, dataset_dir)) is not None
+    )
+
+
+def _load_columnar(ticker, dataset_dir):
+    store_path = store_path_for(ticker, dataset_dir)
+    meta = _read_meta(store_path)
+
+    dates = np.load(os.path.join(store_path, "date.npy"), mmap_mode="r")
+    index = pd.DatetimeIndex(dates.view("datetime64[ns]"), name="date")
+
+    # Read-only memory maps: the OS pages data in on demand and shares it
+    # between processes, and copy=False keeps pandas from copying the columns.
+    # np.asarray drops the memmap subclass but keeps viewing the mapped buffer.
+    columns = {
+        column: np.asarray(
+            np.load(os.path.join(store_path, f"{column}.npy"), mmap_mode="r")
+        )
+        for column in meta["columns"]
+    }
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def load_dataset(ticker, dataset_dir=DEFAULT_DATASET_DIR):
+    """
+    Return the preprocessed dataset for a ticker as a DataFrame indexed by 'date'.
+
+    Uses the memory-mapped columnar copy when it is fresh and falls back to parsing
+    the CSV otherwise. Raises FileNotFoundError if neither exists. Columns served
+    from the columnar copy are read-only; add new columns rather than editing them.
+    """
+    if is_fresh(ticker, dataset_dir):
+        return _load_columnar(ticker, dataset_dir)
+    return pd.read_csv(
+        csv_path_for(ticker, dataset_dir), index_col="date", parse_dates=True
+    )
+
+
+def available_tickers(dataset_dir=DEFAULT_DATASET_DIR):
+    """Tickers that have a preprocessed CSV in the dataset folder."""
+    tickers = []
+    for filename in sorted(os.listdir(dataset_dir)):
+        if filename.startswith("Preprocessed_") and filename.endswith("_Dataset.csv"):
+            tickers.append(filename[len("Preprocessed_") : -len("_Dataset.csv")])
+    return tickers
+
+
+# Convert the datasets when run as a script
+if __name__ == "__main__":
+    import sys
+
+    for ticker in sys.argv[1:] or available_tickers():
+        if is_fresh(ticker):
+            print(f"{ticker}: columnar copy is up to date.")
+            continue
+        print(f"{ticker}: converted to {convert_dataset(ticker)}")
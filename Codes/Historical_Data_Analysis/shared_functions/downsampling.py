@@ -0,0 +1,116 @@
+"""
+Server-side downsampling of long time series for the Plotly pages.
+
+The numerical visualization pages used to send every daily row of every trace to
+the browser: for AAPL's 44 years that is over 100k points per page, which makes the
+websocket transfer and the rendering slow although a chart is only ~1000 pixels
+wide. Traces are reduced to about 'max_points' points of the visible range instead:
+
+- Lines (predictions, moving average, RSI) use largest-triangle-three-buckets
+  ('lttb_indices'), which keeps the points that shape the line.
+- Price and volume series use min/max bucketing ('minmax_indices'), which keeps
+  the lowest and highest value of every bucket, so no peak or trough is lost.
+
+A visible range with at most 'max_points' rows is returned at full resolution, so
+the daily data is only sent when the user narrows the range down to it.
+"""
+
+# Importing NumPy for the bucket computations
+import numpy as np
+
+# Points kept per trace; about the width of a chart in pixels
+DEFAULT_MAX_POINTS = 2000
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Sorted indices of the 'n_out' points of (x, y) chosen by largest-triangle-three-
+    buckets. The first and last points are always kept; every bucket in between
+    keeps the point forming the largest triangle with the point kept before it and
+    the average point of the next bucket.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Interior points split into n_out - 2 buckets of (nearly) equal size
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, stops = edges[:-1], edges[1:]
+
+    # Average point of every bucket from cumulative sums; the last bucket looks at the
+    # last point
+    sums_x = np.concatenate([[0.0], np.cumsum(x)])
+    sums_y = np.concatenate([[0.0], np.cumsum(y)])
+    sizes = stops - starts
+    next_x = np.append(((sums_x[stops] - sums_x[starts]) / sizes)[1:], x[-1])
+    next_y = np.append(((sums_y[stops] - sums_y[starts]) / sizes)[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    kept = 0
+    # Each bucket depends on the point kept in the previous one, so buckets are
+    # visited in order
+    for bucket, (start, stop) in enumerate(zip(starts, stops)):
+        ax, ay = x[kept], y[kept]
+        area = np.abs(
+            (ax - next_x[bucket]) * (y[start:stop] - ay)
+            - (ax - x[start:stop]) * (next_y[bucket] - ay)
+        )
+        kept = start + int(area.argmax())
+        selected[bucket + 1] = kept
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """
+    Sorted indices of the minimum and maximum of every bucket of 'y', about
+    'n_out' points in total (two per bucket), plus the first and last points.
+    """
+    n = len(y)
+    n_buckets = n_out // 2
+    if n <= n_out or n_buckets < 1:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Equal buckets as rows of a matrix; the padding of the last row is never picked
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    low = np.full(n_buckets * size, np.inf)
+    high = np.full(n_buckets * size, -np.inf)
+    low[:n] = high[:n] = y
+    offsets = np.arange(n_buckets) * size
+    lows = offsets + low.reshape(n_buckets, size).argmin(axis=1)
+    highs = offsets + high.reshape(n_buckets, size).argmax(axis=1)
+    return np.unique(np.concatenate([[0, n - 1], lows, highs]))
+
+
+def downsample(series, method="lttb", max_points=DEFAULT_MAX_POINTS):
+    """
+    Time-indexed Series reduced to about 'max_points' points with "lttb" or
+    "minmax". Missing values are dropped first (they are not drawn anyway).
+    """
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+    if method == "lttb":
+        x = series.index.asi8 - series.index.asi8[0]
+        indices = lttb_indices(x, series.to_numpy(), max_points)
+    elif method == "minmax":
+        indices = minmax_indices(series.to_numpy(), max_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return series.iloc[indices]
+
+
+def downsample_frame(df, lines=(), envelopes=(), max_points=DEFAULT_MAX_POINTS):
+    """
+    Dictionary of downsampled Series for the columns of a time-indexed DataFrame:
+    'lines' are reduced with LTTB, 'envelopes' (prices, volume) with min/max buckets.
+    """
+    traces = {column: downsample(df[column], "lttb", max_points) for column in lines}
+    traces.update(
+        {column: downsample(df[column], "minmax", max_points) for column in envelopes}
+    )
+    return traces
@@ -0,0 +1,117 @@
+"""
+Batched recursive (multi-step) forecasting.
+
+Recursive forecasting feeds every prediction back in as input for the next step.
+Doing that with one 1-row 'predict' call per step, per model and per ticker means
+thousands of scalar calls and an 'np.append' / new tensor on every step. The engine
+here instead advances many starting points ("scenarios": tickers, what-if inputs)
+together:
+
+- each step is one batched 'predict' (or one LSTM forward pass) over all scenarios,
+- inputs and outputs live in preallocated buffers; each step's input is a view,
+- every torch model runs inside a single 'torch.no_grad()' context.
+
+Two recursion styles are supported:
+
+- Window mode (target_columns=None): the input is the last 'window' values of a
+  series and each prediction is shifted in (StockPricePredictor).
+- Feature mode (target_columns=[...]): the input is one feature row and each
+  prediction overwrites the given columns of the next row (stockteller_analyzer,
+  where the predicted close becomes the next day's open/high/low/close).
+"""
+
+# Importing NumPy for numerical computations and array operations
+import numpy as np
+
+# No-op context used when no torch model is involved
+from contextlib import nullcontext
+
+
+def _is_torch_module(model):
+    return not hasattr(model, "predict") and callable(model) and hasattr(
+        model, "parameters"
+    )
+
+
+def _batch_predictor(model):
+    """Return a function mapping a (batch, n) float array to (batch,) predictions."""
+    if not _is_torch_module(model):
+        return lambda X: np.asarray(model.predict(X), dtype=np.float64).reshape(-1)
+
+    import torch
+
+    model.eval()
+
+    def predict(X):
+        # LSTM models expect (batch, sequence, 1) float32 input
+        tensor = torch.from_numpy(np.ascontiguousarray(X, dtype=np.float32))
+        return model(tensor.unsqueeze(-1)).numpy().astype(np.float64).reshape(-1)
+
+    return predict
+
+
+def _no_grad_for(models):
+    """One torch.no_grad() context if any model is a torch module, else a no-op."""
+    if any(_is_torch_module(model) for model in models):
+        import torch
+
+        return torch.no_grad()
+    return nullcontext()
+
+
+def recursive_forecast(model, start, horizon, target_columns=None):
+    """
+    Forecast 'horizon' steps ahead for one model.
+
+    Parameters:
+    - model: fitted scikit-learn estimator or torch module (sequence model).
+    - start: 1-D starting input, or 2-D (scenarios, n) for several at once.
+    - horizon: number of steps to forecast.
+    - target_columns: None for window mode, or the feature columns the prediction
+      is written into for the next step (feature mode).
+
+    Returns an array of shape (horizon,) for 1-D 'start', else (scenarios, horizon).
+    """
+    with _no_grad_for([model]):
+        return _forecast(_batch_predictor(model), start, horizon, target_columns)
+
+
+def forecast_models(models, start, horizon, target_columns=None):
+    """
+    Run 'recursive_forecast' for every model in a {name: model} dict, sharing one
+    no-grad context. Returns {name: forecasts}.
+    """
+    with _no_grad_for(models.values()):
+        return {
+            name: _forecast(_batch_predictor(model), start, horizon, target_columns)
+            for name, model in models.items()
+        }
+
+
+def _forecast(predict, start, horizon, target_columns):
+    start = np.asarray(start, dtype=np.float64)
+    single = start.ndim == 1
+    inputs = start.reshape(1, -1) if single else start
+    batch, width = inputs.shape
+
+    # Preallocated output buffer: one row per scenario, one column per step
+    out = np.empty((batch, horizon), dtype=np.float64)
+
+    if target_columns is None:
+        # Window mode: a shift register holding the window plus all predictions;
+        # the input for step t is the view buffer[:, t : t + width]
+        buffer = np.empty((batch, width + horizon), dtype=np.float64)
+        buffer[:, :width] = inputs
+        for step in range(horizon):
+            pred = predict(buffer[:, step : step + width])
+            buffer[:, width + step] = pred
+            out[:, step] = pred
+    else:
+        # Feature mode: the row is updated in place with each prediction
+        row = inputs.copy()
+        for step in range(horizon):
+            pred = predict(row)
+            out[:, step] = pred
+            row[:, target_columns] = pred[:, None]
+
+    return out[0] if single else out
@@ -0,0 +1,260 @@
+"""
+Technical indicators shared by the Streamlit pages, the InfluxDB loaders and any
+real-time consumer.
+
+Two flavours of every indicator are provided and produce the same numbers (up to
+floating point rounding):
+
+- Whole-series kernels ('sma', 'ema', 'rsi') that compute the indicator for a full
+  history in a few vectorized NumPy/pandas passes.
+- Streaming state objects ('SMAState', 'EMAState', 'RSIState') that update the
+  indicator in O(1) when one new bar arrives, so a live feed never recomputes
+  full-history rolling windows.
+
+RSI comes in two variants:
+- "sma": simple moving averages of gains and losses. This is the formula the
+  project has always used for the numerical models (window 14).
+- "wilder": Wilder's exponential smoothing (alpha = 1 / window), identical to
+  'ta.momentum.RSIIndicator', used by the hybrid model loader.
+
+All kernels return float64 NumPy arrays aligned with the input, with NaN where the
+window is not yet full.
+"""
+
+# Importing NumPy for numerical computations and array operations
+import numpy as np
+
+# Importing Pandas for the exponentially weighted kernels
+import pandas as pd
+
+# Ring buffers for the streaming states
+from collections import deque
+
+# Default windows used throughout the project
+RSI_WINDOW = 14
+MOVING_AVERAGE_WINDOW = 20
+
+
+def _as_float_array(values):
+    return np.asarray(values, dtype=np.float64)
+
+
+def _rolling_mean(values, window):
+    """Rolling mean with NaN until the window is full (like pandas rolling().mean())."""
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+    csum = np.cumsum(values)
+    sums = csum[window - 1 :].copy()
+    sums[1:] -= csum[:-window]
+    out[window - 1 :] = sums / window
+    return out
+
+
+def _gains_losses(values):
+    """Per-bar gains and losses; the first bar has neither (as in the pandas formula)."""
+    delta = np.empty_like(values)
+    delta[0] = 0.0
+    np.subtract(values[1:], values[:-1], out=delta[1:])
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    return gains, losses
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def sma(values, window=MOVING_AVERAGE_WINDOW):
+    """Simple moving average over 'window' bars."""
+    values = _as_float_array(values)
+    if len(values) == 0:
+        return values.copy()
+    if np.isnan(values).any():
+        # Fall back to pandas so NaN gaps are handled exactly like rolling().mean()
+        return pd.Series(values).rolling(window=window).mean().to_numpy()
+    return _rolling_mean(values, window)
+
+
+def ema(values, span):
+    """Exponential moving average (pandas 'ewm(span=span, adjust=False)')."""
+    values = _as_float_array(values)
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def rsi(values, window=RSI_WINDOW, method="sma"):
+    """
+    Relative Strength Index of a price series.
+
+    method="sma" reproduces the project's original formula
+    (delta.where + rolling(window).mean()); method="wilder" reproduces
+    'ta.momentum.RSIIndicator(values, window).rsi()'.
+    """
+    values = _as_float_array(values)
+    if len(values) == 0:
+        return values.copy()
+    gains, losses = _gains_losses(values)
+
+    if method == "sma":
+        if np.isnan(values).any():
+            gains = pd.Series(gains).rolling(window=window).mean().to_numpy()
+            losses = pd.Series(losses).rolling(window=window).mean().to_numpy()
+        else:
+            gains = _rolling_mean(gains, window)
+            losses = _rolling_mean(losses, window)
+        return _rsi_from_averages(gains, losses)
+
+    if method == "wilder":
+        alpha = 1.0 / window
+        avg_gain = (
+            pd.Series(gains).ewm(alpha=alpha, min_periods=window, adjust=False).mean()
+        ).to_numpy()
+        avg_loss = (
+            pd.Series(losses).ewm(alpha=alpha, min_periods=window, adjust=False).mean()
+        ).to_numpy()
+        out = _rsi_from_averages(avg_gain, avg_loss)
+        out[avg_loss == 0] = 100.0
+        return out
+
+    raise ValueError(f"Unknown RSI method: {method!r}")
+
+
+# --- Streaming state objects ---
+
+
+class SMAState:
+    """O(1) simple moving average over the last 'window' values."""
+
+    def __init__(self, window=MOVING_AVERAGE_WINDOW):
+        self.window = window
+        self._buffer = deque(maxlen=window)
+        self._sum = 0.0
+        self._updates = 0
+        self.value = np.nan
+
+    def update(self, x):
+        """Add one value and return the current average (NaN until the window is full)."""
+        x = float(x)
+        if len(self._buffer) == self.window:
+            self._sum -= self._buffer[0]
+        self._buffer.append(x)
+        self._sum += x
+
+        # Re-sum the buffer once per window to stop rounding drift (amortized O(1))
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._sum = float(np.sum(self._buffer))
+
+        full = len(self._buffer) == self.window
+        self.value = self._sum / self.window if full else np.nan
+        return self.value
+
+    @classmethod
+    def from_history(cls, values, window=MOVING_AVERAGE_WINDOW):
+        """Build a state that has already seen 'values' (only the tail is replayed)."""
+        state = cls(window)
+        for x in _as_float_array(values)[-window:]:
+            state.update(x)
+        return state
+
+
+class EMAState:
+    """O(1) exponential moving average matching 'ewm(span=span, adjust=False)'."""
+
+    def __init__(self, span=None, alpha=None):
+        if alpha is None:
+            alpha = 2.0 / (span + 1.0)
+        self.alpha = alpha
+        self.value = np.nan
+
+    def update(self, x):
+        """Add one value and return the current average."""
+        x = float(x)
+        if np.isnan(self.value):
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    @classmethod
+    def from_history(cls, values, span):
+        """Build a state seeded with the EMA of 'values'."""
+        state = cls(span)
+        history = ema(values, span)
+        if len(history):
+            state.value = float(history[-1])
+        return state
+
+
+class RSIState:
+    """
+    O(1) Relative Strength Index. 'method' has the same meaning as in 'rsi', and
+    feeding a series bar by bar yields the same values as 'rsi' on the whole series.
+    """
+
+    def __init__(self, window=RSI_WINDOW, method="sma"):
+        if method not in ("sma", "wilder"):
+            raise ValueError(f"Unknown RSI method: {method!r}")
+        self.window = window
+        self.method = method
+        self.prev = None
+        self.count = 0
+        if method == "sma":
+            self._gains = SMAState(window)
+            self._losses = SMAState(window)
+        else:
+            self._gains = EMAState(alpha=1.0 / window)
+            self._losses = EMAState(alpha=1.0 / window)
+        self.value = np.nan
+
+    def update(self, price):
+        """Add one closing price and return the current RSI (NaN during warm-up)."""
+        price = float(price)
+        delta = 0.0 if self.prev is None else price - self.prev
+        self.prev = price
+        self.count += 1
+
+        self._gains.update(delta if delta > 0 else 0.0)
+        self._losses.update(-delta if delta < 0 else 0.0)
+        return self._refresh()
+
+    def _refresh(self):
+        avg_gain, avg_loss = self._gains.value, self._losses.value
+        if self.count < self.window:
+            self.value = np.nan
+        elif self.method == "wilder" and avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = float(
+                _rsi_from_averages(np.float64(avg_gain), np.float64(avg_loss))
+            )
+        return self.value
+
+    @classmethod
+    def from_history(cls, values, window=RSI_WINDOW, method="sma"):
+        """Build a state that has already seen 'values'."""
+        values = _as_float_array(values)
+        if method == "sma":
+            # Only the last window + 1 prices influence a simple-average RSI
+            state = cls(window, method)
+            for price in values[-(window + 1) :]:
+                state.update(price)
+            state.count = len(values)
+            state._refresh()
+            return state
+
+        state = cls(window, method)
+        if len(values):
+            gains, losses = _gains_losses(values)
+            alpha = 1.0 / window
+            state._gains.value = float(
+                pd.Series(gains).ewm(alpha=alpha, adjust=False).mean().iloc[-1]
+            )
+            state._losses.value = float(
+                pd.Series(losses).ewm(alpha=alpha, adjust=False).mean().iloc[-1]
+            )
+            state.prev = float(values[-1])
+            state.count = len(values)
+            state._refresh()
+        return state
@@ -0,0 +1,284 @@
+"""
+Asynchronous, batched InfluxDB writer shared by the InfluxDB loaders.
+
+The loaders used to push a whole DataFrame per ticker through a SYNCHRONOUS
+'write_api': large uploads blocked the script and one transient error lost the
+whole ticker. 'InfluxWriter' wraps the client's batching write mode instead:
+
+- Points are sent in the background in batches of 'batch_size', flushed at least
+  every 'flush_interval' ms, with an optional random 'jitter_interval' (ms).
+- Failed batches are retried by the client with exponential backoff
+  ('retry_interval', 'max_retries', 'max_retry_delay', 'exponential_base').
+- At most 'max_in_flight' batches are queued or being sent at any time; writers
+  block until earlier batches complete, so memory stays bounded.
+- A batch that still fails after its retries is appended to a local spool file
+  (JSON lines of line protocol). 'replay_spool' re-sends it on the next run, as
+  well as the rest of a replay that was interrupted.
+- 'stats()' reports points written, points/sec, batches written/failed, retries
+  and spooled/replayed batches.
+
+Because the writer only needs an InfluxDB URL, it can be exercised against a local
+fake HTTP endpoint that answers POST /api/v2/write.
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing json for the spool file
+import json
+
+# Importing threading for the in-flight limit and the counters
+import threading
+
+# Importing time for throughput measurement
+import time
+
+# Importing the InfluxDB batching write options
+from influxdb_client.client.write_api import WriteOptions
+
+
+def format_stats(stats):
+    """One-line summary of 'InfluxWriter.stats()' for the loaders' output."""
+    return (
+        f"{stats['points_written']} points written "
+        f"({stats['points_per_second']:.0f} points/sec), "
+        f"{stats['batches_failed']} failed batches "
+        f"({stats['batches_spooled']} spooled for the next run), "
+        f"{stats['retries']} retries, {stats['batches_replayed']} batches replayed"
+    )
+
+
+def dataframe_to_lines(df, measurement, **kwargs):
+    """
+    Serialize a DataFrame to a list of line-protocol strings (one per row), with the
+    same keyword arguments as 'write_api.write'. Lets worker processes do the
+    serialization so 'write_lines' only has to send text.
+    """
+    from influxdb_client.client.write.dataframe_serializer import (
+        data_frame_to_list_of_points,
+    )
+    from influxdb_client.client.write_api import PointSettings
+
+    return data_frame_to_list_of_points(
+        df, PointSettings(), data_frame_measurement_name=measurement, **kwargs
+    )
+
+
+def _point_count(data):
+    """Number of line-protocol points in a batch payload."""
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return data.count("\n") + 1 if data else 0
+
+
+class InfluxWriter:
+    """
+    Batched, retrying InfluxDB writer with a spool file for failed batches.
+
+    Parameters:
+    - client: an 'InfluxDBClient'.
+    - bucket, org: default write target.
+    - batch_size, flush_interval, jitter_interval, retry_interval, max_retries,
+      max_retry_delay, exponential_base: forwarded to the client's 'WriteOptions'
+      (intervals in milliseconds).
+    - max_in_flight: maximum number of batches queued or being sent.
+    - spool_path: JSON-lines file receiving batches that failed all retries
+      (None disables spooling).
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket,
+        org,
+        batch_size=5000,
+        flush_interval=1000,
+        jitter_interval=0,
+        retry_interval=5000,
+        max_retries=5,
+        max_retry_delay=30000,
+        exponential_base=2,
+        max_in_flight=4,
+        spool_path=None,
+    ):
+        self.bucket = bucket
+        self.org = org
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.spool_path = spool_path
+
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()  # Writes may come from several threads
+        self._pending_points = 0
+        self._started = None
+        self._counters = {
+            "points_written": 0,
+            "batches_written": 0,
+            "batches_failed": 0,
+            "retries": 0,
+            "batches_spooled": 0,
+            "batches_replayed": 0,
+        }
+
+        self.write_api = client.write_api(
+            write_options=WriteOptions(
+                batch_size=batch_size,
+                flush_interval=flush_interval,
+                jitter_interval=jitter_interval,
+                retry_interval=retry_interval,
+                max_retries=max_retries,
+                max_retry_delay=max_retry_delay,
+                exponential_base=exponential_base,
+            ),
+            success_callback=self._on_success,
+            error_callback=self._on_error,
+            retry_callback=self._on_retry,
+        )
+
+    # --- Public API ---
+
+    def write_dataframe(self, df, measurement, **kwargs):
+        """
+        Queue a DataFrame for writing (extra keyword arguments such as
+        'data_frame_tag_columns' are passed to 'write_api.write'). Blocks only while
+        'max_in_flight' batches are still outstanding.
+        """
+        bucket = kwargs.pop("bucket", self.bucket)
+        org = kwargs.pop("org", self.org)
+        for start in range(0, len(df), self.batch_size):
+            chunk = df.iloc[start : start + self.batch_size]
+            self._reserve(len(chunk))
+            with self._write_lock:
+                self.write_api.write(
+                    bucket=bucket,
+                    org=org,
+                    record=chunk,
+                    data_frame_measurement_name=measurement,
+                    **kwargs,
+                )
+
+    def write_lines(self, data, bucket=None, org=None, precision=None):
+        """Queue line-protocol data: a string with one point per line, or a list of lines."""
+        lines = data.splitlines() if isinstance(data, str) else list(data)
+        options = {"write_precision": precision} if precision else {}
+        for start in range(0, len(lines), self.batch_size):
+            chunk = lines[start : start + self.batch_size]
+            self._reserve(len(chunk))
+            with self._write_lock:
+                self.write_api.write(
+                    bucket=bucket or self.bucket,
+                    org=org or self.org,
+                    record=chunk,  # One record per line, so batches count points
+                    **options,
+                )
+
+    def replay_spool(self):
+        """Re-send the batches spooled by earlier runs. Returns the number of batches."""
+        if not self.spool_path:
+            return 0
+
+        # Move the spool aside first: batches failing again are spooled anew. A replay
+        # copy left by a run that stopped mid-replay is sent again before the spool.
+        replay_path = f"{self.spool_path}.replay"
+        if os.path.isfile(self.spool_path):
+            if os.path.isfile(replay_path):
+                with open(replay_path, "a", encoding="utf-8") as replay, open(
+                    self.spool_path, encoding="utf-8"
+                ) as spool:
+                    replay.writelines(spool)
+                os.remove(self.spool_path)
+            else:
+                os.replace(self.spool_path, replay_path)
+        elif not os.path.isfile(replay_path):
+            return 0
+        replayed = 0
+        with open(replay_path, encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                batch = json.loads(line)
+                self.write_lines(
+                    batch["data"], batch["bucket"], batch["org"], batch.get("precision")
+                )
+                replayed += 1
+        os.remove(replay_path)
+
+        with self._condition:
+            self._counters["batches_replayed"] += replayed
+        return replayed
+
+    def flush(self):
+        """Wait until every batch queued so far was written or spooled."""
+        # The client sends partial batches on its own after 'flush_interval'
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending_points <= 0)
+
+    def close(self):
+        """Flush, stop the background writer and return the final stats."""
+        self.write_api.close()
+        return self.stats()
+
+    def stats(self):
+        """Snapshot of the writer counters, including points per second."""
+        with self._condition:
+            stats = dict(self._counters)
+            elapsed = time.perf_counter() - self._started if self._started else 0.0
+        stats["elapsed_seconds"] = elapsed
+        stats["points_per_second"] = stats["points_written"] / elapsed if elapsed else 0.0
+        return stats
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- Internal helpers ---
+
+    def _reserve(self, points):
+        limit = self.max_in_flight * self.batch_size
+        with self._condition:
+            if self._started is None:
+                self._started = time.perf_counter()
+            # Always admit at least one write so oversized chunks cannot deadlock
+            self._condition.wait_for(
+                lambda: self._pending_points <= 0 or self._pending_points + points <= limit
+            )
+            self._pending_points += points
+
+    def _release(self, points):
+        self._pending_points -= points
+        self._condition.notify_all()
+
+    def _on_success(self, conf, data):
+        points = _point_count(data)
+        with self._condition:
+            self._counters["points_written"] += points
+            self._counters["batches_written"] += 1
+            self._release(points)
+
+    def _on_error(self, conf, data, exception):
+        points = _point_count(data)
+        spooled = self._spool(conf, data)
+        with self._condition:
+            self._counters["batches_failed"] += 1
+            self._counters["batches_spooled"] += spooled
+            self._release(points)
+        reason = str(exception).splitlines()[0] if str(exception) else repr(exception)
+        print(f"InfluxDB batch of {points} points failed: {reason}")
+
+    def _on_retry(self, conf, data, exception):
+        with self._condition:
+            self._counters["retries"] += 1
+
+    def _spool(self, conf, data):
+        if not self.spool_path:
+            return 0
+        bucket, org, precision = conf
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        record = {"bucket": bucket, "org": org, "precision": str(precision), "data": data}
+        os.makedirs(os.path.dirname(os.path.abspath(self.spool_path)), exist_ok=True)
+        with self._condition, open(self.spool_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+        return 1
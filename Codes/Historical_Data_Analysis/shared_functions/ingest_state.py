@@ -0,0 +1,111 @@
+"""
+High-water marks for incremental (sync mode) InfluxDB ingestion.
+
+The batch loaders used to rewrite the full history of every ticker on each run. In
+sync mode they write only the rows newer than the last timestamp already written
+for a (measurement, Ticker) pair. That timestamp comes from either:
+
+- a local JSON state file ('HighWaterMarks'), updated after every successful write,
+- or the bucket itself ('query_high_water_mark'), when the state file is missing
+  or cannot be trusted.
+
+Rolling indicators (RSI, moving average) of the first new rows depend on earlier
+rows, so 'incremental_slice' also returns enough warm-up context for them to come
+out exactly as in a full run; only the new rows are then written.
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing json for the state file
+import json
+
+# Importing threading so concurrent writers can share one state file
+import threading
+
+# Importing Pandas for timestamps and DataFrame slicing
+import pandas as pd
+
+# Indicator windows, used for the default warm-up length
+from shared_functions.indicators import MOVING_AVERAGE_WINDOW, RSI_WINDOW
+
+# Rows needed before the first new row for the default 20-bar SMA and 14-bar RSI
+INDICATOR_WARMUP = max(MOVING_AVERAGE_WINDOW - 1, RSI_WINDOW)
+
+
+class HighWaterMarks:
+    """
+    Last written timestamp per (measurement, Ticker), persisted as JSON:
+
+        {"stock_price": {"AAPL": "2024-06-28T00:00:00", ...}, ...}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as file:
+                self.marks = json.load(file)
+        except (OSError, ValueError):
+            self.marks = {}
+
+    def get(self, measurement, ticker):
+        """Last written timestamp, or None if nothing was written yet."""
+        value = self.marks.get(measurement, {}).get(ticker)
+        return pd.Timestamp(value) if value is not None else None
+
+    def set(self, measurement, ticker, timestamp):
+        """Record a new high-water mark and save the state file."""
+        with self._lock:
+            self.marks.setdefault(measurement, {})[ticker] = pd.Timestamp(
+                timestamp
+            ).isoformat()
+            self.save()
+
+    def save(self):
+        # Write to a temporary file first so a crash never leaves a truncated state
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.marks, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def query_high_water_mark(client, bucket, org, measurement, ticker, field):
+    """
+    Latest '_time' stored in the bucket for a (measurement, Ticker) pair, read from
+    one of its fields (ticker=None for measurements without a Ticker tag). Returns
+    None when the bucket holds no points for it.
+    """
+    ticker_filter = f' and r.Ticker == "{ticker}"' if ticker is not None else ""
+    flux = f"""
+from(bucket: "{bucket}")
+  |> range(start: 0)
+  |> filter(fn: (r) => r._measurement == "{measurement}"{ticker_filter})
+  |> filter(fn: (r) => r._field == "{field}")
+  |> last()
+"""
+    tables = client.query_api().query(flux, org=org)
+    times = [record.get_time() for table in tables for record in table.records]
+    if not times:
+        return None
+    # Points are written with tz-naive UTC timestamps; compare in the same form
+    return pd.Timestamp(max(times)).tz_convert("UTC").tz_localize(None)
+
+
+def incremental_slice(df, since, warmup=INDICATOR_WARMUP):
+    """
+    Split a time-indexed DataFrame for an incremental write.
+
+    Returns (context, n_new): 'context' holds the rows newer than 'since' preceded
+    by up to 'warmup' older rows, and the last 'n_new' rows of it are the new ones.
+    With since=None every row is new and 'df' itself is returned; otherwise
+    'context' is a (small) copy, so indicator columns can be added to it.
+    """
+    if since is None:
+        return df, len(df)
+    first_new = int(df.index.searchsorted(pd.Timestamp(since), side="right"))
+    n_new = len(df) - first_new
+    if n_new == 0:
+        return df.iloc[:0].copy(), 0
+    return df.iloc[max(0, first_new - warmup) :].copy(), n_new
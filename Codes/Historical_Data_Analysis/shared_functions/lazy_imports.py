@@ -0,0 +1,167 @@
+"""
+Lazy imports of the feature function modules, with import-time reports.
+
+The Streamlit apps used to import all feature function modules up front, and with
+them torch, scikit-learn, yfinance, TextBlob, Plotly and Matplotlib, before the
+sidebar was drawn, although most visits only open the description pages. The
+generated 'Import_Functions_*.py' files now bind every page function to
+'lazy_function' instead: the page's module, and whatever it imports, is only
+imported the first time the page is shown.
+
+Every such import goes through 'timed_import', which records how long each module
+imported on the way took, like 'python -X importtime': self and cumulative time
+per module, in the order the imports finished. 'import_reports' returns these
+records and 'format_import_times' renders one in the '-X importtime' layout.
+"""
+
+# Importing importlib to import modules by name
+import importlib
+
+# Importing importlib.abc for the timing finder and loader
+import importlib.abc
+
+# Importing sys to install the timing finder
+import sys
+
+# Importing threading so only the importing thread is timed
+import threading
+
+# Importing time to measure import durations
+import time
+
+# One timed import at a time, so nested timers never overlap
+_import_lock = threading.RLock()
+
+# Reports of the timed imports, oldest first
+_reports = []
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Loader wrapper reporting the start and end of a module's execution."""
+
+    def __init__(self, loader, timer):
+        self.loader = loader
+        self.timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        self.timer.enter(spec.name)
+        try:
+            return self.loader.create_module(spec)
+        except BaseException:
+            self.timer.leave()
+            raise
+
+    def exec_module(self, module):
+        # The module only ever sees its real loader
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.timer.leave()
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder timing the modules imported by one thread. It finds nothing
+    itself: it asks the other finders and wraps the loader of the spec they return.
+    """
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.stack = []  # [name, start, seconds spent in nested imports]
+        self.modules = []  # (name, depth, self seconds, cumulative seconds)
+
+    def find_spec(self, name, path, target=None):
+        if threading.get_ident() != self.thread:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self)
+            return spec
+        return None
+
+    def enter(self, name):
+        self.stack.append([name, time.perf_counter(), 0.0])
+
+    def leave(self):
+        name, start, nested = self.stack.pop()
+        cumulative = time.perf_counter() - start
+        if self.stack:
+            self.stack[-1][2] += cumulative
+        self.modules.append((name, len(self.stack), cumulative - nested, cumulative))
+
+
+def timed_import(module_name):
+    """
+    Import a module by name and, if it was not imported yet, record an import
+    report for it: total seconds and the time spent in every module it pulled in.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    with _import_lock:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            return module
+
+        timer = _ImportTimer()
+        sys.meta_path.insert(0, timer)
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(module_name)
+        finally:
+            sys.meta_path.remove(timer)
+        seconds = time.perf_counter() - start
+
+        _reports.append({"module": module_name, "seconds": seconds, "modules": timer.modules})
+        print(f"Imported {module_name} in {seconds:.2f}s ({len(timer.modules)} modules)")
+    return module
+
+
+def lazy_function(module_name, function_name):
+    """
+    Stand-in for 'from module_name import function_name' that imports the module
+    on the first call and then forwards every call to the real function.
+    """
+
+    def call(*args, **kwargs):
+        return getattr(timed_import(module_name), function_name)(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = function_name
+    call.__module__ = module_name
+    return call
+
+
+def import_reports():
+    """Reports of the timed imports so far, oldest first."""
+    with _import_lock:
+        return list(_reports)
+
+
+def format_import_times(report, top=None):
+    """
+    Text of a report in the 'python -X importtime' layout (microseconds, nested
+    imports indented). With 'top', only the modules with the largest cumulative
+    times are listed, in import order.
+    """
+    modules = report["modules"]
+    if top is not None:
+        slowest = sorted(modules, key=lambda entry: entry[3], reverse=True)[:top]
+        modules = [entry for entry in modules if entry in slowest]
+    lines = ["import time: self [us] | cumulative | imported package"]
+    for name, depth, self_seconds, cumulative in modules:
+        lines.append(
+            f"import time: {self_seconds * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,244 @@
+"""
+Vectorized InfluxDB line protocol and gzipped line-protocol export files.
+
+The InfluxDB client serializes a DataFrame one row at a time (one f-string and one
+Python string per point). For offline exports, 'iter_line_protocol' builds the lines
+column by column instead, one chunk of rows at a time: every piece of a line (key,
+value, separator) is a fixed-width byte matrix, the matrices are stacked side by side
+and their NUL padding is dropped, so a chunk becomes a single bytes buffer without
+any per-row Python object. The output follows the client's formatting: tags and
+fields sorted by key, NaN fields omitted (rows without any field dropped), integers
+suffixed with 'i', floats in shortest round-trip form and nanosecond timestamps
+(tz-naive indexes are UTC).
+
+'export_frame' streams those chunks into a gzip file that 'influx write' imports
+directly, e.g.
+
+    influx write --bucket stock_price --file export/stock_price/AAPL.lp.gz
+
+Exports are sharded as '<directory>/<measurement>/<item>.lp.gz' ('shard_path'), so
+shards can be imported, retried or compared one at a time. Memory use is bounded by
+'chunk_size' rows of text, whatever the size of the export.
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing gzip for the compressed export files
+import gzip
+
+# Importing NumPy for the vectorized string building
+import numpy as np
+
+# Importing Pandas for the timestamp conversion
+import pandas as pd
+
+# Rows formatted per chunk
+DEFAULT_CHUNK_SIZE = 100_000
+
+# File name suffix of the export shards
+EXPORT_SUFFIX = ".lp.gz"
+
+# Characters escaped in measurements, in tag keys/values and field keys, and in string field values
+_MEASUREMENT_SPECIAL = (",", " ")
+_KEY_SPECIAL = (",", "=", " ")
+_STRING_SPECIAL = ("\\", '"')
+
+# Powers of ten for the digit formatting, and the most decimals tried for exact fixed-point floats
+_POWERS_OF_TEN = 10 ** np.arange(20, dtype=np.uint64)
+_MAX_FIXED_DECIMALS = 9
+
+
+def _escape(text, specials):
+    """Backslash-escape the characters of 'specials' in a string."""
+    for char in specials:
+        text = text.replace(char, "\\" + char)
+    return text
+
+
+def _encoded(values, specials, quote=""):
+    """
+    Escaped, UTF-8 encoded bytes array of a string-like column. Only the distinct
+    values are formatted in Python (tags such as 'Ticker' have very few).
+    """
+    codes, uniques = pd.factorize(values)
+    formatted = [
+        f"{quote}{_escape(str(value), specials)}{quote}".encode("utf-8") for value in uniques
+    ]
+    return np.array(formatted + [b""], dtype=np.bytes_)[codes]  # Code -1 (missing) -> b""
+
+
+def _tag_text(values):
+    """(bytes, present) of a tag column; missing and empty values are omitted."""
+    text = _encoded(values, _KEY_SPECIAL)
+    return text, text != b""
+
+
+def _block(text, present=None):
+    """
+    Byte matrix (rows x width) of a bytes array or a constant, NUL padded. Rows
+    where 'present' is False are all NUL, which drops them from the output.
+    """
+    if isinstance(text, bytes):
+        matrix = np.frombuffer(text, dtype=np.uint8)[np.newaxis, :]
+    elif text.dtype == np.uint8:
+        matrix = text
+    else:
+        text = np.ascontiguousarray(text)
+        matrix = text.view(np.uint8).reshape(len(text), text.dtype.itemsize)
+    return matrix if present is None else matrix * present[:, np.newaxis]
+
+
+def _digits(values, width):
+    """ASCII digit matrix (rows x width) of non-negative integers, most significant first."""
+    divisors = _POWERS_OF_TEN[width - 1 :: -1]
+    return ((values[:, np.newaxis] // divisors) % 10).astype(np.uint8) + ord("0")
+
+
+def _number_block(negative, magnitude, decimals=0):
+    """
+    Byte matrix of '[-]integer[.fraction]' for 'magnitude / 10**decimals'. Leading
+    zeros and trailing fraction zeros (but the first) are NUL, i.e. dropped.
+    """
+    scale = _POWERS_OF_TEN[decimals]
+    integer = magnitude // scale
+    width = len(str(int(integer.max()))) if len(integer) else 1
+    int_digits = _digits(integer, width)
+    leading = integer[:, np.newaxis] < _POWERS_OF_TEN[width - 1 :: -1]
+    leading[:, -1] = False
+    int_digits[leading] = 0
+
+    blocks = [np.where(negative, ord("-"), 0).astype(np.uint8)[:, np.newaxis], int_digits]
+    if decimals:
+        fraction = _digits(magnitude % scale, decimals)
+        zeros = fraction == ord("0")
+        trailing = np.flip(np.logical_and.accumulate(np.flip(zeros, axis=1), axis=1), axis=1)
+        trailing[:, 0] = False
+        fraction[trailing] = 0
+        blocks += [np.full((len(magnitude), 1), ord("."), dtype=np.uint8), fraction]
+    return np.hstack(blocks)
+
+
+def _fixed_point(values, present):
+    """
+    (decimals, scaled) when every present value is exactly 'scaled / 10**decimals'
+    with few enough digits for that decimal to be its shortest round-trip form
+    (what repr() prints), otherwise None.
+    """
+    finite = values[present]
+    magnitude = np.abs(finite)
+    if len(finite) == 0 or (magnitude[magnitude != 0] < 1e-4).any():
+        return None  # repr() switches to exponent notation below 1e-4
+    values = np.where(present, values, 0.0)
+    for decimals in range(1, _MAX_FIXED_DECIMALS + 1):
+        scaled = np.rint(values * 10.0**decimals)
+        # Beyond 2**52 two decimals could name the same float
+        if np.abs(scaled).max() >= 2.0**52:
+            return None
+        if (scaled[present] / 10.0**decimals == finite).all():
+            return decimals, scaled
+    return None
+
+
+def _field_block(values):
+    """(byte matrix, present) of a field column, formatted like the InfluxDB client."""
+    kind = values.dtype.kind
+    everywhere = np.ones(len(values), dtype=bool)
+    if kind in "iu":
+        magnitude = np.abs(values).astype(np.uint64)  # Also right for the int64 minimum
+        return np.hstack([_number_block(values < 0, magnitude), _block(b"i")[[0] * len(values)]]), everywhere
+    if kind == "b":
+        return _block(np.where(values, b"True", b"False")), everywhere
+    if kind == "f":
+        values = values.astype(np.float64)
+        present = ~np.isnan(values)
+        fixed = _fixed_point(values, present)
+        if fixed is None:
+            return _block(values.astype(np.bytes_)), present
+        decimals, scaled = fixed
+        return _number_block(np.signbit(values), np.abs(scaled).astype(np.uint64), decimals), present
+    return _block(_encoded(values, _STRING_SPECIAL, quote='"')), ~pd.isna(values)
+
+
+def _piece(key, matrix, present):
+    """Blocks of one ',key=value' piece."""
+    return [_block(f",{_escape(str(key), _KEY_SPECIAL)}=".encode("utf-8"), present), _block(matrix, present)]
+
+
+def _chunk_bytes(df, start, stop, prefix, tag_keys, field_keys, timestamps):
+    """Line protocol of rows [start, stop) as (bytes, n_points)."""
+    n = stop - start
+    blocks = [_block(prefix)]
+
+    # Tags: ',key=value' after the measurement
+    for key in tag_keys:
+        text, present = _tag_text(df[key].to_numpy()[start:stop])
+        blocks += _piece(key, _block(text), present)
+
+    # Fields: ',key=value' pieces; the comma of each row's first field becomes the separating space
+    comma_columns = []
+    presence = []
+    for key in field_keys:
+        matrix, present = _field_block(df[key].to_numpy()[start:stop])
+        comma_columns.append(sum(block.shape[1] for block in blocks))
+        presence.append(present)
+        blocks += _piece(key, matrix, present)
+
+    times = timestamps[start:stop]
+    blocks += [_block(b" "), _number_block(times < 0, np.abs(times).astype(np.uint64)), _block(b"\n")]
+    matrix = np.hstack([np.broadcast_to(block, (n, block.shape[1])) for block in blocks])
+
+    # Rows without any field are dropped
+    presence = np.column_stack(presence)
+    keep = presence.any(axis=1)
+    matrix[np.arange(n), np.asarray(comma_columns)[presence.argmax(axis=1)]] = ord(" ")
+    matrix = matrix[keep]
+
+    # NUL padding never occurs in line protocol: dropping it joins the pieces
+    flat = matrix.ravel()
+    return flat[flat != 0].tobytes(), int(keep.sum())
+
+
+def iter_line_protocol(df, measurement, tag_columns=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (bytes, n_points) chunks of newline-terminated line protocol for a
+    time-indexed DataFrame. Columns in 'tag_columns' are tags (missing ones are
+    ignored), every other column is a field.
+    """
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC")
+    timestamps = index.asi8
+
+    tag_columns = [column for column in tag_columns if column in df.columns]
+    tag_keys = sorted(tag_columns, key=str)
+    field_keys = sorted((column for column in df.columns if column not in tag_columns), key=str)
+    if not field_keys:
+        return
+    prefix = _escape(str(measurement), _MEASUREMENT_SPECIAL).encode("utf-8")
+
+    for start in range(0, len(df), chunk_size):
+        stop = min(start + chunk_size, len(df))
+        yield _chunk_bytes(df, start, stop, prefix, tag_keys, field_keys, timestamps)
+
+
+def shard_path(directory, measurement, item):
+    """Export file of one measurement and item (ticker) under 'directory'."""
+    return os.path.join(directory, str(measurement), f"{item}{EXPORT_SUFFIX}")
+
+
+def export_frame(path, df, measurement, tag_columns=(), chunk_size=DEFAULT_CHUNK_SIZE, compresslevel=6):
+    """
+    Write a DataFrame as gzipped line protocol to 'path' and return the number of
+    points. The file is written under a temporary name and renamed when complete,
+    so an interrupted export never leaves a truncated shard.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    points = 0
+    with gzip.open(tmp_path, "wb", compresslevel=compresslevel) as file:
+        for chunk, n_points in iter_line_protocol(df, measurement, tag_columns, chunk_size):
+            file.write(chunk)
+            points += n_points
+    os.replace(tmp_path, path)
+    return points
@@ -0,0 +1,388 @@
+"""
+Local OHLCV cache in front of the market-data provider (Yahoo Finance by default).
+
+The real-time pages, the StockTeller analyzer and the Reddit bot used to download
+the whole window from yfinance on every request. 'MarketDataCache' keeps the bars
+in a local SQLite database keyed by (ticker, interval, timestamp):
+
+- Repeated requests are served from disk.
+- Only bars from the last cached timestamp onwards are requested again (the last
+  bar is re-fetched because it may still be forming); earlier history is only
+  fetched when a request reaches further back than the cache does.
+- Once the cache reaches the present, it is refreshed at most once per 'ttl'
+  seconds during market hours, and once after each session close otherwise.
+- If the provider fails, the cached bars are served instead of raising (when the
+  cache has any). A provider returning no bars for a window that spans a weekday
+  counts as a failure (yfinance returns an empty frame on an outage or a bad
+  symbol): the recorded coverage is left as it was, so the window is fetched again
+  on the next request instead of "no bars" being served as fresh.
+
+Providers are pluggable: anything with a 'fetch(ticker, interval, start, end)'
+method returning an OHLCV DataFrame works. 'YFinanceProvider' talks to Yahoo
+Finance and 'FrameProvider' serves in-memory DataFrames, so the cache can be
+exercised with a local fake feed and no network.
+
+The shared default cache lives in 'Market_Data_Cache/ohlcv.sqlite' (override with
+the MARKET_DATA_CACHE environment variable; MARKET_DATA_TTL sets the TTL in seconds).
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing SQLite for the on-disk cache (part of the standard library)
+import sqlite3
+
+# Importing time for fetch timestamps
+import time
+
+# Closing context for short-lived database connections
+from contextlib import closing
+
+# Importing datetime for request windows and market hours
+from datetime import datetime, time as dt_time, timedelta
+
+# Importing NumPy for numerical computations and array operations
+import numpy as np
+
+# Importing Pandas for data manipulation and analysis
+import pandas as pd
+
+# OHLCV columns stored for every bar
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Base directory ('Historical_Data_Analysis') and default cache file
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.environ.get(
+    "MARKET_DATA_CACHE", os.path.join(BASE_DIR, "Market_Data_Cache", "ohlcv.sqlite")
+)
+DEFAULT_TTL = int(os.environ.get("MARKET_DATA_TTL", 300))
+
+# Regular trading session used for the TTL (US exchanges, exchange local time)
+MARKET_TIMEZONE = "America/New_York"
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+
+
+def _normalize_frame(df):
+    """OHLCV DataFrame with flat column names and a tz-naive DatetimeIndex."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+    if isinstance(df.columns, pd.MultiIndex):
+        # yf.download returns (field, ticker) columns even for one ticker
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        # Keep the exchange's local wall time so daily bars keep their dates
+        index = index.tz_localize(None)
+    out = pd.DataFrame(
+        {column: pd.to_numeric(df[column]).to_numpy(np.float64) for column in COLUMNS},
+        index=index.rename("Date"),
+    )
+    return out[~out.index.duplicated(keep="last")].sort_index()
+
+
+def expects_bars(start, end):
+    """True when [start, end) (end=None: up to now) contains a weekday session day."""
+    if start is None:
+        return True
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now()
+    last_day = (end - pd.Timedelta(1)).normalize()
+    return len(pd.bdate_range(pd.Timestamp(start).normalize(), last_day)) > 0
+
+
+# --- Providers ---
+
+
+class YFinanceProvider:
+    """Bars from Yahoo Finance ('yf.download')."""
+
+    def fetch(self, ticker, interval, start, end):
+        import yfinance as yf
+
+        df = yf.download(
+            ticker, start=start, end=end, interval=interval, progress=False
+        )
+        # yf.download does not raise on an outage or a bad symbol
+        if (df is None or df.empty) and expects_bars(start, end):
+            raise ValueError(f"Yahoo Finance returned no {interval} bars for {ticker}")
+        return _normalize_frame(df)
+
+
+class FrameProvider:
+    """
+    Bars served from in-memory DataFrames ({ticker: DataFrame}), e.g. a fake feed.
+    Every call is recorded in 'calls' as (ticker, interval, start, end).
+    """
+
+    def __init__(self, frames):
+        self.frames = {ticker: _normalize_frame(df) for ticker, df in frames.items()}
+        self.calls = []
+
+    def fetch(self, ticker, interval, start, end):
+        self.calls.append((ticker, interval, start, end))
+        df = self.frames.get(ticker)
+        if df is None:
+            return _normalize_frame(None)
+        mask = np.ones(len(df), dtype=bool)
+        if start is not None:
+            mask &= df.index >= pd.Timestamp(start)
+        if end is not None:
+            mask &= df.index < pd.Timestamp(end)
+        return df[mask]
+
+
+# --- Cache ---
+
+
+def _to_ns(value):
+    return pd.Timestamp(value).value
+
+
+def _local_ns(epoch_seconds):
+    """Local wall time of a Unix timestamp, in the same naive ns as the bar index."""
+    return pd.Timestamp.fromtimestamp(epoch_seconds).value
+
+
+def _market_now():
+    return pd.Timestamp.now(tz=MARKET_TIMEZONE)
+
+
+def _last_session_close(now):
+    """Most recent regular-session close at or before 'now' (weekends skipped)."""
+    day = now.normalize()
+    close = day + pd.Timedelta(hours=MARKET_CLOSE.hour, minutes=MARKET_CLOSE.minute)
+    if now < close or day.weekday() >= 5:
+        close -= pd.Timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= pd.Timedelta(days=1)
+    return close
+
+
+def is_market_open(now=None):
+    """True during the regular weekday session."""
+    now = now or _market_now()
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+class MarketDataCache:
+    """
+    SQLite-backed OHLCV cache with incremental top-up.
+
+    Parameters:
+    - path: SQLite database file.
+    - provider: object with 'fetch(ticker, interval, start, end)' (default yfinance).
+    - ttl: seconds a cached window stays fresh during market hours.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, provider=None, ttl=DEFAULT_TTL):
+        self.path = path
+        self.provider = provider or YFinanceProvider()
+        self.ttl = ttl
+        self.stats = {"hits": 0, "fetches": 0, "fetched_bars": 0, "errors": 0}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS bars ("
+                "ticker TEXT, interval TEXT, ts INTEGER, "
+                "open REAL, high REAL, low REAL, close REAL, volume REAL, "
+                "PRIMARY KEY (ticker, interval, ts))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS coverage ("
+                "ticker TEXT, interval TEXT, covered_from INTEGER, covered_to INTEGER, "
+                "fetched_at REAL, PRIMARY KEY (ticker, interval))"
+            )
+
+    def _connect(self):
+        # Several processes (portfolio mode) may share the file
+        return sqlite3.connect(self.path, timeout=30)
+
+    # --- Public API ---
+
+    def get_bars(self, ticker, start, end=None, interval="1d"):
+        """
+        OHLCV bars for 'ticker' with start <= Date < end (end=None: up to now),
+        as a DataFrame indexed by 'Date' with the columns Open/High/Low/Close/Volume.
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end) if end is not None else None
+        coverage = self._coverage(ticker, interval)
+
+        try:
+            if coverage is None:
+                self._fetch(ticker, interval, start, end, covered_from=start)
+            else:
+                covered_from, covered_to, fetched_at, last_ts = coverage
+                fetched = False
+                if _to_ns(start) < covered_from:
+                    # Back-fill history older than anything cached so far
+                    self._fetch(
+                        ticker, interval, start, pd.Timestamp(covered_from),
+                        covered_from=start, fetched_at=fetched_at,
+                    )
+                    fetched = True
+
+                requested_to = _to_ns(end) if end is not None else _local_ns(time.time())
+                if requested_to > covered_to:
+                    # A window that reached the present is governed by the TTL;
+                    # a gap after an older window is always fetched
+                    reached_present = covered_to >= _local_ns(fetched_at)
+                    if not reached_present or self._is_stale(fetched_at):
+                        # Top up from the last cached bar, which may still be forming
+                        top_up_from = (
+                            pd.Timestamp(last_ts)
+                            if last_ts is not None
+                            else pd.Timestamp(covered_to)
+                        )
+                        self._fetch(ticker, interval, max(top_up_from, start), end)
+                        fetched = True
+                if not fetched:
+                    self.stats["hits"] += 1
+        except Exception:
+            self.stats["errors"] += 1
+            if coverage is None:
+                raise
+
+        return self._read(ticker, interval, start, end)
+
+    def latest_close(self, ticker, interval="1d", lookback_days=7):
+        """Most recent close price, or None when no bars are available."""
+        start = datetime.now() - timedelta(days=lookback_days)
+        bars = self.get_bars(ticker, start, interval=interval)
+        return float(bars["Close"].iloc[-1]) if len(bars) else None
+
+    def clear(self, ticker=None):
+        """Drop the cached bars of one ticker, or of every ticker."""
+        where, params = ("WHERE ticker = ?", (ticker,)) if ticker else ("", ())
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"DELETE FROM bars {where}", params)
+            conn.execute(f"DELETE FROM coverage {where}", params)
+
+    # --- Internal helpers ---
+
+    def _coverage(self, ticker, interval):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT covered_from, covered_to, fetched_at FROM coverage "
+                "WHERE ticker = ? AND interval = ?",
+                (ticker, interval),
+            ).fetchone()
+            if row is None:
+                return None
+            (last_ts,) = conn.execute(
+                "SELECT MAX(ts) FROM bars WHERE ticker = ? AND interval = ?",
+                (ticker, interval),
+            ).fetchone()
+        return (*row, last_ts)
+
+    def _is_stale(self, fetched_at):
+        now = _market_now()
+        age = time.time() - fetched_at
+        if is_market_open(now):
+            return age > self.ttl
+        # Closed market: refresh once after each session close
+        return fetched_at < _last_session_close(now).timestamp()
+
+    def _fetch(self, ticker, interval, start, end, covered_from=None, fetched_at=None):
+        """
+        Fetch [start, end) and widen the recorded coverage. A back-fill passes the
+        previous 'fetched_at' so it does not count as a refresh of recent bars.
+        """
+        now = time.time()
+        bars = _normalize_frame(self.provider.fetch(ticker, interval, start, end))
+        self.stats["fetches"] += 1
+        if bars.empty and expects_bars(start, end):
+            # Keep the coverage and fetch time so the window is requested again
+            raise ValueError(f"No {interval} bars returned for {ticker} from {start}")
+        self.stats["fetched_bars"] += len(bars)
+
+        rows = zip(
+            [ticker] * len(bars),
+            [interval] * len(bars),
+            bars.index.asi8.tolist(),
+            *(bars[column].tolist() for column in COLUMNS),
+        )
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            previous = conn.execute(
+                "SELECT covered_from, covered_to FROM coverage "
+                "WHERE ticker = ? AND interval = ?",
+                (ticker, interval),
+            ).fetchone()
+
+            # Coverage never extends past the moment of the fetch
+            new_from = _to_ns(covered_from) if covered_from is not None else None
+            new_to = _local_ns(now) if end is None else min(_to_ns(end), _local_ns(now))
+            if previous is not None:
+                new_from = min(x for x in (previous[0], new_from) if x is not None)
+                new_to = max(previous[1], new_to)
+            conn.execute(
+                "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?)",
+                (
+                    ticker,
+                    interval,
+                    new_from,
+                    new_to,
+                    now if fetched_at is None else fetched_at,
+                ),
+            )
+
+    def _read(self, ticker, interval, start, end):
+        query = (
+            "SELECT ts, open, high, low, close, volume FROM bars "
+            "WHERE ticker = ? AND interval = ? AND ts >= ?"
+        )
+        params = [ticker, interval, _to_ns(start)]
+        if end is not None:
+            query += " AND ts < ?"
+            params.append(_to_ns(end))
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + " ORDER BY ts", params).fetchall()
+
+        data = np.array(rows, dtype=np.float64).reshape(-1, len(COLUMNS) + 1)
+        index = pd.DatetimeIndex(
+            np.array([row[0] for row in rows], dtype="datetime64[ns]"), name="Date"
+        )
+        return pd.DataFrame(data[:, 1:], index=index, columns=COLUMNS)
+
+
+def _period_to_timedelta(period):
+    """Convert a yfinance-style period ("60d", "1wk", "6mo", "1y") to a timedelta."""
+    units = {"d": 1, "wk": 7, "mo": 31, "y": 366}
+    for unit, days in units.items():
+        if period.endswith(unit) and period[: -len(unit)].isdigit():
+            return timedelta(days=int(period[: -len(unit)]) * days)
+    raise ValueError(f"Unsupported period: {period!r}")
+
+
+# Shared cache, created on first use
+_default_cache = None
+
+
+def default_cache():
+    """The shared MarketDataCache (Yahoo Finance provider, default path and TTL)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = MarketDataCache()
+    return _default_cache
+
+
+def download(ticker, start=None, end=None, period=None, interval="1d", cache=None):
+    """
+    Cached replacement for 'yf.download(ticker, start=..., end=...)' or
+    'yf.download(ticker, period=...)' for a single ticker.
+    """
+    cache = cache or default_cache()
+    if start is None:
+        start = datetime.now() - _period_to_timedelta(period or "1mo")
+    return cache.get_bars(ticker, start, end, interval=interval)
+
+
+def latest_close(ticker, cache=None):
+    """Cached replacement for 'yf.Ticker(ticker).history(period="1d")["Close"].iloc[-1]'."""
+    return (cache or default_cache()).latest_close(ticker)
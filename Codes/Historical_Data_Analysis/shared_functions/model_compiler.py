@@ -0,0 +1,217 @@
+"""
+Compilation of the linear ensemble models into single linear models for inference.
+
+Each '<TICKER>_Ensemble_Model.pkl' is a 'VotingRegressor' averaging LinearRegression,
+Ridge, Lasso and ElasticNet fitted on open/high/low/volume. An average of linear
+models is itself a linear model, yet every 'predict' went through four estimators
+and scikit-learn's input validation. 'compile_model' folds such an ensemble into one
+'FusedLinearModel' holding a weight vector and an intercept:
+
+    prediction = X @ coef + intercept,   coef = sum(w_i * coef_i) / sum(w_i)
+
+(and the intercept likewise), which is what 'VotingRegressor.predict' computes, up
+to floating-point rounding. A model with any member that is not a linear regressor
+is returned unchanged, so callers can compile whatever model file they load.
+
+'LinearModelStack' stacks the fused models of several tickers into one coefficient
+matrix, so the rows of many tickers are scored in a single product.
+
+The compiled models are served by 'model_registry.compiled_registry'
+('get_compiled_model'). Models are recognized by class name, so this module does not
+import scikit-learn itself.
+"""
+
+# Importing NumPy for the fused coefficients and the scoring products
+import numpy as np
+
+# Scikit-learn regressors (in 'sklearn.linear_model') whose prediction is
+# X @ coef_ + intercept_
+LINEAR_REGRESSORS = frozenset(
+    {
+        "ARDRegression",
+        "BayesianRidge",
+        "ElasticNet",
+        "ElasticNetCV",
+        "HuberRegressor",
+        "Lars",
+        "LarsCV",
+        "Lasso",
+        "LassoCV",
+        "LassoLars",
+        "LassoLarsCV",
+        "LassoLarsIC",
+        "LinearRegression",
+        "OrthogonalMatchingPursuit",
+        "Ridge",
+        "RidgeCV",
+        "SGDRegressor",
+    }
+)
+
+
+def _is_class(model, module, names):
+    cls = type(model)
+    return cls.__module__.startswith(module) and cls.__name__ in names
+
+
+def _linear_terms(estimator):
+    """(coef, intercept) of a fitted single-target linear regressor, or None."""
+    if not _is_class(estimator, "sklearn.linear_model", LINEAR_REGRESSORS):
+        return None
+    coef = np.asarray(estimator.coef_, dtype=np.float64)
+    intercept = np.asarray(estimator.intercept_, dtype=np.float64).reshape(-1)
+    if coef.ndim == 2 and coef.shape[0] == 1:
+        coef = coef[0]
+    if coef.ndim != 1 or intercept.size != 1:
+        return None  # Multi-target models are not fused
+    return coef, float(intercept[0])
+
+
+def _voting_terms(model):
+    """(coef, intercept) of a VotingRegressor whose members are all linear, or None."""
+    members = [_linear_terms(estimator) for estimator in model.estimators_]
+    if not members or any(member is None for member in members):
+        return None
+    coefs = [coef for coef, _ in members]
+    if len({len(coef) for coef in coefs}) != 1:
+        return None
+
+    # Same weights as 'VotingRegressor.predict': dropped members have no weight
+    if model.weights is None:
+        weights = np.ones(len(members))
+    else:
+        weights = np.array(
+            [
+                weight
+                for (_, estimator), weight in zip(model.estimators, model.weights)
+                if estimator != "drop"
+            ],
+            dtype=np.float64,
+        )
+    weights = weights / weights.sum()
+    intercepts = [intercept for _, intercept in members]
+    return weights @ np.vstack(coefs), float(weights @ intercepts)
+
+
+class FusedLinearModel:
+    """
+    Linear model 'X @ coef + intercept' compiled from a scikit-learn model.
+
+    'predict' accepts a 2-D array, or a DataFrame whose columns are then selected by
+    the names the original model was fitted on ('feature_names_in_').
+    """
+
+    def __init__(self, coef, intercept, feature_names=None, source=None):
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.feature_names_in_ = (
+            None if feature_names is None else np.asarray(feature_names, dtype=object)
+        )
+        self.n_features_in_ = len(self.coef)
+        self.source = source  # Class name of the compiled model
+
+    def predict(self, X):
+        """Predictions for the rows of X, as a 1-D float64 array."""
+        return (
+            _features(X, self.n_features_in_, self.feature_names_in_) @ self.coef
+            + self.intercept
+        )
+
+    def __repr__(self):
+        return (
+            f"FusedLinearModel(source={self.source}, n_features={self.n_features_in_})"
+        )
+
+
+def _features(X, n_features, feature_names=None, check_finite=True):
+    """X as a validated 2-D float64 array with 'n_features' columns."""
+    if feature_names is not None and hasattr(X, "columns"):
+        X = X[list(feature_names)]
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim != 2 or X.shape[1] != n_features:
+        raise ValueError(
+            f"X has shape {X.shape}, but {n_features} features per row are expected."
+        )
+    # Same refusal of missing values as scikit-learn's predict
+    if check_finite and not np.isfinite(X).all():
+        raise ValueError("Input X contains NaN or infinity.")
+    return X
+
+
+def fuse_linear(model):
+    """
+    FusedLinearModel equivalent to a linear regressor or to a VotingRegressor of
+    linear regressors, or None for any other model.
+    """
+    if _is_class(model, "sklearn.ensemble", {"VotingRegressor"}):
+        terms = _voting_terms(model)
+    else:
+        terms = _linear_terms(model)
+    if terms is None:
+        return None
+    coef, intercept = terms
+    return FusedLinearModel(
+        coef, intercept, getattr(model, "feature_names_in_", None), type(model).__name__
+    )
+
+
+def compile_model(model):
+    """The fused linear model of 'model' when it has one, else 'model' itself."""
+    fused = fuse_linear(model)
+    return model if fused is None else fused
+
+
+class LinearModelStack:
+    """
+    Fused linear models of several keys (tickers) stacked into one coefficient
+    matrix (keys x features) and one intercept vector.
+    """
+
+    def __init__(self, models):
+        self.keys = list(models)
+        self.index = {key: position for position, key in enumerate(self.keys)}
+        widths = {models[key].n_features_in_ for key in self.keys}
+        if len(widths) > 1:
+            raise ValueError(
+                "Stacked models must have the same number of features, "
+                f"got {sorted(widths)}."
+            )
+        self.n_features_in_ = widths.pop() if widths else 0
+        self.coef = (
+            np.vstack([models[key].coef for key in self.keys])
+            if self.keys
+            else np.empty((0, 0))
+        )
+        self.intercept = np.array(
+            [models[key].intercept for key in self.keys], dtype=np.float64
+        )
+
+    def predict(self, positions, X):
+        """
+        Predictions for the rows of X, row i scored by the model at 'positions[i]'
+        (an index into 'keys'): one product for the rows of every model. Rows are
+        not checked for missing values; they give NaN.
+        """
+        X = _features(X, self.n_features_in_, check_finite=False)
+        positions = np.asarray(positions, dtype=np.intp)
+        return (
+            np.einsum("ij,ij->i", X, self.coef[positions]) + self.intercept[positions]
+        )
+
+    def predict_all(self, X):
+        """Predictions of every model for every row of X (rows x keys), one matmul."""
+        return _features(X, self.n_features_in_) @ self.coef.T + self.intercept
+
+
+def stack_models(models):
+    """
+    Split {key: model} into a LinearModelStack of the fused linear models and a
+    dictionary of the other models, which must be called one by one.
+    """
+    fused = {
+        key: model
+        for key, model in models.items()
+        if isinstance(model, FusedLinearModel)
+    }
+    others = {key: model for key, model in models.items() if key not in fused}
+    return LinearModelStack(fused), others
@@ -0,0 +1,300 @@
+"""
+Process-wide registry for pickled/joblib models.
+
+Both front-ends (the Streamlit feature functions and the Flask app) fetch models
+through this registry instead of calling 'pickle.load' themselves:
+
+- A model is loaded lazily the first time its path is requested.
+- Every entry remembers the file's (mtime, size) and SHA-256 digest. When the file
+  changes on disk the digest is recomputed and the model is reloaded, so a retrained
+  pickle is picked up without restarting the process. Touching a file without
+  changing its content does not trigger a reload.
+- The number of cached models and their total on-disk size are capped; the least
+  recently used model is evicted first.
+- Hit/miss/reload/eviction counters and cumulative load time are available through
+  'stats()'.
+
+The caps of the shared default registry can be set with the environment variables
+MODEL_REGISTRY_MAX_ENTRIES and MODEL_REGISTRY_MAX_MB.
+
+With 'check_files' turned off, a held model is served without looking at its file
+and changed files are left to a watcher that loads, validates and 'put's the new
+model off the request path (see 'model_watcher').
+
+'compiled_registry' ('get_compiled_model') holds the same models compiled for
+inference by 'model_compiler.compile_model': linear ensembles are fused into a single
+weight vector, any other model is kept as loaded. The scoring paths use it.
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing Pickle for loading pre-trained machine learning models
+import pickle
+
+# Importing hashlib to fingerprint model files
+import hashlib
+
+# Importing threading to make the registry safe for threaded servers
+import threading
+
+# Importing time to measure model load durations
+import time
+
+# Ordered dictionary keeps the least recently used entry first
+from collections import OrderedDict
+
+
+class ModelEntry:
+    """A loaded model together with the file fingerprint it was loaded from."""
+
+    __slots__ = ("path", "model", "stamp", "digest", "size", "load_seconds", "loaded_at")
+
+    def __init__(self, path, model, stamp, digest, size, load_seconds):
+        self.path = path
+        self.model = model
+        self.stamp = stamp  # (mtime_ns, size) of the file when it was loaded
+        self.digest = digest  # SHA-256 of the file contents, used as model version
+        self.size = size  # Size on disk, used for the memory cap
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def load_model_file(path):
+    """Deserialize a model file (joblib for '.joblib', pickle otherwise)."""
+    if path.endswith(".joblib"):
+        import joblib
+
+        return joblib.load(path)
+
+    with open(path, "rb") as file:
+        return pickle.load(file)
+
+
+def load_compiled_model_file(path):
+    """Deserialize a model file and compile it for inference (see 'model_compiler')."""
+    from shared_functions.model_compiler import compile_model
+
+    return compile_model(load_model_file(path))
+
+
+class ModelRegistry:
+    """
+    Thread-safe LRU cache of models keyed by absolute path and file fingerprint.
+
+    Parameters:
+    - max_entries: maximum number of models kept in memory (None = unlimited).
+    - max_bytes: maximum total on-disk size of the cached model files (None = unlimited).
+    - loader: function used to deserialize a model file.
+    - check_files: compare a held model's file fingerprint on every lookup and reload
+      it when it changed. When False, changed files are only picked up through 'put'.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, loader=load_model_file, check_files=True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self.check_files = check_files
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._path_locks = {}
+        self._total_bytes = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "reloads": 0,
+            "evictions": 0,
+            "load_seconds": 0.0,
+        }
+
+    # --- Public API ---
+
+    def get(self, path):
+        """Return the model stored at 'path', loading or reloading it if needed."""
+        return self.get_entry(path).model
+
+    def get_entry(self, path):
+        """Return the ModelEntry for 'path', loading or reloading it if needed."""
+        key = os.path.abspath(path)
+        if not self.check_files:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry
+        stat = os.stat(key)  # Raises FileNotFoundError for a missing model
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stamp == stamp:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry
+            path_lock = self._path_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other models stay available meanwhile
+        with path_lock:
+            with self._lock:
+                # Another thread may have finished loading while we waited
+                entry = self._entries.get(key)
+                if entry is not None and entry.stamp == stamp:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry
+
+            digest = file_digest(key)
+            if entry is not None and entry.digest == digest:
+                # Same content with a new timestamp: keep the loaded model
+                with self._lock:
+                    entry.stamp = stamp
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                return entry
+
+            start = time.perf_counter()
+            model = self.loader(key)
+            elapsed = time.perf_counter() - start
+            new_entry = ModelEntry(key, model, stamp, digest, stat.st_size, elapsed)
+
+            with self._lock:
+                self._counters["misses"] += 1
+                self._counters["load_seconds"] += elapsed
+                if entry is not None:
+                    self._counters["reloads"] += 1
+                self._store(key, new_entry)
+            return new_entry
+
+    def put(self, path, model, stamp=None, digest=None, load_seconds=0.0):
+        """
+        Insert an already loaded model for 'path' (e.g. after validating it), replacing
+        the held one in a single step. 'stamp' and 'digest' describe the file the model
+        was loaded from; by default they are read from the file now.
+        """
+        key = os.path.abspath(path)
+        if stamp is None:
+            stat = os.stat(key)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = ModelEntry(key, model, stamp, digest or file_digest(key), stamp[1], load_seconds)
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None and old.digest != entry.digest:
+                self._counters["reloads"] += 1
+            self._counters["load_seconds"] += load_seconds
+            self._store(key, entry)
+        return entry
+
+    def peek(self, path):
+        """The ModelEntry held for 'path', or None, without loading or counting a lookup."""
+        with self._lock:
+            return self._entries.get(os.path.abspath(path))
+
+    def preload(self, paths):
+        """Load several models up front, returning {path: error} for failures."""
+        errors = {}
+        for path in paths:
+            try:
+                self.get_entry(path)
+            except Exception as e:
+                errors[path] = e
+        return errors
+
+    def invalidate(self, path=None):
+        """Drop one cached model, or all of them when 'path' is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            entry = self._entries.pop(os.path.abspath(path), None)
+            if entry is not None:
+                self._total_bytes -= entry.size
+
+    def cached_paths(self):
+        """Paths of the models currently held, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def entries(self):
+        """ModelEntry objects currently held, least recently used first."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def stats(self):
+        """Return a snapshot of the registry counters."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+            }
+
+    # --- Internal helpers (called with self._lock held) ---
+
+    def _store(self, key, entry):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total_bytes -= old.size
+        self._entries[key] = entry
+        self._total_bytes += entry.size
+        self._evict(keep=key)
+
+    def _evict(self, keep):
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            evicted = self._entries.pop(oldest)
+            self._total_bytes -= evicted.size
+            self._counters["evictions"] += 1
+
+
+def _env_int(name):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+# Shared registry used by the Streamlit pages and the Flask app
+_max_mb = _env_int("MODEL_REGISTRY_MAX_MB")
+registry = ModelRegistry(
+    max_entries=_env_int("MODEL_REGISTRY_MAX_ENTRIES") or 64,
+    max_bytes=_max_mb * 1024 * 1024 if _max_mb else None,
+)
+
+
+# Shared registry of the compiled models, with the same caps
+compiled_registry = ModelRegistry(
+    max_entries=registry.max_entries,
+    max_bytes=registry.max_bytes,
+    loader=load_compiled_model_file,
+)
+
+
+def get_model(path):
+    """Return the model stored at 'path' from the shared registry."""
+    return registry.get(path)
+
+
+def get_compiled_model(path):
+    """Return the model stored at 'path', compiled for inference, from the shared registry."""
+    return compiled_registry.get(path)
+
+
+def registry_stats():
+    """Return the counters of the shared registry."""
+    return registry.stats()
@@ -0,0 +1,161 @@
+"""
+Background reloading of model files into a model registry.
+
+A process serving predictions used to pick up a retrained pickle on the first request
+after the file changed: that request loaded the model itself, and a file still being
+copied could fail to load. 'ModelWatcher' polls a model folder from a daemon thread
+instead and, for every file whose name ends with the given suffix and that either
+changed while its model is held by the registry or appeared after the first poll:
+
+1. waits until the file's (mtime, size) stays the same for one polling interval, so
+   a file still being written is never loaded,
+2. loads it with the registry's loader, off the request path, and checks the file
+   did not change while loading,
+3. validates the model (e.g. with a smoke-test prediction),
+4. swaps it into the registry with 'ModelRegistry.put', a single dictionary
+   assignment under the registry lock: requests get either the previous model or the
+   new one, never a partly loaded one.
+
+A model that fails to load or validate is reported and the previous version keeps
+being served until the file changes again. A file that contains the same bytes as the
+held model only has its fingerprint updated. Every removed file is reported and
+dropped from the registry. Files present on the first poll, and models the registry evicted, are left
+to the registry's lazy loading on their next request: the watcher only loads new
+files and models already in use. 'on_change(path, event)' is called after every
+"added" (file appeared after the first poll), "reloaded" or "removed" event, e.g. to
+update the front-end's list of tickers.
+
+The registry should be created (or switched) with 'check_files=False', so lookups
+serve the held models without touching the files and leave reloads to the watcher.
+"""
+
+# Importing OS module for listing and fingerprinting model files
+import os
+
+# Importing threading for the polling thread
+import threading
+
+# Importing time to measure load durations
+import time
+
+# File fingerprints shared with the registry
+from shared_functions.model_registry import file_digest
+
+
+def file_stamp(path):
+    """(mtime_ns, size) of a file, or None when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ModelWatcher:
+    """
+    Thread polling 'directory' every 'interval' seconds and swapping new or changed
+    '*<suffix>' models into 'registry' once they loaded and passed 'validate'.
+    """
+
+    def __init__(self, registry, directory, suffix, validate=None, on_change=None, interval=5.0):
+        self.registry = registry
+        self.directory = directory
+        self.suffix = suffix
+        self.validate = validate
+        self.on_change = on_change
+        self.interval = interval
+        self.pid = os.getpid()  # Threads do not survive a fork: each process needs its own
+        self._seen = {}  # path -> stamp seen on the previous poll
+        self._failed = {}  # path -> stamp that failed to load or validate
+        self._known = None  # Paths present on the first poll or loaded since
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start polling from a daemon thread."""
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Model watcher error: {type(e).__name__}: {e}")
+            self._stop.wait(self.interval)
+
+    def poll(self):
+        """Scan the folder once; returns the list of (path, event) handled."""
+        stamps = {}
+        for filename in os.listdir(self.directory):
+            if filename.endswith(self.suffix):
+                path = os.path.abspath(os.path.join(self.directory, filename))
+                stamp = file_stamp(path)
+                if stamp is not None:
+                    stamps[path] = stamp
+
+        if self._known is None:
+            self._known = set(stamps)
+
+        events = []
+        for path, stamp in sorted(stamps.items()):
+            held = self.registry.peek(path)
+            if held is None and path in self._known:
+                continue  # Not requested yet, or evicted: loaded on its next request
+            if held is not None and held.stamp == stamp:
+                continue  # Up to date
+            if self._seen.get(path) != stamp or self._failed.get(path) == stamp:
+                continue  # Still being written, or this version already failed
+            event = self._reload(path, stamp, held)
+            if event is not None:
+                events.append((path, event))
+
+        for path in sorted(set(self._seen) - set(stamps)):
+            # Reported whether or not the model was loaded, so tickers never requested go too
+            self.registry.invalidate(path)
+            self._known.discard(path)
+            self._failed.pop(path, None)
+            print(f"Model {os.path.basename(path)} removed")
+            events.append((path, "removed"))
+
+        self._seen = stamps
+        for path, event in events:
+            if self.on_change is not None:
+                self.on_change(path, event)
+        return events
+
+    def _reload(self, path, stamp, held):
+        """Load, validate and swap in one model file; returns the event or None."""
+        name = os.path.basename(path)
+        try:
+            digest = file_digest(path)
+            if held is not None and held.digest == digest:
+                # Same content with a new timestamp: keep the loaded model
+                self.registry.put(path, held.model, stamp, digest, held.load_seconds)
+                return None
+
+            start = time.perf_counter()
+            model = self.registry.loader(path)
+            elapsed = time.perf_counter() - start
+            if file_stamp(path) != stamp:
+                return None  # Changed while loading: retried once it is stable again
+            if self.validate is not None:
+                self.validate(model)
+        except Exception as e:
+            self._failed[path] = stamp
+            kept = "keeping the previous version" if held is not None else "not loaded"
+            print(f"Model {name} failed to load or validate ({kept}): {type(e).__name__}: {e}")
+            return None
+
+        self.registry.put(path, model, stamp, digest, elapsed)
+        self._failed.pop(path, None)
+        self._known.add(path)
+        event = "reloaded" if held is not None else "added"
+        print(f"Model {name} {event} in {elapsed:.2f}s")
+        return event
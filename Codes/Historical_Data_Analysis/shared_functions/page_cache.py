@@ -0,0 +1,200 @@
+"""
+Streamlit caching facade for the feature function pages.
+
+Streamlit reruns the whole script on every widget change, and the pages used to
+re-read the dataset, re-attach the stored predictions and rebuild every Plotly
+figure each time, even when the user only switched back to a section already seen.
+The pages fetch these through this module instead:
+
+- 'cached_dataset' and 'cached_predictions' keep the loaded DataFrames in
+  'st.cache_resource'. 'st.cache_data' would pickle and copy the memory-mapped
+  columns on every hit. Each call returns a shallow copy instead: pages may add,
+  rename or drop columns and rename the index, but must not write into the
+  existing columns.
+- 'cached_figure' keeps built Plotly figures in 'st.cache_resource', shared by all
+  sessions.
+- 'cached_model' serves models from the shared registry of compiled models (linear
+  ensembles fused into one weight vector), which already caps the number and size of
+  loaded models and reloads a pickle that changed on disk ('st.cache_resource' would
+  keep serving the replaced model).
+
+Cache keys include the (mtime, size) of the files an entry was built from, so a
+rewritten CSV, columnar copy or model is picked up on the next rerun; entries also
+expire after a TTL and the least recently used ones are dropped beyond a maximum
+count. 'cache_stats' reports calls, hits and misses per cache for the stats panel.
+
+The limits can be set with the environment variables PAGE_CACHE_TTL_SECONDS,
+PAGE_CACHE_MAX_DATASETS and PAGE_CACHE_MAX_FIGURES.
+
+The data sources (NumPy, Pandas) are only imported when a dataset is first loaded,
+so the apps can import this module and show the stats panel on every page without
+pulling them in.
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing threading to guard the counters (sessions run in threads)
+import threading
+
+# Importing Streamlit for its data and resource caches
+import streamlit as st
+
+# Shared registry of compiled models behind 'cached_model'
+from shared_functions.model_registry import compiled_registry, get_compiled_model
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# Cache limits: entry lifetime (seconds) and number of entries kept
+CACHE_TTL_SECONDS = _env_int("PAGE_CACHE_TTL_SECONDS", 3600)
+MAX_DATASETS = _env_int("PAGE_CACHE_MAX_DATASETS", 32)
+MAX_FIGURES = _env_int("PAGE_CACHE_MAX_FIGURES", 64)
+
+# Calls and misses per cache, for 'cache_stats'
+_counters = {name: {"calls": 0, "misses": 0} for name in ("datasets", "predictions", "figures")}
+_counters_lock = threading.Lock()
+
+
+def _count(cache, counter):
+    with _counters_lock:
+        _counters[cache][counter] += 1
+
+
+def file_version(path):
+    """(mtime_ns, size) of a file, or None when it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def dataset_version(ticker, dataset_dir):
+    """Version of a ticker's CSV and columnar copy; changes whenever either is rewritten."""
+    from shared_functions.columnar_store import csv_path_for, store_path_for
+
+    return (
+        file_version(csv_path_for(ticker, dataset_dir)),
+        file_version(os.path.join(store_path_for(ticker, dataset_dir), "meta.json")),
+    )
+
+
+# --- Datasets ---
+
+
+def _shallow_copy(df):
+    # New frame and index objects over the same (memory-mapped) column arrays
+    copy = df.copy(deep=False)
+    copy.index = df.index.copy()
+    return copy
+
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=MAX_DATASETS, show_spinner=False)
+def _dataset(ticker, dataset_dir, version):
+    _count("datasets", "misses")
+    from shared_functions.columnar_store import load_dataset
+
+    return load_dataset(ticker, dataset_dir)
+
+
+def cached_dataset(ticker, dataset_dir):
+    """Preprocessed dataset of a ticker, as returned by 'load_dataset'."""
+    _count("datasets", "calls")
+    return _shallow_copy(
+        _dataset(ticker, os.path.abspath(dataset_dir), dataset_version(ticker, dataset_dir))
+    )
+
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=MAX_DATASETS, show_spinner=False)
+def _predictions(ticker, model_path, dataset_dir, version):
+    _count("predictions", "misses")
+    from shared_functions.prediction_store import load_with_predictions
+
+    return load_with_predictions(ticker, model_path, dataset_dir)
+
+
+def cached_predictions(ticker, model_path, dataset_dir):
+    """Dataset of a ticker with the stored predictions, as returned by 'load_with_predictions'."""
+    _count("predictions", "calls")
+    version = (dataset_version(ticker, dataset_dir), file_version(model_path))
+    return _shallow_copy(
+        _predictions(ticker, os.path.abspath(model_path), os.path.abspath(dataset_dir), version)
+    )
+
+
+# --- Models ---
+
+
+def cached_model(path):
+    """Model stored at 'path', compiled for inference, from the shared model registry."""
+    return get_compiled_model(path)
+
+
+# --- Figures ---
+
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=MAX_FIGURES, show_spinner=False)
+def _figure(key, _build, _args):
+    _count("figures", "misses")
+    return _build(*_args)
+
+
+def cached_figure(key, build, *args):
+    """
+    Figure returned by 'build(*args)', built once per 'key'. The key must name
+    everything the figure depends on (page, ticker, range, data version), since
+    'args' are not hashed. Cached figures are shared between sessions: do not
+    modify them.
+    """
+    _count("figures", "calls")
+    return _figure(key, build, args)
+
+
+# --- Statistics ---
+
+
+def cache_stats():
+    """One row per cache: calls, hits, misses, hit rate and limits."""
+    with _counters_lock:
+        counters = {name: dict(values) for name, values in _counters.items()}
+    limits = {"datasets": MAX_DATASETS, "predictions": MAX_DATASETS, "figures": MAX_FIGURES}
+
+    rows = []
+    for name, values in counters.items():
+        hits = values["calls"] - values["misses"]
+        rows.append(
+            {
+                "cache": name,
+                "calls": values["calls"],
+                "hits": hits,
+                "misses": values["misses"],
+                "hit_rate": hits / values["calls"] if values["calls"] else 0.0,
+                "max_entries": limits[name],
+                "ttl_seconds": CACHE_TTL_SECONDS,
+            }
+        )
+
+    models = compiled_registry.stats()
+    rows.append(
+        {
+            "cache": "models",
+            "calls": models["hits"] + models["misses"],
+            "hits": models["hits"],
+            "misses": models["misses"],
+            "hit_rate": models["hit_rate"],
+            "max_entries": compiled_registry.max_entries,
+            "ttl_seconds": None,
+        }
+    )
+    return rows
+
+
+def clear_caches():
+    """Drop every cached dataset and figure (models stay in the registry)."""
+    _dataset.clear()
+    _predictions.clear()
+    _figure.clear()
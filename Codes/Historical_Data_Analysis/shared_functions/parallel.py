@@ -0,0 +1,111 @@
+"""
+Process-pool fan-out for per-ticker pipelines (portfolio mode).
+
+Training the real-time models (Linear Regression, Random Forest, SVR and an LSTM)
+for one ticker is CPU bound and mostly single threaded, so a list of tickers is
+spread over worker processes instead. To keep the workers from oversubscribing the
+machine, the cores are split between them:
+
+    workers            = min(jobs or cpu_count, number of tickers)
+    threads_per_worker = max(1, cpu_count // workers)
+
+Every worker caps torch and the native BLAS/OpenMP pools (through threadpoolctl,
+which ships with scikit-learn) at 'threads_per_worker'. Pipelines read the same
+budget with 'worker_threads()', e.g. for RandomForest 'n_jobs'.
+
+'run_parallel' yields each ticker's result as soon as it finishes, so callers can
+stream the results instead of waiting for the slowest ticker.
+"""
+
+# Importing OS module for the CPU count and thread environment variables
+import os
+
+# Importing multiprocessing for a fork-safe ("spawn") process context
+import multiprocessing
+
+# Process pool and completion-order iteration
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Environment variables read by the native thread pools of newly started libraries
+_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+)
+
+# Thread budget of the current process (None outside a budgeted run)
+_worker_threads = None
+
+# Keeps threadpoolctl's limits alive for the lifetime of the worker
+_thread_limits = None
+
+
+def worker_budget(n_tasks, jobs=None):
+    """Return (workers, threads_per_worker) for 'n_tasks' tasks and 'jobs' workers."""
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(jobs or cpus, n_tasks or 1))
+    return workers, max(1, cpus // workers)
+
+
+def worker_threads():
+    """Thread budget of the current worker, or None when no budget was set."""
+    return _worker_threads
+
+
+def limit_threads(threads):
+    """Cap torch and the native BLAS/OpenMP thread pools of this process."""
+    global _worker_threads, _thread_limits
+    _worker_threads = threads
+
+    for name in _THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+
+    try:
+        from threadpoolctl import threadpool_limits
+
+        _thread_limits = threadpool_limits(limits=threads)
+    except ImportError:
+        pass
+
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def run_parallel(func, items, *args, jobs=None):
+    """
+    Run 'func(item, *args)' for every item and yield (item, result, error) as each
+    one finishes. 'error' is the raised exception (and 'result' None) on failure,
+    so one bad ticker does not stop the others.
+
+    'func' must be a module-level function so it can be sent to the workers. With a
+    single worker the items run in this process, one after the other.
+    """
+    items = list(items)
+    workers, threads = worker_budget(len(items), jobs)
+
+    if workers == 1:
+        for item in items:
+            try:
+                yield item, func(item, *args), None
+            except Exception as e:
+                yield item, None, e
+        return
+
+    # "spawn" avoids forking a parent that already started torch/OpenMP threads
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=limit_threads,
+        initargs=(threads,),
+    ) as pool:
+        futures = {pool.submit(func, item, *args): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as e:
+                yield item, None, e
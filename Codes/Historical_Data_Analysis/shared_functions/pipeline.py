@@ -0,0 +1,158 @@
+"""
+Three-stage load -> compute -> write pipeline for the per-ticker InfluxDB loaders.
+
+Processing tickers one after the other leaves the CPU idle while files are read or
+points are sent, and the network idle while models predict. 'run_pipeline' overlaps
+the stages across tickers:
+
+- load (reading files) and write (network) run in a thread
+  pool of 'io_threads',
+- compute (models, indicators, serialization) runs in a process pool sized and thread-capped
+  like 'shared_functions.parallel' (one process per core by default),
+- at most 'max_in_flight' tickers are between load and write at any time, which
+  bounds memory.
+
+Every stage is timed per item; 'StageTimings.report()' summarizes them, so the
+overlap is visible (wall time close to the slowest ticker instead of the sum).
+"""
+
+# Importing threading for the in-flight limit and the completion signals
+import threading
+
+# Importing time for the stage timings
+import time
+
+# Importing multiprocessing for a fork-safe ("spawn") process context
+import multiprocessing
+
+# Thread and process pools
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+# Core budget shared with the other process pools
+from shared_functions.parallel import limit_threads, worker_budget
+
+
+def _timed_call(func, *args):
+    """Run 'func(*args)' and return (seconds, result); runs inside the workers."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+class StageTimings:
+    """Thread-safe record of (stage, item, seconds) measurements."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = []
+        self.wall_seconds = 0.0
+
+    def add(self, stage, item, seconds):
+        with self._lock:
+            self.records.append((stage, item, seconds))
+
+    def report(self):
+        """Per-stage totals and maxima, plus the pipeline's wall time."""
+        lines = []
+        stages = []
+        for stage, _, _ in self.records:
+            if stage not in stages:
+                stages.append(stage)
+        for stage in stages:
+            seconds = [s for name, _, s in self.records if name == stage]
+            slowest = max(
+                (r for r in self.records if r[0] == stage), key=lambda r: r[2]
+            )
+            lines.append(
+                f"{stage:>8}: {len(seconds)} items, total {sum(seconds):.2f}s, "
+                f"slowest {slowest[2]:.2f}s ({slowest[1]})"
+            )
+        serial = sum(s for _, _, s in self.records)
+        lines.append(
+            f"wall time {self.wall_seconds:.2f}s for {serial:.2f}s of stage work"
+        )
+        return "\n".join(lines)
+
+
+def run_pipeline(items, load, compute, write, io_threads=4, jobs=None, max_in_flight=None):
+    """
+    Run load(item) -> compute(item, *loaded) -> write(item, computed) for every item.
+
+    - 'load' runs in a thread and returns a tuple of arguments for 'compute', or None
+      to skip the item.
+    - 'compute' runs in a worker process, so it must be a module-level function and
+      its arguments and result must be picklable.
+    - 'write' runs in a thread.
+
+    Returns (timings, errors, skipped): a StageTimings, {item: exception} and the
+    list of skipped items.
+    """
+    items = list(items)
+    timings = StageTimings()
+    errors = {}
+    skipped = []
+    if not items:
+        return timings, errors, skipped
+
+    workers, threads = worker_budget(len(items), jobs)
+    slots = threading.BoundedSemaphore(max_in_flight or workers + io_threads)
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=io_threads) as io_pool, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=limit_threads,
+        initargs=(threads,),
+    ) as cpu_pool:
+
+        def finish(item, done, error=None):
+            if error is not None:
+                errors[item] = error
+            slots.release()
+            done.set_result(None)
+
+        def stage_result(stage, item, future, done):
+            """Record a finished stage; returns its result, or None on failure."""
+            try:
+                seconds, result = future.result()
+            except Exception as e:
+                finish(item, done, e)
+                return None
+            timings.add(stage, item, seconds)
+            return (result,)
+
+        def after_write(item, done, future):
+            if stage_result("write", item, future, done) is not None:
+                finish(item, done)
+
+        def after_compute(item, done, future):
+            outcome = stage_result("compute", item, future, done)
+            if outcome is not None:
+                io_pool.submit(_timed_call, write, item, outcome[0]).add_done_callback(
+                    lambda f: after_write(item, done, f)
+                )
+
+        def after_load(item, done, future):
+            outcome = stage_result("load", item, future, done)
+            if outcome is None:
+                return
+            if outcome[0] is None:
+                skipped.append(item)
+                finish(item, done)
+                return
+            cpu_pool.submit(_timed_call, compute, item, *outcome[0]).add_done_callback(
+                lambda f: after_compute(item, done, f)
+            )
+
+        pending = []
+        for item in items:
+            slots.acquire()  # Bounded: wait for a ticker to leave the pipeline
+            done = Future()
+            pending.append(done)
+            io_pool.submit(_timed_call, load, item).add_done_callback(
+                lambda f, item=item, done=done: after_load(item, done, f)
+            )
+        wait(pending)
+
+    timings.wall_seconds = time.perf_counter() - started
+    return timings, errors, skipped
@@ -0,0 +1,255 @@
+"""
+Materialized model predictions for the numerical visualization page.
+
+The page used to run the ensemble model over the whole history of a ticker (11k rows
+for AAPL) and recompute the moving average and RSI of the predictions on every
+Streamlit rerun. The predicted close and its indicators only change when the model
+or the dataset does, so they are stored once per (ticker, model version):
+
+    Preprocessed_Dataset/predictions/<TICKER>/<model sha256[:16]>/
+        date.npy                        int64 nanoseconds since the Unix epoch
+        predicted_close.npy             float64 columns aligned with 'date'
+        predicted_moving_average.npy
+        predicted_rsi.npy
+        meta.json                       model digest, source CSV stamp, rows and a
+                                        hash of the dataset rows they were built from
+
+'load_with_predictions' returns the dataset with these columns attached and only
+touches the model when the store is not fresh:
+
+- A new model pickle has a new digest, hence a new folder; the folders of older
+  model versions are removed.
+- When rows were appended to the dataset (the stored rows hash the same), only the
+  new rows are predicted, and the indicators of the new rows are computed from
+  enough earlier predictions to come out as in a full build.
+- Any other change of the dataset rebuilds the store.
+
+Usage:
+    python -m shared_functions.prediction_store [TICKER ...]
+
+builds or refreshes the store of every ticker (or only the listed ones) as a batch job.
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing json for the metadata file
+import json
+
+# Importing hashlib to fingerprint the dataset rows
+import hashlib
+
+# Importing shutil to remove the folders of older model versions
+import shutil
+
+# Importing threading so concurrent reruns build a store only once
+import threading
+
+# Importing NumPy for column storage and memory mapping
+import numpy as np
+
+# Dataset fingerprints and loading
+from shared_functions.columnar_store import (
+    DEFAULT_DATASET_DIR,
+    available_tickers,
+    load_dataset,
+    source_stamp,
+)
+from shared_functions.indicators import MOVING_AVERAGE_WINDOW, RSI_WINDOW, rsi, sma
+from shared_functions.ingest_state import INDICATOR_WARMUP
+from shared_functions.model_registry import file_digest, get_compiled_model
+
+# Bump when the on-disk layout or the stored columns change so old stores are rebuilt
+STORE_VERSION = 1
+
+# Base directory ('Historical_Data_Analysis') and default model folder
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODEL_DIR = os.path.join(BASE_DIR, "Models", "pkl_models")
+
+# Name of the sub-folder of the dataset folder holding the stores
+PREDICTIONS_DIRNAME = "predictions"
+
+# Stored columns, in order
+COLUMNS = ("predicted_close", "predicted_moving_average", "predicted_rsi")
+
+# Per-process memo of model digests, keyed by (path, mtime_ns, size)
+_digests = {}
+
+# Builds and refreshes are serialized per process
+_build_lock = threading.Lock()
+
+
+def model_path_for(ticker, model_dir=DEFAULT_MODEL_DIR):
+    """Path of the ensemble model pickle for a ticker."""
+    return os.path.join(model_dir, f"{ticker}_Ensemble_Model.pkl")
+
+
+def _model_digest(model_path):
+    """SHA-256 of the model file, memoized while its mtime and size do not change."""
+    stat = os.stat(model_path)
+    key = (os.path.abspath(model_path), stat.st_mtime_ns, stat.st_size)
+    digest = _digests.get(key)
+    if digest is None:
+        digest = file_digest(model_path)
+        _digests[key] = digest
+    return digest
+
+
+def store_path_for(ticker, model_digest, dataset_dir=DEFAULT_DATASET_DIR):
+    """Folder of the stored predictions of one ticker and model version."""
+    return os.path.join(dataset_dir, PREDICTIONS_DIRNAME, ticker, model_digest[:16])
+
+
+def _rows_digest(df, rows):
+    """SHA-256 of the index and all columns of the first 'rows' rows."""
+    sha = hashlib.sha256(np.ascontiguousarray(df.index.asi8[:rows]).tobytes())
+    for column in df.columns:
+        sha.update(str(column).encode("utf-8"))
+        sha.update(np.ascontiguousarray(df[column].to_numpy()[:rows]).tobytes())
+    return sha.hexdigest()
+
+
+def _read_meta(store_path):
+    try:
+        with open(os.path.join(store_path, "meta.json"), encoding="utf-8") as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == STORE_VERSION else None
+
+
+def _save_array(store_path, name, values):
+    # Write beside and rename, so pages still mapping the old file keep reading it
+    tmp_path = os.path.join(store_path, f"{name}.{os.getpid()}.tmp.npy")
+    np.save(tmp_path, values)
+    os.replace(tmp_path, os.path.join(store_path, f"{name}.npy"))
+
+
+def _load_columns(store_path):
+    return {
+        name: np.asarray(
+            np.load(os.path.join(store_path, f"{name}.npy"), mmap_mode="r")
+        )
+        for name in ("date",) + COLUMNS
+    }
+
+
+def _predict(model, df):
+    """Predicted close of every row (features are all columns except 'close')."""
+    return np.asarray(model.predict(df.drop(columns=["close"])), dtype=np.float64)
+
+
+def _build(df, model_path, store_path, meta, source):
+    """Build or extend the store for the dataset 'df'; returns (columns, status)."""
+    stored_rows = 0
+    if (
+        meta is not None
+        and meta["rows"] <= len(df)
+        and meta["rows_sha256"] == _rows_digest(df, meta["rows"])
+    ):
+        stored_rows = meta["rows"]
+
+    model = get_compiled_model(model_path)
+    if stored_rows:
+        # Appended rows: predict them and extend the indicators from a warm-up window
+        old = _load_columns(store_path)
+        new_close = _predict(model, df.iloc[stored_rows:])
+        context = np.concatenate(
+            [old["predicted_close"][-INDICATOR_WARMUP:], new_close]
+        )
+        n_new = len(new_close)
+        columns = {
+            "predicted_close": np.concatenate([old["predicted_close"], new_close]),
+            "predicted_moving_average": np.concatenate(
+                [
+                    old["predicted_moving_average"],
+                    sma(context, MOVING_AVERAGE_WINDOW)[-n_new:],
+                ]
+            ),
+            "predicted_rsi": np.concatenate(
+                [old["predicted_rsi"], rsi(context, RSI_WINDOW)[-n_new:]]
+            ),
+        }
+    else:
+        predicted_close = _predict(model, df)
+        columns = {
+            "predicted_close": predicted_close,
+            "predicted_moving_average": sma(predicted_close, MOVING_AVERAGE_WINDOW),
+            "predicted_rsi": rsi(predicted_close, RSI_WINDOW),
+        }
+
+    os.makedirs(store_path, exist_ok=True)
+    _save_array(store_path, "date", df.index.asi8)
+    for name in COLUMNS:
+        _save_array(store_path, name, columns[name])
+
+    meta = {
+        "version": STORE_VERSION,
+        "model": {
+            "path": os.path.abspath(model_path),
+            "sha256": _model_digest(model_path),
+        },
+        "source": source,
+        "rows": len(df),
+        "rows_sha256": _rows_digest(df, len(df)),
+        "refreshed_rows": len(df) - stored_rows,
+    }
+    # meta.json is written last, so a half-written store is never considered fresh
+    tmp_path = os.path.join(store_path, f"meta.json.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(meta, file, indent=2)
+    os.replace(tmp_path, os.path.join(store_path, "meta.json"))
+
+    # Older model versions of this ticker are no longer valid
+    ticker_dir = os.path.dirname(store_path)
+    for name in os.listdir(ticker_dir):
+        if name != os.path.basename(store_path):
+            shutil.rmtree(os.path.join(ticker_dir, name), ignore_errors=True)
+    return {"date": df.index.asi8, **columns}, "extended" if stored_rows else "built"
+
+
+def refresh_predictions(ticker, model_path=None, dataset_dir=DEFAULT_DATASET_DIR):
+    """
+    Make the stored predictions of a ticker current and return (df, columns, status):
+    the dataset, the stored columns, and "fresh", "extended" or "built".
+    """
+    model_path = model_path or model_path_for(ticker)
+    store_path = store_path_for(ticker, _model_digest(model_path), dataset_dir)
+    source = source_stamp(ticker, dataset_dir)
+
+    meta = _read_meta(store_path)
+    df = load_dataset(ticker, dataset_dir)
+    if meta is not None and meta["source"] == source and meta["rows"] == len(df):
+        return df, _load_columns(store_path), "fresh"
+
+    with _build_lock:
+        # Another rerun may have refreshed the store while we waited
+        meta = _read_meta(store_path)
+        if meta is not None and meta["source"] == source and meta["rows"] == len(df):
+            return df, _load_columns(store_path), "fresh"
+        columns, status = _build(df, model_path, store_path, meta, source)
+    return df, columns, status
+
+
+def load_with_predictions(ticker, model_path=None, dataset_dir=DEFAULT_DATASET_DIR):
+    """
+    Return the dataset of a ticker with the stored 'predicted_close',
+    'predicted_moving_average' and 'predicted_rsi' columns attached, refreshing the
+    store first when the model or the dataset changed.
+    """
+    df, columns, _ = refresh_predictions(ticker, model_path, dataset_dir)
+    if not np.array_equal(columns["date"], df.index.asi8):
+        raise ValueError(f"Stored predictions of {ticker} do not match its dataset.")
+    return df.assign(**{name: columns[name] for name in COLUMNS})
+
+
+# Build or refresh the stores when run as a script
+if __name__ == "__main__":
+    import sys
+
+    for ticker in sys.argv[1:] or available_tickers():
+        if not os.path.isfile(model_path_for(ticker)):
+            print(f"{ticker}: no model found, skipped.")
+            continue
+        _, columns, status = refresh_predictions(ticker)
+        print(f"{ticker}: {status} ({len(columns['date'])} rows).")
@@ -0,0 +1,148 @@
+"""
+Persisted TF-IDF vectorizer for the text classification models.
+
+The text models (Random Forest, Naive Bayes) were trained on a TF-IDF matrix built
+from 'Preprocessed_Text_Dataset.csv'. Refitting that vectorizer on the whole dataset
+before every prediction costs seconds of CPU and a dense matrix of hundreds of MB,
+so the fitted vectorizer is saved once as a versioned artifact next to the models
+and loaded once per process.
+
+Usage:
+    python -m shared_functions.text_vectorizer
+
+builds (or rebuilds) the artifact from the preprocessed text dataset. At runtime,
+'load_text_vectorizer' returns the cached vectorizer and 'transform_text' keeps the
+features sparse end to end (both text models accept scipy sparse input).
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing Pickle for loading/saving the fitted vectorizer
+import pickle
+
+# Importing threading to guard the per-process cache
+import threading
+
+# Bump this whenever the vectorizer settings change so stale artifacts are rejected
+VECTORIZER_VERSION = 1
+
+# Vectorizer settings used when the text models were trained
+MAX_FEATURES = 5000
+
+# Artifact file name, saved next to the text classification models
+VECTORIZER_FILENAME = f"TFIDF_Vectorizer_v{VECTORIZER_VERSION}.pkl"
+
+# Base directory ('Historical_Data_Analysis')
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default locations of the training dataset and the artifact
+DEFAULT_CSV_PATH = os.path.join(
+    BASE_DIR, "Textual_Analysis", "Dataset", "Preprocessed_Text_Dataset.csv"
+)
+DEFAULT_MODEL_DIR = os.path.join(
+    BASE_DIR, "Textual_Analysis", "Models", "Classification", "pkl_models"
+)
+DEFAULT_VECTORIZER_PATH = os.path.join(DEFAULT_MODEL_DIR, VECTORIZER_FILENAME)
+
+# Per-process cache of loaded vectorizers, keyed by absolute artifact path
+_vectorizers = {}
+_lock = threading.Lock()
+
+
+def build_text_vectorizer(csv_path=DEFAULT_CSV_PATH, output_path=DEFAULT_VECTORIZER_PATH):
+    """
+    Fit the TF-IDF vectorizer on the preprocessed text dataset and save it as a
+    versioned artifact. Returns the fitted vectorizer.
+    """
+    # Imported here so that loading an existing artifact does not need pandas
+    import pandas as pd
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    data = pd.read_csv(csv_path, usecols=["cleaned_text"])
+    vectorizer = TfidfVectorizer(max_features=MAX_FEATURES)
+    vectorizer.fit(data["cleaned_text"].fillna(""))
+
+    artifact = {
+        "version": VECTORIZER_VERSION,
+        "max_features": MAX_FEATURES,
+        "vectorizer": vectorizer,
+    }
+
+    # Write to a temporary file first so readers never see a partial artifact
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as file:
+        pickle.dump(artifact, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, output_path)
+
+    return vectorizer
+
+
+def _read_artifact(path):
+    """Read a vectorizer artifact and check that its version matches."""
+    with open(path, "rb") as file:
+        artifact = pickle.load(file)
+
+    if not isinstance(artifact, dict) or artifact.get("version") != VECTORIZER_VERSION:
+        raise ValueError(
+            f"Vectorizer artifact at {path} is not version {VECTORIZER_VERSION}; "
+            "rebuild it with 'python -m shared_functions.text_vectorizer'."
+        )
+    return artifact["vectorizer"]
+
+
+def load_text_vectorizer(path=DEFAULT_VECTORIZER_PATH, csv_path=None):
+    """
+    Return the fitted TF-IDF vectorizer, loading it from disk only once per process.
+
+    If the artifact does not exist yet and 'csv_path' is given, the vectorizer is
+    fitted from that dataset once and saved, so later calls read the artifact.
+    Raises FileNotFoundError if neither the artifact nor the dataset is available.
+    """
+    key = os.path.abspath(path)
+
+    vectorizer = _vectorizers.get(key)
+    if vectorizer is not None:
+        return vectorizer
+
+    with _lock:
+        # Another thread may have loaded it while we were waiting
+        vectorizer = _vectorizers.get(key)
+        if vectorizer is not None:
+            return vectorizer
+
+        if os.path.isfile(key):
+            vectorizer = _read_artifact(key)
+        elif csv_path is not None and os.path.isfile(csv_path):
+            vectorizer = build_text_vectorizer(csv_path, key)
+        else:
+            raise FileNotFoundError(f"Vectorizer artifact not found: {key}")
+
+        _vectorizers[key] = vectorizer
+        return vectorizer
+
+
+def transform_text(vectorizer, texts):
+    """
+    Transform one string or a list of strings into a sparse TF-IDF matrix.
+    The result is never densified, so a single sentence costs milliseconds.
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    return vectorizer.transform(texts)
+
+
+# Build the artifact when run as a script
+if __name__ == "__main__":
+    import sys
+
+    csv_arg = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV_PATH
+    out_arg = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_VECTORIZER_PATH
+
+    print(f"Fitting TF-IDF vectorizer on: {csv_arg}")
+    fitted = build_text_vectorizer(csv_arg, out_arg)
+    print(
+        f"Saved vectorizer v{VECTORIZER_VERSION} "
+        f"({len(fitted.vocabulary_)} terms) to: {out_arg}"
+    )
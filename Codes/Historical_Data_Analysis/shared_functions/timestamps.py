@@ -0,0 +1,54 @@
+"""
+Deterministic unique timestamps for datasets with several rows per date.
+
+InfluxDB identifies a point by measurement, tags and timestamp, so rows sharing a
+date would overwrite each other. The text and hybrid loaders used to add a random
+time of day to every row: slow (a Python 'apply' with three 'random.randint' calls
+per row) and non-deterministic, so every re-run added new points instead of
+overwriting the old ones.
+
+'unique_timestamps' instead offsets each row by its ordinal within its date:
+
+    timestamp = date + ordinal_within_date * spacing
+
+computed in one vectorized NumPy pass. The same input always yields the same
+timestamps, so re-running a loader upserts the existing points.
+"""
+
+# Importing NumPy for the vectorized offsets
+import numpy as np
+
+# Importing Pandas for date parsing
+import pandas as pd
+
+# Default gap between rows of the same date
+DEFAULT_SPACING = np.timedelta64(1, "s")
+
+
+def unique_timestamps(dates, spacing=DEFAULT_SPACING):
+    """
+    Return a DatetimeIndex where the k-th row (in input order) of each distinct
+    date is moved k * 'spacing' past it. Raises ValueError if a date has so many
+    rows that the offsets would reach the next day.
+    """
+    values = np.asarray(pd.to_datetime(dates), dtype="datetime64[ns]")
+    n = len(values)
+    if n == 0:
+        return pd.DatetimeIndex(values)
+
+    # Group equal dates together while keeping the input order inside each group
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    positions = np.arange(n)
+    group_start = np.empty(n, dtype=bool)
+    group_start[0] = True
+    np.not_equal(sorted_values[1:], sorted_values[:-1], out=group_start[1:])
+    first_of_group = np.maximum.accumulate(np.where(group_start, positions, 0))
+
+    ordinals = np.empty(n, dtype=np.int64)
+    ordinals[order] = positions - first_of_group
+
+    spacing = np.timedelta64(spacing, "ns")
+    if ordinals.max() * spacing >= np.timedelta64(1, "D"):
+        raise ValueError("Too many rows on one date for the requested spacing.")
+    return pd.DatetimeIndex(values + ordinals * spacing)
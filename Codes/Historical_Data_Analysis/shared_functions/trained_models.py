@@ -0,0 +1,145 @@
+"""
+Content-addressed cache of trained models.
+
+Training the real-time models on every "Run Prediction" press is wasted work when
+neither the input series nor the hyper-parameters changed. Trained models are stored
+under a key derived from both:
+
+    key = SHA-256(series bytes + hyper-parameters)
+
+so an identical request finds its models and skips training entirely. Each entry can
+also be registered under a "lineage" (e.g. ticker + hyper-parameters); 'latest'
+returns the most recent entry of a lineage, which callers use to warm-start when the
+series has only moved on by a few bars.
+
+Entries are pickled to '<directory>/<key>.pkl' (written atomically). The least
+recently used files are removed once there are more than 'max_entries'. The default
+directory is 'Trained_Model_Cache' (override with TRAINED_MODEL_CACHE_DIR).
+"""
+
+# Importing OS module for handling file and directory paths
+import os
+
+# Importing Pickle for storing the trained models
+import pickle
+
+# Importing json for the lineage index files
+import json
+
+# Importing hashlib for the content-addressed keys
+import hashlib
+
+# Importing NumPy for hashing the input series
+import numpy as np
+
+# Base directory ('Historical_Data_Analysis') and default cache folder
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.environ.get(
+    "TRAINED_MODEL_CACHE_DIR", os.path.join(BASE_DIR, "Trained_Model_Cache")
+)
+DEFAULT_MAX_ENTRIES = 64
+
+
+def _params_bytes(params):
+    return json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+
+
+def series_key(values, params):
+    """SHA-256 key of a numeric series together with the hyper-parameters."""
+    sha = hashlib.sha256(_params_bytes(params))
+    sha.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return sha.hexdigest()
+
+
+def lineage_key(name, params):
+    """Key grouping the entries of one series (e.g. a ticker) and configuration."""
+    sha = hashlib.sha256(_params_bytes(params))
+    sha.update(str(name).encode("utf-8"))
+    return sha.hexdigest()
+
+
+class TrainedModelCache:
+    """
+    Pickled trained models keyed by content hash.
+
+    Parameters:
+    - directory: folder holding the cache files.
+    - max_entries: number of entries kept before the least recently used are removed.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _lineage_path(self, lineage):
+        return os.path.join(self.directory, f"lineage_{lineage}.json")
+
+    # --- Public API ---
+
+    def get(self, key):
+        """Return the payload stored under 'key', or None."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as file:
+                entry = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.stats["misses"] += 1
+            return None
+        os.utime(path)  # Mark as recently used
+        self.stats["hits"] += 1
+        return entry["payload"]
+
+    def latest(self, lineage):
+        """Return (payload, meta) of the newest entry of a lineage, or (None, None)."""
+        try:
+            with open(self._lineage_path(lineage), encoding="utf-8") as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return None, None
+        payload = self.get(index["key"])
+        if payload is None:
+            return None, None
+        return payload, index["meta"]
+
+    def put(self, key, payload, lineage=None, meta=None):
+        """Store a payload under 'key' and make it the newest entry of 'lineage'."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump({"payload": payload, "meta": meta}, file)
+        os.replace(tmp_path, path)
+
+        if lineage is not None:
+            tmp_path = f"{self._lineage_path(lineage)}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump({"key": key, "meta": meta}, file)
+            os.replace(tmp_path, self._lineage_path(lineage))
+
+        self.stats["stores"] += 1
+        self._evict()
+
+    # --- Internal helpers ---
+
+    def _evict(self):
+        entries = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".pkl")
+        ]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[: len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Shared cache used by the real-time prediction page
+model_cache = TrainedModelCache()
@@ -0,0 +1,78 @@
+"""
+Sliding-window views for supervised time-series models.
+
+A series of n values turned into (window -> next value) training pairs normally
+costs O(n * window) Python-level copies. 'WindowedSeries' builds the same matrix as
+a strided view over the series instead ('numpy.lib.stride_tricks.sliding_window_view'),
+so every window shares the series' memory:
+
+    X[i] = values[i : i + window]
+    y[i] = values[i + window]
+
+The scikit-learn models consume 'X'/'y' directly. 'torch_inputs' returns the LSTM
+tensors (batch, window, 1) as a view over a single float32 copy of the series, made
+once and cached, so the sklearn and torch consumers never copy per window.
+"""
+
+# Importing NumPy for numerical computations and array operations
+import numpy as np
+
+# Strided, zero-copy window views
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(values, window):
+    """
+    Read-only (len(values) - window + 1, window) view of every window of 'values'.
+    Returns an empty (0, window) array when the series is shorter than the window.
+    """
+    values = np.asarray(values).reshape(-1)
+    if len(values) < window:
+        return np.empty((0, window), dtype=values.dtype)
+    return sliding_window_view(values, window)
+
+
+class WindowedSeries:
+    """
+    Supervised (X, y) windows over a 1-D series, without copying the windows.
+
+    Parameters:
+    - values: the (scaled) series; 2-D single-column input is flattened.
+    - window: number of past values in each input window.
+    """
+
+    def __init__(self, values, window):
+        self.values = np.ascontiguousarray(values, dtype=np.float64).reshape(-1)
+        self.window = window
+
+        # Inputs stop one value early so every window has a target
+        self.X = sliding_windows(self.values[:-1], window)
+        self.y = self.values[window:] if len(self.values) > window else self.values[:0]
+        self._torch = None
+
+    def __len__(self):
+        return len(self.X)
+
+    def last_window(self):
+        """The most recent 'window' values, used to start a recursive forecast."""
+        return self.values[-self.window :]
+
+    def torch_inputs(self):
+        """
+        Return (X, y) as float32 tensors shaped (batch, window, 1) and (batch, 1).
+        Both are views over one cached float32 copy of the series.
+        """
+        if self._torch is None:
+            import torch
+
+            series = torch.from_numpy(self.values.astype(np.float32))
+            if len(self.X) == 0:
+                self._torch = (
+                    series.new_empty((0, self.window, 1)),
+                    series.new_empty((0, 1)),
+                )
+            else:
+                X = series[:-1].unfold(0, self.window, 1).unsqueeze(-1)
+                y = series[self.window :].unsqueeze(-1)
+                self._torch = (X, y)
+        return self._torch
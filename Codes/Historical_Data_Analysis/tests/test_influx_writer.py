@@ -0,0 +1,150 @@
+"""
+Tests for the batched InfluxDB writer (shared_functions/influx_writer.py), run
+against a local stub of the InfluxDB write endpoint (POST /api/v2/write).
+
+Run from Codes/Historical_Data_Analysis with:
+    python -m pytest tests
+"""
+
+# Importing OS module for the spool file path
+import os
+
+# Importing sys to make the shared helpers importable
+import sys
+
+# Importing threading to serve the stub in the background
+import threading
+
+# Importing the standard library HTTP server for the stub endpoint
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Importing pytest for fixtures
+import pytest
+
+# Importing the InfluxDB client the writer wraps
+from influxdb_client import InfluxDBClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_functions.influx_writer import InfluxWriter, format_stats
+
+
+class StubInflux(ThreadingHTTPServer):
+    """
+    Write endpoint recording the line-protocol batches it accepts. 'statuses' holds
+    the status codes of the next responses (204 once it is empty).
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.statuses = []
+        self.batches = []  # Accepted batches, as lists of lines
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.requests += 1
+            status = self.server.statuses.pop(0) if self.server.statuses else 204
+            if status == 204:
+                self.server.batches.append(body.decode("utf-8").splitlines())
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = StubInflux()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(stub):
+    client = InfluxDBClient(
+        url=f"http://127.0.0.1:{stub.server_address[1]}", token="token", org="org"
+    )
+    yield client
+    client.close()
+
+
+def make_writer(client, spool_path=None):
+    return InfluxWriter(
+        client,
+        "bucket",
+        "org",
+        batch_size=2,
+        flush_interval=50,
+        retry_interval=10,
+        max_retries=1,
+        max_retry_delay=50,
+        spool_path=spool_path,
+    )
+
+
+def lines(count, start=0):
+    return [f"price,Ticker=AAPL close={i} {i}" for i in range(start, start + count)]
+
+
+def test_points_are_sent_in_batches(stub, client):
+    writer = make_writer(client)
+    writer.write_lines(lines(5))
+    stats = writer.close()
+
+    assert sorted(line for batch in stub.batches for line in batch) == sorted(lines(5))
+    assert all(len(batch) <= 2 for batch in stub.batches)
+    assert stats["points_written"] == 5
+    assert stats["batches_written"] == len(stub.batches) == 3
+    assert stats["batches_failed"] == 0
+
+
+def test_batch_is_retried_after_a_server_error(stub, client):
+    stub.statuses = [503]
+    writer = make_writer(client)
+    writer.write_lines(lines(2))
+    stats = writer.close()
+
+    assert stub.requests == 2
+    assert stub.batches == [lines(2)]
+    assert stats["retries"] == 1
+    assert stats["points_written"] == 2
+    assert stats["batches_failed"] == 0
+
+
+def test_failed_batch_is_spooled_and_replayed(stub, client, tmp_path):
+    spool_path = str(tmp_path / "influx_spool.jsonl")
+    stub.statuses = [500, 500]  # The first attempt and its retry
+    writer = make_writer(client, spool_path)
+    writer.write_lines(lines(2))
+    stats = writer.close()
+
+    assert stub.batches == []
+    assert stats["batches_failed"] == stats["batches_spooled"] == 1
+    assert stats["points_written"] == 0
+    assert os.path.isfile(spool_path)
+    assert "0 points written" in format_stats(stats)
+    assert "1 failed batches (1 spooled for the next run)" in format_stats(stats)
+
+    # Next run: the spooled batch is sent again
+    writer = make_writer(client, spool_path)
+    assert writer.replay_spool() == 1
+    stats = writer.close()
+
+    assert stub.batches == [lines(2)]
+    assert not os.path.exists(spool_path)
+    assert not os.path.exists(f"{spool_path}.replay")
+    assert stats["points_written"] == 2
+    assert stats["batches_replayed"] == 1
+    assert "2 points written" in format_stats(stats)
+    assert "0 failed batches" in format_stats(stats)
+    assert "1 batches replayed" in format_stats(stats)
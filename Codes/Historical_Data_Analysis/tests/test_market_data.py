@@ -0,0 +1,184 @@
+"""
+Tests for the OHLCV cache (shared_functions/market_data.py), run against the
+in-memory 'FrameProvider' feed with a fake clock: no network is needed.
+
+Run from Codes/Historical_Data_Analysis with:
+    python -m pytest tests
+"""
+
+# Importing OS module for the cache file path
+import os
+
+# Importing sys to make the shared helpers importable
+import sys
+
+# Importing time to fake the clock
+import time
+
+# Importing types to build a stand-in yfinance module
+import types
+
+# Importing NumPy and Pandas for the fake feed
+import numpy as np
+import pandas as pd
+
+# Importing pytest for fixtures and error checks
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_functions import market_data
+from shared_functions.market_data import (
+    MARKET_TIMEZONE,
+    FrameProvider,
+    MarketDataCache,
+    YFinanceProvider,
+)
+
+
+def make_bars(start, end):
+    """Daily bars on every weekday of [start, end], with Close = 100 + row number."""
+    index = pd.bdate_range(start, end, name="Date")
+    close = 100.0 + np.arange(len(index))
+    return pd.DataFrame(
+        {
+            "Open": close - 1,
+            "High": close + 1,
+            "Low": close - 2,
+            "Close": close,
+            "Volume": np.full(len(index), 1000.0),
+        },
+        index=index,
+    )
+
+
+def make_feed_frame(last_day):
+    """Feed frame of AAPL bars from the start of 2024 to 'last_day'."""
+    return market_data._normalize_frame(make_bars("2024-01-02", last_day))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Set the cache's current time, given as a New York wall time string."""
+
+    def set_now(wall_time):
+        now = pd.Timestamp(wall_time, tz=MARKET_TIMEZONE)
+        monkeypatch.setattr(market_data, "_market_now", lambda: now)
+        monkeypatch.setattr(time, "time", lambda: now.timestamp())
+
+    return set_now
+
+
+@pytest.fixture
+def feed():
+    return FrameProvider({"AAPL": make_bars("2024-01-02", "2024-03-15")})
+
+
+@pytest.fixture
+def cache(tmp_path, feed):
+    return MarketDataCache(str(tmp_path / "ohlcv.sqlite"), provider=feed, ttl=300)
+
+
+def test_incremental_top_up_and_back_fill(clock, feed, cache):
+    clock("2024-03-15 12:00")  # Friday, market open
+    bars = cache.get_bars("AAPL", "2024-02-01")
+    assert bars.index[0] == pd.Timestamp("2024-02-01")
+    assert bars.index[-1] == pd.Timestamp("2024-03-15")
+    assert len(feed.calls) == 1
+
+    # After the TTL, only the bars from the last cached one onwards are requested
+    feed.frames["AAPL"] = make_feed_frame("2024-03-18")
+    clock("2024-03-18 12:00")
+    bars = cache.get_bars("AAPL", "2024-02-01")
+    assert feed.calls[-1][2] == pd.Timestamp("2024-03-15")
+    assert bars.index[-1] == pd.Timestamp("2024-03-18")
+
+    # Older history is fetched only for the part before the cached window
+    bars = cache.get_bars("AAPL", "2024-01-15", end="2024-02-01")
+    assert feed.calls[-1][2:] == (
+        pd.Timestamp("2024-01-15"),
+        pd.Timestamp("2024-02-01"),
+    )
+    assert bars.index[0] == pd.Timestamp("2024-01-15")
+    assert len(feed.calls) == 3
+
+
+def test_bars_are_served_from_disk(clock, tmp_path, cache):
+    clock("2024-03-15 12:00")
+    first = cache.get_bars("AAPL", "2024-02-01")
+
+    # A new cache on the same file, e.g. another process, needs no provider call
+    offline = FrameProvider({})
+    reopened = MarketDataCache(cache.path, provider=offline, ttl=300)
+    pd.testing.assert_frame_equal(reopened.get_bars("AAPL", "2024-02-01"), first)
+    assert offline.calls == []
+    assert reopened.stats["hits"] == 1
+
+
+def test_ttl_during_market_hours(clock, feed, cache):
+    clock("2024-03-15 12:00")
+    cache.get_bars("AAPL", "2024-02-01")
+
+    clock("2024-03-15 12:04")  # Within the 300 s TTL
+    cache.get_bars("AAPL", "2024-02-01")
+    assert len(feed.calls) == 1
+
+    clock("2024-03-15 12:06")
+    cache.get_bars("AAPL", "2024-02-01")
+    assert len(feed.calls) == 2
+
+
+def test_closed_market_refreshes_once_per_session_close(clock, feed, cache):
+    clock("2024-03-15 17:00")  # Friday, after the close
+    cache.get_bars("AAPL", "2024-02-01")
+
+    for weekend in ("2024-03-16 10:00", "2024-03-17 20:00", "2024-03-18 09:00"):
+        clock(weekend)
+        cache.get_bars("AAPL", "2024-02-01")
+    assert len(feed.calls) == 1  # Nothing new since Friday's close
+
+    clock("2024-03-18 16:30")  # After Monday's close
+    cache.get_bars("AAPL", "2024-02-01")
+    assert len(feed.calls) == 2
+
+
+def test_empty_fetch_keeps_the_window_stale(clock, feed, cache):
+    clock("2024-03-15 12:00")
+    cached = cache.get_bars("AAPL", "2024-02-01")
+
+    # Outage: the feed returns nothing, the cached bars are served...
+    feed.frames["AAPL"] = market_data._normalize_frame(None)
+    clock("2024-03-18 12:00")
+    pd.testing.assert_frame_equal(cache.get_bars("AAPL", "2024-02-01"), cached)
+    assert cache.stats["errors"] == 1
+
+    # ...and the next request tries again instead of treating "no bars" as fresh
+    cache.get_bars("AAPL", "2024-02-01")
+    assert len(feed.calls) == 3
+
+    feed.frames["AAPL"] = make_feed_frame("2024-03-18")
+    bars = cache.get_bars("AAPL", "2024-02-01")
+    assert bars.index[-1] == pd.Timestamp("2024-03-18")
+
+
+def test_unknown_ticker_raises(clock, cache):
+    clock("2024-03-15 12:00")
+    with pytest.raises(ValueError):
+        cache.get_bars("NOPE", "2024-02-01")
+
+
+def test_yfinance_provider_raises_on_empty_download(monkeypatch):
+    fake_yfinance = types.SimpleNamespace(
+        download=lambda *args, **kwargs: pd.DataFrame()
+    )
+    monkeypatch.setitem(sys.modules, "yfinance", fake_yfinance)
+    provider = YFinanceProvider()
+    with pytest.raises(ValueError):
+        provider.fetch(
+            "NOPE", "1d", pd.Timestamp("2024-03-11"), pd.Timestamp("2024-03-16")
+        )
+    # A window without a weekday may legitimately be empty
+    weekend = provider.fetch(
+        "AAPL", "1d", pd.Timestamp("2024-03-16"), pd.Timestamp("2024-03-18")
+    )
+    assert weekend.empty
@@ -0,0 +1,91 @@
+"""
+Tests for the background model watcher (shared_functions/model_watcher.py).
+
+Run from Codes/Historical_Data_Analysis with:
+    python -m pytest tests
+"""
+
+# Importing OS module for the model files
+import os
+
+# Importing sys to make the shared helpers importable
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_functions.model_registry import ModelRegistry
+from shared_functions.model_watcher import ModelWatcher
+
+SUFFIX = "_Ensemble_Model.pkl"
+
+
+def read_model(path):
+    """Stand-in loader: the "model" is the file's text."""
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def write_model(directory, ticker, content, mtime_ns):
+    path = os.path.join(directory, f"{ticker}{SUFFIX}")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))  # Distinct stamps without sleeping
+    return path
+
+
+def make_watcher(directory, max_entries):
+    registry = ModelRegistry(max_entries=max_entries, loader=read_model, check_files=False)
+    return registry, ModelWatcher(registry, str(directory), SUFFIX, interval=0)
+
+
+def test_evicted_models_are_left_to_lazy_loading(tmp_path):
+    paths = [write_model(tmp_path, f"T{i}", f"v1-{i}", 10**18) for i in range(4)]
+    registry, watcher = make_watcher(tmp_path, max_entries=2)
+
+    for _ in range(4):
+        assert watcher.poll() == []
+    assert registry.stats()["misses"] == 0  # Nothing loaded before a request asks
+
+    for path in paths:
+        assert registry.get(path).startswith("v1")
+    evictions = registry.stats()["evictions"]
+    assert evictions == 2
+
+    for _ in range(4):
+        assert watcher.poll() == []
+    assert registry.stats()["evictions"] == evictions
+    assert registry.stats()["misses"] == len(paths)
+
+
+def test_held_models_are_reloaded_when_their_file_changes(tmp_path):
+    paths = [write_model(tmp_path, f"T{i}", f"v1-{i}", 10**18) for i in range(4)]
+    registry, watcher = make_watcher(tmp_path, max_entries=2)
+    watcher.poll()
+    held, evicted = paths[3], paths[0]
+    for path in paths:
+        registry.get(path)
+
+    write_model(tmp_path, "T3", "v2-3", 2 * 10**18)
+    write_model(tmp_path, "T0", "v2-0", 2 * 10**18)
+    assert watcher.poll() == []  # Stamps must stay the same for one interval
+    assert watcher.poll() == [(os.path.abspath(held), "reloaded")]
+    assert registry.peek(held).model == "v2-3"
+    assert registry.peek(evicted) is None
+    assert registry.get(evicted) == "v2-0"  # Lazy load reads the new file
+
+
+def test_new_and_removed_files(tmp_path):
+    registry, watcher = make_watcher(tmp_path, max_entries=2)
+    never_loaded = write_model(tmp_path, "OLD", "v1", 10**18)
+    watcher.poll()
+
+    added = write_model(tmp_path, "NEW", "v1", 10**18)
+    watcher.poll()
+    assert watcher.poll() == [(added, "added")]
+    registry.invalidate(added)  # Evicted: not loaded again by the watcher
+    assert watcher.poll() == []
+
+    os.remove(added)
+    os.remove(never_loaded)
+    assert watcher.poll() == [(added, "removed"), (never_loaded, "removed")]
+    assert registry.peek(added) is None